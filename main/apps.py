@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        # 카페 변경 시 프로세스 내 공간 인덱스를 갱신하는 시그널 등록
+        from . import signals  # noqa: F401
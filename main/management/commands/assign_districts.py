@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from main.models import Cafe, Profile
+from main.services.district_boundaries import classify_district, get_district_boundaries
+from main.services.district_rankings import refresh_all_district_rankings
+from main.services.districts import district_code_for_area
+
+
+class Command(BaseCommand):
+    help = ("Reclassify the district code of every cafe and profile against the district boundaries "
+            "(falling back to the cafe address / profile area)")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="한 번에 저장할 행 수",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if get_district_boundaries() is None:
+            self.stdout.write(self.style.WARNING(
+                "No district boundaries loaded (DISTRICT_BOUNDARIES_PATH); using addresses and areas only"))
+
+        cafes = []
+        for cafe in Cafe.objects.only('id', 'address', 'latitude', 'longitude', 'district_code').iterator(chunk_size=batch_size):
+            code = classify_district(cafe.latitude, cafe.longitude, cafe.address)
+            if code != cafe.district_code:
+                cafe.district_code = code
+                cafes.append(cafe)
+        Cafe.objects.bulk_update(cafes, ['district_code'], batch_size=batch_size)
+
+        profiles = []
+        for profile in Profile.objects.only('id', 'area', 'latitude', 'longitude', 'district_code').iterator(chunk_size=batch_size):
+            code = classify_district(profile.latitude, profile.longitude) or district_code_for_area(profile.area)
+            if code != profile.district_code:
+                profile.district_code = code
+                profiles.append(profile)
+        Profile.objects.bulk_update(profiles, ['district_code'], batch_size=batch_size)
+
+        # bulk_update는 시그널을 보내지 않으므로 구가 바뀐 카페가 있으면 순위를 다시 계산
+        if cafes:
+            refresh_all_district_rankings()
+        self.stdout.write(self.style.SUCCESS(
+            f"Reassigned districts for {len(cafes)} cafes and {len(profiles)} profiles"))
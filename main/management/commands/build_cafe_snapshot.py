@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.services.cafe_snapshot import build_cafe_snapshot, read_snapshot_version, write_snapshot_file
+
+
+class Command(BaseCommand):
+    help = "Write a memory-mappable binary snapshot of all cafes for the geo endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help="스냅샷 파일 경로 (기본값: settings.CAFE_SNAPSHOT_PATH)",
+        )
+
+    def handle(self, *args, **options):
+        path = options.get('output') or getattr(settings, 'CAFE_SNAPSHOT_PATH', None)
+        if not path:
+            raise CommandError("--output 또는 settings.CAFE_SNAPSHOT_PATH를 지정해야 합니다.")
+
+        # 발행할 때마다 데이터 버전을 1씩 올려 워커가 새 스냅샷을 구분할 수 있게 함
+        version = (read_snapshot_version(path) or 0) + 1
+        snapshot = build_cafe_snapshot(version=version)
+        write_snapshot_file(snapshot, path, version)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Published cafe snapshot v{version} with {len(snapshot)} cafes to {path}"))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from main.models import Cafe
+from main.services.cafe_dedupe import DEFAULT_RADIUS_M, DEFAULT_SIMILARITY, find_duplicate_groups, merge_cafes
+
+
+class Command(BaseCommand):
+    help = "Find cafes duplicated within a small radius under similar names, and optionally merge them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--radius', type=float, default=DEFAULT_RADIUS_M,
+            help=f"같은 카페로 볼 최대 거리 (m, 기본값 {DEFAULT_RADIUS_M:g})",
+        )
+        parser.add_argument(
+            '--similarity', type=float, default=DEFAULT_SIMILARITY,
+            help=f"같은 카페로 볼 최소 이름 유사도 (0~1, 기본값 {DEFAULT_SIMILARITY:g})",
+        )
+        parser.add_argument(
+            '--merge', action='store_true',
+            help="후보를 출력만 하지 않고 실제로 합침 (별점/리뷰를 남길 카페로 옮기고 나머지는 삭제 표시)",
+        )
+
+    def handle(self, *args, **options):
+        merges, pairs = find_duplicate_groups(options['radius'], options['similarity'])
+
+        names = dict(Cafe.objects.filter(id__in=[cafe_id for pair in pairs for cafe_id in pair[:2]])
+                     .values_list('id', 'name'))
+        for a, b, distance_m, similarity in pairs:
+            self.stdout.write(
+                f"{a} {names[a]!r} ~ {b} {names[b]!r}: {distance_m:.1f}m, similarity {similarity:.2f}")
+        for survivor, duplicates in merges:
+            self.stdout.write(f"keep {survivor}, merge {', '.join(map(str, duplicates))}")
+
+        if options['merge']:
+            merged = merge_cafes(merges)
+            self.stdout.write(self.style.SUCCESS(f"Merged {merged} duplicate cafes into {len(merges)} cafes"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Found {len(merges)} duplicate groups ({sum(len(d) for _, d in merges)} cafes to merge); "
+                f"run with --merge to apply"))
@@ -0,0 +1,54 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import Cafe
+from main.serializers.cafe import CafeSerializer
+from main.services.cafe_bundle import build_cafe_bundle, decode_cafe_bundle
+
+
+class Command(BaseCommand):
+    help = "Export all active cafes as a compressed columnar binary bundle"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', required=True, help="번들 파일 경로")
+        parser.add_argument(
+            '--verify', action='store_true',
+            help="번들을 다시 읽어 DB와 같은지 확인하고 같은 데이터의 JSON과 크기/디코딩 시간을 비교",
+        )
+
+    def handle(self, *args, **options):
+        version, data = build_cafe_bundle()
+        with open(options['output'], 'wb') as file:
+            file.write(data)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported cafe bundle v{version} ({len(data)} bytes) to {options['output']}"))
+
+        if options['verify']:
+            self._verify(data)
+
+    def _verify(self, data):
+        started = time.perf_counter()
+        _, cafes = decode_cafe_bundle(data)
+        bundle_seconds = time.perf_counter() - started
+
+        expected = list(Cafe.objects.filter(is_active=True).order_by('id').values(
+            'id', 'name', 'address', 'isConcentrate', 'latitude', 'longitude', 'opening_minute', 'closing_minute'))
+        for cafe, row in zip(cafes, expected):
+            # 좌표는 1e-7도 단위로 반올림해서 저장
+            same_coords = abs(cafe['latitude'] - row['latitude']) < 1e-7 and abs(cafe['longitude'] - row['longitude']) < 1e-7
+            if not same_coords or {**cafe, 'latitude': 0, 'longitude': 0} != {**row, 'latitude': 0, 'longitude': 0}:
+                raise CommandError(f"번들 내용이 DB와 다릅니다: cafe {row['id']}")
+        if len(cafes) != len(expected):
+            raise CommandError("번들의 카페 수가 DB와 다릅니다.")
+
+        payload = json.dumps(CafeSerializer(Cafe.objects.filter(is_active=True).order_by('id'), many=True).data,
+                             ensure_ascii=False).encode('utf-8')
+        started = time.perf_counter()
+        json.loads(payload)
+        json_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f"Round-trip OK for {len(cafes)} cafes. "
+            f"bundle {len(data)} bytes / decode {bundle_seconds * 1000:.1f}ms, "
+            f"JSON {len(payload)} bytes / decode {json_seconds * 1000:.1f}ms")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from main.services.naver_fake import FakeNaverServer
+
+
+class Command(BaseCommand):
+    help = "Run a local fake of the Naver place search API (set NAVER_API_BASE_URL to the printed URL to work offline)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--port', type=int, default=8765,
+            help="서버 포트 (기본값 8765)",
+        )
+        parser.add_argument(
+            '--host', default='127.0.0.1',
+            help="서버 주소 (기본값 127.0.0.1)",
+        )
+
+    def handle(self, *args, **options):
+        fake = FakeNaverServer(host=options['host'], port=options['port'], verbose=True)
+        self.stdout.write(self.style.SUCCESS(f"Fake Naver place search API listening on {fake.url}"))
+        try:
+            fake.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            fake.stop()
@@ -1,38 +1,50 @@
 import os
 import json
 from django.core.management.base import BaseCommand
-from main.models import Cafe  # Cafe 모델 가져오기
 from django.conf import settings  # BASE_DIR 사용
 
+from main.services.cafe_import import DEFAULT_BATCH_SIZE, import_cafes, iter_cafe_records
+
 
 class Command(BaseCommand):
-    help = "Load cafes from a JSON file located in the main app's data directory"
+    help = "Load cafes from a JSON array or NDJSON file (defaults to the main app's data directory)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?',
+            default=os.path.join(settings.BASE_DIR, 'main', 'data', 're_concentrate_true_stores.json'),
+            help="카페 데이터 파일 경로 (JSON 배열 또는 NDJSON)",
+        )
+        parser.add_argument(
+            '--format', choices=['auto', 'json', 'ndjson'], default='auto',
+            help="파일 형식 (기본값: 확장자로 판단, .ndjson/.jsonl이면 NDJSON)",
+        )
+        parser.add_argument(
+            '--sync', action='store_true',
+            help="파일을 전체 데이터로 보고, 파일에 없는 기존 카페를 삭제 표시",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help="한 트랜잭션에서 저장하는 카페 수",
+        )
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
         # JSON 파일 경로 설정
-        file_path = os.path.join(settings.BASE_DIR, 'main', 'data', 're_concentrate_true_stores.json')
+        file_path = options['path']
 
         try:
-            # JSON 파일 읽기
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-
-            # JSON 데이터를 Cafe 모델에 저장
-            for entry in data:
-                Cafe.objects.update_or_create(
-                    name=entry['name'],
-                    defaults={
-                        'address': entry.get('address'),
-                        'isConcentrate': entry.get('isConcentrate', False),
-                        'opening_hours': entry.get('opening_hours'),
-                        'latitude': float(entry['latitude']),
-                        'longitude': float(entry['longitude']),
-                    }
-                )
-            self.stdout.write(
-                self.style.SUCCESS(f"Successfully loaded {len(data)} cafes into the database from {file_path}"))
+            # 파일을 스트리밍으로 읽으면서 외부 키 기준으로 일괄 upsert
+            counts = import_cafes(
+                iter_cafe_records(file_path, options['format']),
+                batch_size=options['batch_size'],
+                sync=options['sync'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Loaded cafes from {file_path}: "
+                f"{counts['inserted']} inserted, {counts['updated']} updated, "
+                f"{counts['unchanged']} unchanged, {counts['deleted']} deleted, {counts['skipped']} skipped"))
 
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f"File not found: {file_path}"))
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, ValueError):
             self.stdout.write(self.style.ERROR(f"Invalid JSON format in file: {file_path}"))
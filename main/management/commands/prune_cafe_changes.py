@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from main.models import CafeChange
+from main.services.cafe_changes import latest_change_version
+
+
+class Command(BaseCommand):
+    help = "Delete cafe change log entries older than the retention window (older clients get a full resync)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days', type=int, default=30,
+            help="보관할 기간 (일, 기본값 30)",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['keep_days'])
+        # 가장 최근 기록은 현재 버전을 나타내므로 항상 남겨 둠
+        deleted, _ = CafeChange.objects.filter(changed_at__lt=cutoff, id__lt=latest_change_version()).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} cafe change log entries"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from main.services.ratings import recompute_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized rating sum/count/histogram on cafes from the Rating table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cafe', type=int, action='append', dest='cafe_ids',
+            help="다시 계산할 카페 ID (여러 번 지정 가능, 생략하면 전체)",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="한 번에 저장할 카페 수",
+        )
+
+    def handle(self, *args, **options):
+        changed = recompute_rating_aggregates(options.get('cafe_ids'), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Repaired rating aggregates on {changed} cafes"))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.services.district_rankings import (
+    refresh_all_district_rankings, refresh_dirty_districts, refresh_district_ranking,
+)
+from main.services.districts import DISTRICT_AREAS
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed per-district cafe leaderboards"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--district', action='append', dest='districts',
+            help="다시 계산할 자치구 코드 (여러 번 지정 가능, 생략하면 전체)",
+        )
+        parser.add_argument(
+            '--dirty', action='store_true',
+            help="별점/리뷰/카페 변경으로 갱신 필요 표시된 자치구만 다시 계산 (재계산 간격 무시, 주기 실행용)",
+        )
+
+    def handle(self, *args, **options):
+        districts = options.get('districts')
+        if options['dirty']:
+            count = refresh_dirty_districts(districts, interval=0)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt rankings for {count} dirty districts"))
+            return
+        if not districts:
+            rows = refresh_all_district_rankings()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt rankings for all districts ({rows} rows)"))
+            return
+
+        unknown = [code for code in districts if code not in DISTRICT_AREAS]
+        if unknown:
+            raise CommandError(f"알 수 없는 자치구 코드: {', '.join(unknown)}")
+        rows = sum(refresh_district_ranking(code) for code in districts)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rankings for {len(districts)} districts ({rows} rows)"))
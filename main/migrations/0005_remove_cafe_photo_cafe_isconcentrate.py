@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_remove_cafe_branch_alter_cafe_name'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='cafe',
+            name='photo',
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='isConcentrate',
+            field=models.BooleanField(default=False),
+        ),
+    ]
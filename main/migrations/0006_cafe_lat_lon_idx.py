@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_remove_cafe_photo_cafe_isconcentrate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cafe',
+            index=models.Index(fields=['latitude', 'longitude'], name='cafe_lat_lon_idx'),
+        ),
+    ]
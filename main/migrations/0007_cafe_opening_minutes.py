@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:35
+
+from django.db import migrations, models
+
+
+# services.opening_hours.parse_opening_hours의 작성 시점 사본 (앱 코드가 바뀌어도 이 마이그레이션은 그대로 동작)
+def parse_opening_hours(opening_hours):
+    if not opening_hours:
+        return None
+    try:
+        start, end = opening_hours.split("-")
+        return parse_clock(start), parse_clock(end)
+    except ValueError:
+        return None
+
+
+def parse_clock(text):
+    hour, minute = text.strip().split(":")
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour <= 24 and 0 <= minute < 60) or (hour == 24 and minute):
+        raise ValueError(f"잘못된 시각입니다: {text}")
+    return hour * 60 + minute
+
+
+def compile_opening_hours(apps, schema_editor):
+    Cafe = apps.get_model('main', 'Cafe')
+    cafes = list(Cafe.objects.exclude(opening_hours__isnull=True).exclude(opening_hours=''))
+    for cafe in cafes:
+        parsed = parse_opening_hours(cafe.opening_hours)
+        cafe.opening_minute, cafe.closing_minute = parsed if parsed else (None, None)
+    Cafe.objects.bulk_update(cafes, ['opening_minute', 'closing_minute'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_cafe_lat_lon_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafe',
+            name='closing_minute',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='opening_minute',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(compile_opening_hours, migrations.RunPython.noop),
+    ]
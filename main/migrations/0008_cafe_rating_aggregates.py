@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:39
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def compute_rating_aggregates(apps, schema_editor):
+    Cafe = apps.get_model('main', 'Cafe')
+    Rating = apps.get_model('main', 'Rating')
+    rows = Rating.objects.values('cafe_id').annotate(
+        rating_sum=Sum('rating'),
+        rating_count=Count('id'),
+        **{f'rating_{star}': Count('id', filter=Q(rating=star)) for star in range(1, 6)},
+    ).order_by()
+    fields = ['rating_sum', 'rating_count', *(f'rating_{star}' for star in range(1, 6))]
+    cafes = []
+    for row in rows:
+        cafe = Cafe(id=row['cafe_id'])
+        for field in fields:
+            setattr(cafe, field, row[field])
+        cafes.append(cafe)
+    Cafe.objects.bulk_update(cafes, fields, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_cafe_opening_minutes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafe',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(compute_rating_aggregates, migrations.RunPython.noop),
+    ]
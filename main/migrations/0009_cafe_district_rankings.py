@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# services.districts의 작성 시점 사본 (앱 코드가 바뀌어도 이 마이그레이션은 그대로 동작)
+SEOUL_PREFIXES = ("서울특별시", "서울시", "서울")
+DISTRICT_CODES_BY_NAME = {
+    "종로구": "11110",
+    "중구": "11140",
+    "용산구": "11170",
+    "성동구": "11200",
+    "광진구": "11215",
+    "동대문구": "11230",
+    "중랑구": "11260",
+    "성북구": "11290",
+    "강북구": "11305",
+    "도봉구": "11320",
+    "노원구": "11350",
+    "은평구": "11380",
+    "서대문구": "11410",
+    "마포구": "11440",
+    "양천구": "11470",
+    "강서구": "11500",
+    "구로구": "11530",
+    "금천구": "11545",
+    "영등포구": "11560",
+    "동작구": "11590",
+    "관악구": "11620",
+    "서초구": "11650",
+    "강남구": "11680",
+    "송파구": "11710",
+    "강동구": "11740",
+}
+
+
+def district_code_from_address(address):
+    if not address:
+        return None
+    words = address.split()
+    if len(words) < 2 or words[0] not in SEOUL_PREFIXES:
+        return None
+    return DISTRICT_CODES_BY_NAME.get(words[1])
+
+
+def assign_districts(apps, schema_editor):
+    Cafe = apps.get_model('main', 'Cafe')
+    cafes = list(Cafe.objects.exclude(address__isnull=True).exclude(address=''))
+    for cafe in cafes:
+        cafe.district_code = district_code_from_address(cafe.address)
+    Cafe.objects.bulk_update(cafes, ['district_code'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_cafe_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafe',
+            name='district_code',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=5, null=True),
+        ),
+        migrations.CreateModel(
+            name='DistrictCafeRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district_code', models.CharField(max_length=5)),
+                ('kind', models.CharField(choices=[('all', '전체 카페'), ('concentrate', '집중하기 좋은 카페')], max_length=12)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cafe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='district_rankings', to='main.cafe')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('district_code', 'kind', 'rank'), name='district_ranking_rank_uniq')],
+            },
+        ),
+        migrations.RunPython(assign_districts, migrations.RunPython.noop),
+    ]
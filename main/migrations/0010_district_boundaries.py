@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:45
+
+from django.db import migrations, models
+
+# 마이그레이션 작성 시점의 활동 지역 -> 자치구 코드 (services.districts.SEOUL_DISTRICTS가 바뀌어도 이 마이그레이션은 그대로)
+DISTRICT_CODES_BY_AREA = {
+    "서울특별시 종로구": "11110",
+    "서울특별시 중구": "11140",
+    "서울특별시 용산구": "11170",
+    "서울특별시 성동구": "11200",
+    "서울특별시 광진구": "11215",
+    "서울특별시 동대문구": "11230",
+    "서울특별시 중랑구": "11260",
+    "서울특별시 성북구": "11290",
+    "서울특별시 강북구": "11305",
+    "서울특별시 도봉구": "11320",
+    "서울특별시 노원구": "11350",
+    "서울특별시 은평구": "11380",
+    "서울특별시 서대문구": "11410",
+    "서울특별시 마포구": "11440",
+    "서울특별시 양천구": "11470",
+    "서울특별시 강서구": "11500",
+    "서울특별시 구로구": "11530",
+    "서울특별시 금천구": "11545",
+    "서울특별시 영등포구": "11560",
+    "서울특별시 동작구": "11590",
+    "서울특별시 관악구": "11620",
+    "서울특별시 서초구": "11650",
+    "서울특별시 강남구": "11680",
+    "서울특별시 송파구": "11710",
+    "서울특별시 강동구": "11740",
+}
+
+
+def assign_profile_districts(apps, schema_editor):
+    Profile = apps.get_model('main', 'Profile')
+    profiles = list(Profile.objects.all())
+    for profile in profiles:
+        profile.district_code = DISTRICT_CODES_BY_AREA.get(profile.area)
+    Profile.objects.bulk_update(profiles, ['district_code'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_cafe_district_rankings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='district_code',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=5, null=True),
+        ),
+        migrations.RunPython(assign_profile_districts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:46
+
+import hashlib
+
+from django.db import migrations, models
+
+
+# services.cafe_import.derive_external_id의 작성 시점 사본 (앱 코드가 바뀌어도 이 마이그레이션은 그대로 동작)
+def derive_external_id(name, address):
+    key = "\n".join(" ".join((value or "").split()) for value in (name, address))
+    return "na:" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def assign_external_ids(apps, schema_editor):
+    # 이전 가져오기 데이터는 원본 ID가 없으므로 가져오기와 같은 이름 + 주소 키를 부여
+    Cafe = apps.get_model('main', 'Cafe')
+    cafes = list(Cafe.objects.filter(external_id__isnull=True).only('id', 'name', 'address'))
+    seen = set()
+    for cafe in cafes:
+        key = derive_external_id(cafe.name, cafe.address)
+        cafe.external_id = key if key not in seen else None  # 이름과 주소가 모두 같은 중복 행은 비워 둠
+        seen.add(key)
+    Cafe.objects.bulk_update(cafes, ['external_id'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_district_boundaries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafe',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_external_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:49
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+# services.cafe_changes의 작성 시점 사본 (앱 코드가 바뀌어도 이 마이그레이션은 그대로 동작)
+CONTENT_FIELDS = ("name", "address", "isConcentrate", "opening_hours", "latitude", "longitude")
+
+
+def content_hash(values):
+    payload = json.dumps(list(values), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def hash_existing_cafes(apps, schema_editor):
+    # 기존 카페의 내용 해시를 계산하고 변경 기록의 시작점으로 추가 기록을 남김
+    Cafe = apps.get_model('main', 'Cafe')
+    CafeChange = apps.get_model('main', 'CafeChange')
+    cafes = list(Cafe.objects.order_by('id'))
+    for cafe in cafes:
+        cafe.content_hash = content_hash(getattr(cafe, field) for field in CONTENT_FIELDS)
+    Cafe.objects.bulk_update(cafes, ['content_hash'], batch_size=500)
+    CafeChange.objects.bulk_create([
+        CafeChange(cafe_id=cafe.id, external_id=cafe.external_id, action='created', content_hash=cafe.content_hash)
+        for cafe in cafes
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_cafe_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CafeChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cafe_id', models.BigIntegerField(db_index=True)),
+                ('external_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('action', models.CharField(choices=[('created', '추가'), ('updated', '변경'), ('deleted', '삭제')], max_length=7)),
+                ('content_hash', models.CharField(blank=True, max_length=40)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='cafe',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.RunPython(hash_existing_cafes, migrations.RunPython.noop),
+    ]
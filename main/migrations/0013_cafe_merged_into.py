@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_cafe_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafe',
+            name='merged_into',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='merged_cafes', to='main.cafe'),
+        ),
+    ]
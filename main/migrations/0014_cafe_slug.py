@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:59
+
+import hashlib
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+# services.slugs.cafe_slug의 작성 시점 사본 (앱 코드가 바뀌어도 이 마이그레이션은 그대로 동작).
+# 여기서는 항상 키를 넘기므로 키가 없을 때의 임의 값 처리는 뺐다.
+SLUG_HASH_LENGTH = 10
+MAX_NAME_SLUG_LENGTH = 80
+
+
+def cafe_slug(name, key):
+    base = slugify(name or "", allow_unicode=True)[:MAX_NAME_SLUG_LENGTH].strip("-") or "cafe"
+    return f"{base}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:SLUG_HASH_LENGTH]}"
+
+
+def assign_slugs(apps, schema_editor):
+    # 외부 키가 없는 행은 id로 해시를 만들어 다시 실행해도 같은 slug가 되게 함
+    Cafe = apps.get_model('main', 'Cafe')
+    cafes = list(Cafe.objects.filter(slug__isnull=True).only('id', 'name', 'external_id'))
+    for cafe in cafes:
+        cafe.slug = cafe_slug(cafe.name, cafe.external_id or f"id:{cafe.pk}")
+    Cafe.objects.bulk_update(cafes, ['slug'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_cafe_merged_into'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafe',
+            name='slug',
+            field=models.SlugField(allow_unicode=True, blank=True, editable=False, max_length=100, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_slugs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_cafe_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistrictRankingState',
+            fields=[
+                ('district_code', models.CharField(max_length=5, primary_key=True, serialize=False)),
+                ('dirty', models.BooleanField(default=False)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
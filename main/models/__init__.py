@@ -7,4 +7,6 @@ from .position import Position
 from .review import Review
 from .ftf import FTF
 from .anonymous import Anonymous
-from .profile import Profile
\ No newline at end of file
+from .profile import Profile
+from .ranking import DistrictCafeRanking, DistrictRankingState
+from .cafe_change import CafeChange
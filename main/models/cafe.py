@@ -1,44 +1,136 @@
-from django.db import models
-from datetime import datetime
-from django.utils.timezone import now
+from django.db import models, transaction
+
+from ..services.cafe_changes import CONTENT_FIELDS, cafe_content_hash, log_cafe_changes
+from ..services.district_boundaries import classify_district
+from ..services.opening_hours import current_minute, opening_status, parse_opening_hours
+from ..services.slugs import cafe_slug
 
 
 class Cafe(models.Model):
+    # 가져오기(load_cafes)에서 쓰는 안정 키: 원본 데이터의 ID, 없으면 이름 + 주소 해시
+    external_id = models.CharField(max_length=64, unique=True, blank=True, null=True)
     name = models.CharField(max_length=300)
+    # 상세 조회용 고유 주소 ("이름-해시", services.slugs.cafe_slug). 처음 저장할 때 정하고 바꾸지 않음
+    slug = models.SlugField(max_length=100, unique=True, allow_unicode=True, blank=True, null=True, editable=False)
     address = models.CharField(max_length=300, blank=True, null=True)
     isConcentrate = models.BooleanField(default=False)  # 집중하기 좋은 카페
     opening_hours = models.CharField(max_length=100, blank=True, null=True)
+    # opening_hours를 저장 시점에 한 번만 해석해 둔 값 (하루 중 분, 매일 동일)
+    # 닫는 시각이 여는 시각보다 이르면 자정을 넘겨 영업, 해석할 수 없으면 둘 다 None
+    opening_minute = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
+    closing_minute = models.PositiveSmallIntegerField(blank=True, null=True, editable=False)
     latitude = models.FloatField()
-    longitude = models.FloatField()\
+    longitude = models.FloatField()
+    # 자치구 코드 (services.districts.SEOUL_DISTRICTS), 저장 시 좌표(경계 다각형) 또는 주소로 계산
+    district_code = models.CharField(max_length=5, blank=True, null=True, editable=False, db_index=True)
+    # 별점 집계 (Rating 추가/수정/삭제와 같은 트랜잭션에서 F() 식으로 갱신, services.ratings 참고)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)  # 별점 합계
+    rating_count = models.PositiveIntegerField(default=0, editable=False)  # 별점 개수
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)  # 별점별 개수 (1~5)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+    # CONTENT_FIELDS 값의 해시. 가져오기에서 바뀐 카페만 골라 저장하는 데 사용
+    content_hash = models.CharField(max_length=40, blank=True, default='', editable=False)
+    # False면 원본 데이터에서 사라진 카페 (삭제 표시만 하고 행은 남겨 둠, 검색/순위에서 제외)
+    is_active = models.BooleanField(default=True, db_index=True)
+    # 중복 정리(dedupe_cafes)로 합쳐졌다면 남긴 카페. 합쳐진 카페는 가져오기에서 다시 활성화하지 않음
+    merged_into = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, blank=True, null=True, editable=False, related_name='merged_cafes'
+    )
+
+    # 자치구 순위에 영향을 주는 필드. 저장 전후 값이 같으면 순위를 다시 계산하지 않는다 (signals 참고)
+    RANKING_FIELDS = ('district_code', 'is_active', 'isConcentrate', 'rating_sum', 'rating_count')
+
+    class Meta:
+        indexes = [
+            # 반경 검색의 위경도 사각형(BETWEEN) 필터용 복합 인덱스
+            models.Index(fields=['latitude', 'longitude'], name='cafe_lat_lon_idx'),
+        ]
+
+    def compile_opening_hours(self):
+        """
+        opening_hours 문자열을 opening_minute / closing_minute로 변환.
+        """
+        parsed = parse_opening_hours(self.opening_hours)
+        self.opening_minute, self.closing_minute = parsed if parsed else (None, None)
+
+    def assign_district(self):
+        """
+        좌표가 속한 자치구 경계로 자치구 코드를 계산 (경계 데이터가 없거나 서울 밖이면 주소로 계산).
+        """
+        self.district_code = classify_district(self.latitude, self.longitude, self.address)
+
+    def save(self, *args, **kwargs):
+        self.compile_opening_hours()
+        self.assign_district()
+        self.content_hash = cafe_content_hash(self)
+        new_slug = not self.slug
+        if new_slug:
+            self.slug = cafe_slug(self.name, self.external_id)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if new_slug:
+                update_fields.add('slug')
+            if 'opening_hours' in update_fields:
+                update_fields |= {'opening_minute', 'closing_minute'}
+            if update_fields & {'address', 'latitude', 'longitude'}:
+                update_fields.add('district_code')
+            if update_fields & set(CONTENT_FIELDS):
+                update_fields.add('content_hash')
+            kwargs['update_fields'] = update_fields
 
-    def get_status(self):
+        with transaction.atomic():
+            previous = None
+            # 저장 전 순위 관련 값 (새 카페면 None). post_save 시그널에서 순위 갱신 여부를 판단하는 데 사용
+            self._previous_ranking_state = None
+            if self.pk is not None:
+                row = type(self).objects.filter(pk=self.pk).values_list(
+                    'content_hash', 'is_active', *self.RANKING_FIELDS).first()
+                if row is not None:
+                    previous, self._previous_ranking_state = row[:2], row[2:]
+            super().save(*args, **kwargs)
+            # 내용이나 삭제 표시가 실제로 바뀐 경우에만 변경 기록 추가
+            if previous is None:
+                action = 'created' if self.is_active else None
+            elif not self.is_active:
+                action = 'deleted' if previous[1] else None
+            elif previous != (self.content_hash, True):
+                action = 'updated'
+            else:
+                action = None
+            if action:
+                log_cafe_changes([(self.pk, self.external_id, action, '' if action == 'deleted' else self.content_hash)])
+
+    def get_status(self, minute=None):
         """
-        현재 시간에 따라 영업 상태 반환:
+        현재 시간(또는 하루 중 minute)에 따라 영업 상태 반환:
         - "영업 전"
         - "영업 중"
         - "영업 종료"
         - "영업 시간 정보를 제공해주지 않는 카페입니다."
         """
-        if not self.opening_hours:
+        if self.opening_minute is None or self.closing_minute is None:
+            # 영업 시간이 없거나 잘못된 형식인 경우
             return "영업 시간 정보를 제공해주지 않는 카페입니다."
+        if minute is None:
+            minute = current_minute()
+        return opening_status(self.opening_minute, self.closing_minute, minute)
 
-        try:
-            start_time, end_time = self.opening_hours.split("-")
-            current_time = now().time()
-            start_time = datetime.strptime(start_time.strip(), "%H:%M").time()
-            end_time = datetime.strptime(end_time.strip(), "%H:%M").time()
+    @property
+    def average_rating(self):
+        """
+        평균 별점 (별점이 없으면 0).
+        """
+        return self.rating_sum / self.rating_count if self.rating_count else 0
 
-            if current_time < start_time:
-                return "영업 전"
-            elif start_time <= current_time <= end_time:
-                return "영업 중"
-            else:
-                return "영업 종료"
-        except ValueError:
-            return "영업 시간 정보를 제공해주지 않는 카페입니다."  # 잘못된 형식의 영업 시간도 처리
+    def rating_distribution(self):
+        """
+        별점별 개수 {1: n, ..., 5: n}.
+        """
+        return {star: getattr(self, f'rating_{star}') for star in range(1, 6)}
 
     def __str__(self):
         return self.name
-
-
-
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class CafeChange(models.Model):
+    """
+    카페 추가/변경/삭제 기록. id가 곧 단조 증가하는 데이터 버전이다 (services.cafe_changes 참고).
+    카페가 완전히 지워져도 기록이 남도록 외래 키 대신 cafe_id 값만 저장.
+    """
+    ACTION_CHOICES = [
+        ("created", "추가"),
+        ("updated", "변경"),
+        ("deleted", "삭제"),
+    ]
+
+    cafe_id = models.BigIntegerField(db_index=True)  # 대상 카페 ID
+    external_id = models.CharField(max_length=64, blank=True, null=True)  # 대상 카페의 외부 키
+    action = models.CharField(max_length=7, choices=ACTION_CHOICES)
+    content_hash = models.CharField(max_length=40, blank=True)  # 변경 후 내용 해시 (삭제면 빈 값)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"v{self.id} {self.action} cafe {self.cafe_id}"
@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.db import models
 
+from ..services.district_boundaries import classify_district
+from ..services.districts import district_code_for_area
+
 class Profile(models.Model):
     GENDER_CHOICES = [
         ("M", "남성"),
@@ -49,6 +52,21 @@ class Profile(models.Model):
     area = models.CharField(max_length=20, choices=AREA_CHOICES)  # 'area' 필드 추가
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
+    # 자치구 코드 (services.districts.SEOUL_DISTRICTS), 저장 시 좌표(경계 다각형) 또는 활동 지역으로 계산
+    district_code = models.CharField(max_length=5, blank=True, null=True, editable=False, db_index=True)
+
+    def assign_district(self):
+        """
+        좌표가 있으면 좌표가 속한 자치구, 없거나 서울 밖이면 활동 지역(area)의 자치구 코드를 저장.
+        """
+        self.district_code = classify_district(self.latitude, self.longitude) or district_code_for_area(self.area)
+
+    def save(self, *args, **kwargs):
+        self.assign_district()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & {'area', 'latitude', 'longitude'}:
+            kwargs['update_fields'] = {*update_fields, 'district_code'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.nickname
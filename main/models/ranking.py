@@ -0,0 +1,42 @@
+from django.db import models
+from .cafe import Cafe
+
+
+class DistrictCafeRanking(models.Model):
+    """
+    자치구별 상위 카페 순위를 미리 계산해 둔 테이블 (services.district_rankings에서 갱신).
+    """
+    KIND_CHOICES = [
+        ("all", "전체 카페"),
+        ("concentrate", "집중하기 좋은 카페"),
+    ]
+
+    district_code = models.CharField(max_length=5)  # 자치구 코드
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES)  # 순위 종류
+    rank = models.PositiveSmallIntegerField()  # 순위 (1부터)
+    cafe = models.ForeignKey(Cafe, on_delete=models.CASCADE, related_name='district_rankings')
+    score = models.FloatField()  # 베이지안 평균 별점
+    rating_count = models.PositiveIntegerField(default=0)  # 계산 시점의 별점 개수
+    review_count = models.PositiveIntegerField(default=0)  # 계산 시점의 리뷰 개수
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # (자치구, 종류, 순위) 조회가 이 유니크 인덱스 하나로 끝나도록 함
+            models.UniqueConstraint(fields=['district_code', 'kind', 'rank'], name='district_ranking_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.district_code} {self.kind} #{self.rank} {self.cafe}"
+
+
+class DistrictRankingState(models.Model):
+    """
+    자치구 순위의 갱신 상태. 모든 워커가 같은 DB 행을 보므로 캐시 설정과 상관없이 변경 표시가 공유된다.
+    """
+    district_code = models.CharField(max_length=5, primary_key=True)  # 자치구 코드
+    dirty = models.BooleanField(default=False)  # 마지막 재계산 이후 별점/리뷰/카페 변경이 있었는지
+    refreshed_at = models.DateTimeField(blank=True, null=True)  # 마지막 재계산 시각
+
+    def __str__(self):
+        return f"{self.district_code} dirty={self.dirty} refreshed_at={self.refreshed_at}"
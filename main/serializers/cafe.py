@@ -1,7 +1,6 @@
 from rest_framework import serializers
 from ..models.cafe import Cafe
-from datetime import datetime
-from django.utils.timezone import now, localtime
+from ..services.opening_hours import current_minute, format_opening_hours, opening_status
 
 
 class CafeSerializer(serializers.ModelSerializer):
@@ -21,42 +20,49 @@ class CafeSerializer(serializers.ModelSerializer):
 
     def get_opening_hours(self, obj):
         """
-        영업 시간 필드를 "HH:MM까지" 형식으로 반환.
+        영업 시간 필드를 "HH:MM - HH:MM" 형식으로 반환 (저장 시 해석해 둔 값 사용).
         """
+        if obj.opening_minute is not None and obj.closing_minute is not None:
+            return format_opening_hours(obj.opening_minute, obj.closing_minute)
         if obj.opening_hours:
-            try:
-                start_time, end_time = obj.opening_hours.split("-")
-                start_time = start_time.strip()
-                end_time = end_time.strip()
-                return f"{start_time} - {end_time}"  # 친절하게 포맷팅된 영업 시간 반환
-            except ValueError:
-                return "영업 시간 정보가 잘못되었습니다."
+            return "영업 시간 정보가 잘못되었습니다."
         return None  # 영업 시간 정보가 없는 경우
 
     def get_is_open(self, obj):
         """
-        현재 영업 상태를 반환.
+        현재 영업 상태를 반환 (저장 시 해석해 둔 분 단위 영업 시간과 현재 시각 비교).
         """
+        if obj.opening_minute is not None and obj.closing_minute is not None:
+            return opening_status(obj.opening_minute, obj.closing_minute, self._current_minute())
         if obj.opening_hours:
-            try:
-                # "08:00 - 20:00" 형식에서 시작 및 종료 시간 추출
-                start_time, end_time = obj.opening_hours.split("-")
-                start_time = datetime.strptime(start_time.strip(), "%H:%M").time()  # 시간 변환
-                end_time = datetime.strptime(end_time.strip(), "%H:%M").time()
-
-                # 현재 시간을 로컬 시간으로 변환
-                current_time = localtime(now()).time()
-                print(f"DEBUG: Start={start_time}, End={end_time}, Current={current_time}")  # 디버깅 로그
-
-                # 영업 상태 판단
-                if start_time <= current_time <= end_time:
-                    return "영업 중"
-                elif current_time < start_time:
-                    return "영업 전"
-                else:
-                    return "영업 종료"
-            except ValueError:
-                # 형식이 잘못된 경우 처리
-                return "영업 시간 정보가 잘못되었습니다."
+            # 형식이 잘못된 경우 처리
+            return "영업 시간 정보가 잘못되었습니다."
         return "영업 시간 정보가 제공되지 않았습니다."
 
+    def _current_minute(self):
+        """
+        현재 로컬 시각(분). 목록 직렬화 시 요청마다 한 번만 계산해 컨텍스트에 보관.
+        """
+        if 'current_minute' not in self.context:
+            self.context['current_minute'] = current_minute()
+        return self.context['current_minute']
+
+
+class CafeDetailSerializer(CafeSerializer):
+    """
+    카페 상세 정보 (목록 항목 + 상세 주소용 id/slug, 별점 집계, 리뷰 수).
+    review_count는 조회 시 annotate한 값을 사용.
+    """
+    average_rating = serializers.SerializerMethodField()
+    rating_distribution = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(read_only=True)
+
+    class Meta(CafeSerializer.Meta):
+        fields = ['id', 'slug', *CafeSerializer.Meta.fields,
+                  'isConcentrate', 'average_rating', 'rating_count', 'rating_distribution', 'review_count']
+
+    def get_average_rating(self, obj):
+        return round(obj.average_rating, 2)
+
+    def get_rating_distribution(self, obj):
+        return obj.rating_distribution()
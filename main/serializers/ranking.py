@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from ..models.ranking import DistrictCafeRanking
+from .cafe import CafeSerializer
+
+class DistrictCafeRankingSerializer(serializers.ModelSerializer):
+    cafe_id = serializers.IntegerField(read_only=True)  # 카페 ID
+    cafe = CafeSerializer(read_only=True)  # 카페 정보
+
+    class Meta:
+        model = DistrictCafeRanking
+        fields = ['rank', 'score', 'rating_count', 'review_count', 'cafe_id', 'cafe', 'updated_at']
@@ -9,3 +9,11 @@ class RatingSerializer(serializers.ModelSerializer):
         model = Rating
         fields = ['id', 'user', 'cafe', 'rating', 'created_at']  # 포함할 필드
         read_only_fields = ['created_at']  # 작성 시간은 읽기 전용
+
+    def validate_rating(self, value):
+        """
+        별점은 1~5 사이만 허용 (카페의 별점별 개수 집계와 맞추기 위함).
+        """
+        if not (1 <= value <= 5):
+            raise serializers.ValidationError("별점은 1에서 5 사이여야 합니다.")
+        return value
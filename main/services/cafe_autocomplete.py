@@ -0,0 +1,240 @@
+import heapq
+import threading
+from bisect import insort
+
+from .cafe_version import get_cafe_version
+from .korean_text import choseong, decompose_jamo, is_choseong_query, normalize_text
+
+MAX_SUGGESTIONS = 20  # 노드마다 미리 골라 두는 추천 수 (요청 가능한 최대 개수)
+BUCKET_SIZE = 16  # 리프 버킷이 이보다 커지면 다음 글자로 쪼갬
+
+
+class _Node:
+    """
+    children이 None이면 리프 버킷: entries에 이 접두어로 시작하는 항목 전체를 둔다.
+    아니면 내부 노드: entries에는 키가 여기서 끝나는 항목만, top에는 하위 전체의 상위 항목을 정렬해 둔다.
+    """
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self):
+        self.children = None
+        self.entries = []
+        self.top = None
+
+
+class PrefixTrie:
+    """
+    접두어별 상위 항목을 미리 골라 둔 트라이 (burst trie).
+    항목은 (-가중치, 이름 길이, cafe_id, 이름, 키) 튜플이라 튜플 순서가 곧 추천 순서이다.
+    글자마다 노드를 만들지 않고 항목이 적은 하위는 버킷 하나로 두므로, 이름이 수만 개여도 노드 수는 항목 수 정도에 그친다.
+    조회는 접두어 길이만큼 내려가 top을 잘라 주면 끝나고, 추가/삭제는 경로 위의 top만 고친다.
+    """
+
+    def __init__(self, size=MAX_SUGGESTIONS):
+        self.size = size
+        self._root = _Node()
+        self._root.children = {}
+        self._root.top = []
+
+    def _offer(self, node, entry):
+        """
+        내부 노드의 top에 항목을 넣어 보고 size를 넘으면 꼴찌를 버림.
+        """
+        top = node.top
+        if len(top) < self.size or entry < top[-1]:
+            insort(top, entry)
+            del top[self.size:]
+
+    def _burst(self, node, depth):
+        """
+        너무 커진 버킷을 depth번째 글자로 나눠 내부 노드로 바꿈. 한 글자 아래로 몰리면 계속 나눈다.
+        """
+        pending = [(node, depth)]
+        while pending:
+            node, depth = pending.pop()
+            entries, node.entries, node.children = node.entries, [], {}
+            node.top = heapq.nsmallest(self.size, entries)
+            for entry in entries:
+                key = entry[-1]
+                if len(key) == depth:
+                    node.entries.append(entry)
+                    continue
+                child = node.children.get(key[depth])
+                if child is None:
+                    child = node.children[key[depth]] = _Node()
+                child.entries.append(entry)
+            for child in node.children.values():
+                if len(child.entries) > BUCKET_SIZE:
+                    pending.append((child, depth + 1))
+
+    def insert(self, entry):
+        key = entry[-1]
+        node, depth = self._root, 0
+        while node.children is not None:
+            self._offer(node, entry)
+            if depth == len(key):
+                node.entries.append(entry)
+                return
+            child = node.children.get(key[depth])
+            if child is None:
+                child = node.children[key[depth]] = _Node()
+            node, depth = child, depth + 1
+        node.entries.append(entry)
+        if len(node.entries) > BUCKET_SIZE:
+            self._burst(node, depth)
+
+    def remove(self, entry):
+        key = entry[-1]
+        path = []  # [(부모 노드, 글자)]
+        node, depth = self._root, 0
+        while node.children is not None and depth < len(key):
+            path.append((node, key[depth]))
+            node = node.children.get(key[depth])
+            if node is None:
+                return
+            depth += 1
+        try:
+            node.entries.remove(entry)
+        except ValueError:
+            return
+        if node.children is not None:
+            path.append((node, None))
+
+        for parent, char in reversed(path):
+            if char is not None and parent.children[char].children is None and not parent.children[char].entries:
+                del parent.children[char]  # 빈 버킷
+            if entry in parent.top:
+                parent.top = self._collect(parent)
+
+    def _collect(self, node):
+        """
+        내부 노드의 top을 자식들의 top/버킷과 여기서 끝나는 항목으로 다시 계산.
+        """
+        candidates = list(node.entries)
+        for child in node.children.values():
+            candidates.extend(child.entries if child.children is None else child.top)
+        return heapq.nsmallest(self.size, candidates)
+
+    def top(self, prefix, limit):
+        """
+        키가 prefix로 시작하는 항목 중 앞에서 limit개.
+        """
+        node, depth = self._root, 0
+        while depth < len(prefix):
+            if node.children is None:
+                return heapq.nsmallest(limit, (entry for entry in node.entries if entry[-1].startswith(prefix)))
+            node = node.children.get(prefix[depth])
+            if node is None:
+                return []
+            depth += 1
+        if node.children is None:
+            return heapq.nsmallest(limit, node.entries)
+        return node.top[:limit]
+
+
+class CafeAutocomplete:
+    """
+    카페 이름 자동완성 (프로세스 내).
+    - 자모 트라이: 이름을 자모 입력 순서로 풀어 쓴 키. 음절을 입력하는 도중("스탑", "스타ㅂ")에도 "스타벅스"가 맞는다
+    - 초성 트라이: 이름의 초성 키. "ㅅㅌㅂ", "스ㅌㅂ" 같은 초성 검색용
+    별점 수(rating_count)가 많은 카페를, 같으면 이름이 짧은 카페를 먼저 추천한다.
+    """
+
+    def __init__(self, version=None):
+        self.version = version  # 자동완성이 반영하고 있는 카페 버전
+        self._jamo = PrefixTrie()
+        self._choseong = PrefixTrie()
+        self._entries = {}  # cafe_id -> (자모 트라이 항목, 초성 트라이 항목)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, cafe_id, name, rating_count):
+        """
+        카페를 추가. 이미 있는 카페라면 이름/별점 수를 갱신.
+        """
+        with self._lock:
+            self.remove(cafe_id)
+            normalized = normalize_text(name)
+            if not normalized:
+                return
+            rank = (-(rating_count or 0), len(normalized), cafe_id, name)
+            entries = (rank + (decompose_jamo(normalized),), rank + (choseong(normalized),))
+            self._entries[cafe_id] = entries
+            self._jamo.insert(entries[0])
+            self._choseong.insert(entries[1])
+
+    def remove(self, cafe_id):
+        """
+        카페를 제거. 없는 카페라면 무시.
+        """
+        with self._lock:
+            entries = self._entries.pop(cafe_id, None)
+            if entries is not None:
+                self._jamo.remove(entries[0])
+                self._choseong.remove(entries[1])
+
+    def suggest(self, query, limit):
+        """
+        :return: [(cafe_id, 이름, 별점 수), ...] (추천 순)
+        """
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+        with self._lock:
+            ranks = {entry[:4] for entry in self._jamo.top(decompose_jamo(normalized), limit)}
+            if is_choseong_query(normalized):
+                ranks.update(entry[:4] for entry in self._choseong.top(choseong(normalized), limit))
+        return [(cafe_id, name, -weight) for weight, _, cafe_id, name in heapq.nsmallest(limit, ranks)]
+
+
+_autocomplete = None
+_autocomplete_lock = threading.Lock()
+
+
+def build_cafe_autocomplete(version=None):
+    """
+    DB의 활성 카페로 자동완성 생성.
+    """
+    from ..models.cafe import Cafe
+
+    autocomplete = CafeAutocomplete(version=version)
+    rows = Cafe.objects.filter(is_active=True).values_list("id", "name", "rating_count").iterator(chunk_size=2000)
+    for cafe_id, name, rating_count in rows:
+        autocomplete.add(cafe_id, name, rating_count)
+    return autocomplete
+
+
+def get_cafe_autocomplete():
+    """
+    프로세스 전역 자동완성을 반환.
+    처음 호출될 때, 또는 카페 버전이 바뀌었는데 이 프로세스가 반영하지 못했을 때(일괄 가져오기, 다른 프로세스의 변경) 다시 생성.
+    카페 한 곳의 저장/삭제와 별점 수 변경은 시그널에서 add/remove로 바로 반영한다.
+    """
+    global _autocomplete
+    version = get_cafe_version()
+    autocomplete = _autocomplete
+    if autocomplete is None or autocomplete.version != version:
+        with _autocomplete_lock:
+            if _autocomplete is None or _autocomplete.version != version:
+                _autocomplete = build_cafe_autocomplete(version)
+            autocomplete = _autocomplete
+    return autocomplete
+
+
+def peek_cafe_autocomplete():
+    """
+    이미 생성된 자동완성만 반환 (없으면 None). 시그널에서 불필요한 생성을 막기 위해 사용.
+    """
+    return _autocomplete
+
+
+def reset_cafe_autocomplete():
+    """
+    자동완성을 버림. 다음 조회 때 다시 생성.
+    """
+    global _autocomplete
+    with _autocomplete_lock:
+        _autocomplete = None
@@ -0,0 +1,188 @@
+import struct
+import sys
+import zlib
+from array import array
+
+from django.core.cache import cache
+
+from .cafe_changes import latest_change_version
+
+# 번들 헤더: 매직, 형식 버전, 예약, 데이터 버전, 카페 수, 문자열 수, 압축 전 본문 크기, 본문 CRC32
+BUNDLE_MAGIC = b"NMDBNDL\0"
+BUNDLE_FORMAT = 1
+BUNDLE_HEADER = struct.Struct("<8sHHQIIII")
+
+COORD_SCALE = 10 ** 7  # 위경도를 정수(1e-7도, 약 1cm)로 저장
+NO_MINUTE = 0xFFFF  # 영업 시간 정보 없음
+NO_STRING = 0xFFFFFFFF  # 문자열 없음 (주소 없음 등)
+
+FLAG_CONCENTRATE = 1  # 집중하기 좋은 카페
+
+# 본문 열 순서 (이름, array 타입 코드). 모두 리틀 엔디언, 카페 수만큼의 길이
+BUNDLE_COLUMNS = (
+    ("ids", "q"),
+    ("latitudes", "i"),
+    ("longitudes", "i"),
+    ("opening_minutes", "H"),
+    ("closing_minutes", "H"),
+    ("names", "I"),
+    ("addresses", "I"),
+    ("flags", "B"),
+)
+
+
+class _StringTable:
+    """
+    같은 문자열(체인점 이름 등)은 한 번만 저장하는 문자열 테이블.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.strings = []
+
+    def add(self, value):
+        if value is None:
+            return NO_STRING
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return position
+
+    def encode(self):
+        """
+        :return: (끝 오프셋 uint32 배열, UTF-8 바이트)
+        """
+        offsets = array("I")
+        blob = bytearray()
+        for value in self.strings:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        return offsets, bytes(blob)
+
+
+def encode_cafe_bundle(rows, version):
+    """
+    카페 행을 열 단위 배열 + 문자열 테이블로 묶고 zlib으로 압축한 번들 바이트를 만든다.
+    :param rows: (id, name, address, isConcentrate, latitude, longitude, opening_minute, closing_minute) 튜플 목록
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("카페 번들은 리틀 엔디언 환경에서만 생성할 수 있습니다.")
+
+    columns = {name: array(typecode) for name, typecode in BUNDLE_COLUMNS}
+    strings = _StringTable()
+    for cafe_id, name, address, is_concentrate, latitude, longitude, open_minute, close_minute in rows:
+        columns["ids"].append(cafe_id)
+        columns["latitudes"].append(round(latitude * COORD_SCALE))
+        columns["longitudes"].append(round(longitude * COORD_SCALE))
+        columns["opening_minutes"].append(NO_MINUTE if open_minute is None else open_minute)
+        columns["closing_minutes"].append(NO_MINUTE if close_minute is None else close_minute)
+        columns["names"].append(strings.add(name))
+        columns["addresses"].append(strings.add(address))
+        columns["flags"].append(FLAG_CONCENTRATE if is_concentrate else 0)
+
+    offsets, blob = strings.encode()
+    body = b"".join([*(columns[name].tobytes() for name, _ in BUNDLE_COLUMNS), offsets.tobytes(), blob])
+    header = BUNDLE_HEADER.pack(
+        BUNDLE_MAGIC, BUNDLE_FORMAT, 0, version, len(columns["ids"]), len(strings.strings),
+        len(body), zlib.crc32(body),
+    )
+    return header + zlib.compress(body, 9)
+
+
+def decode_cafe_bundle(data):
+    """
+    encode_cafe_bundle의 역변환 (테스트/벤치마크 및 파이썬 클라이언트용).
+    :return: (데이터 버전, [{"id", "name", "address", "isConcentrate", "latitude", "longitude",
+              "opening_minute", "closing_minute"}, ...])
+    :raises ValueError: 형식이 다르거나 손상된 번들
+    """
+    if len(data) < BUNDLE_HEADER.size:
+        raise ValueError("카페 번들이 손상되었습니다.")
+    magic, bundle_format, _, version, count, string_count, body_size, crc = BUNDLE_HEADER.unpack_from(data)
+    if magic != BUNDLE_MAGIC or bundle_format != BUNDLE_FORMAT:
+        raise ValueError("카페 번들 형식이 올바르지 않습니다.")
+    try:
+        body = zlib.decompress(data[BUNDLE_HEADER.size:])
+    except zlib.error as e:
+        raise ValueError("카페 번들이 손상되었습니다.") from e
+    if len(body) != body_size or zlib.crc32(body) != crc:
+        raise ValueError("카페 번들이 손상되었습니다.")
+
+    # CRC는 본문만 검사하므로 헤더의 카페 수/문자열 수가 본문 크기와 맞는지도 확인
+    column_size = sum(struct.calcsize(typecode) for _, typecode in BUNDLE_COLUMNS) * count
+    if column_size + struct.calcsize("I") * string_count > len(body):
+        raise ValueError("카페 번들이 손상되었습니다.")
+
+    view = memoryview(body)
+    offset = 0
+    columns = {}
+    for name, typecode in (*BUNDLE_COLUMNS, ("string_offsets", "I")):
+        length = string_count if name == "string_offsets" else count
+        size = struct.calcsize(typecode) * length
+        columns[name] = view[offset:offset + size].cast(typecode)
+        offset += size
+    blob = bytes(view[offset:])
+
+    strings = []
+    start = 0
+    try:
+        for end in columns["string_offsets"]:
+            if not start <= end <= len(blob):
+                raise ValueError("카페 번들이 손상되었습니다.")
+            strings.append(blob[start:end].decode("utf-8"))
+            start = end
+    except UnicodeDecodeError as e:
+        raise ValueError("카페 번들이 손상되었습니다.") from e
+    if start != len(blob):
+        raise ValueError("카페 번들이 손상되었습니다.")
+
+    if any(index >= string_count for index in columns["names"]) or any(
+            index >= string_count and index != NO_STRING for index in columns["addresses"]):
+        raise ValueError("카페 번들이 손상되었습니다.")
+
+    cafes = []
+    for i in range(count):
+        open_minute = columns["opening_minutes"][i]
+        close_minute = columns["closing_minutes"][i]
+        address = columns["addresses"][i]
+        cafes.append({
+            "id": columns["ids"][i],
+            "name": strings[columns["names"][i]],
+            "address": None if address == NO_STRING else strings[address],
+            "isConcentrate": bool(columns["flags"][i] & FLAG_CONCENTRATE),
+            "latitude": columns["latitudes"][i] / COORD_SCALE,
+            "longitude": columns["longitudes"][i] / COORD_SCALE,
+            "opening_minute": None if open_minute == NO_MINUTE else open_minute,
+            "closing_minute": None if close_minute == NO_MINUTE else close_minute,
+        })
+    return version, cafes
+
+
+def build_cafe_bundle(version=None):
+    """
+    DB의 활성 카페 전체로 번들을 만든다.
+    :return: (데이터 버전, 번들 바이트)
+    """
+    from ..models.cafe import Cafe
+
+    if version is None:
+        version = latest_change_version()
+    rows = Cafe.objects.filter(is_active=True).order_by("id").values_list(
+        "id", "name", "address", "isConcentrate", "latitude", "longitude", "opening_minute", "closing_minute"
+    ).iterator(chunk_size=2000)
+    return version, encode_cafe_bundle(rows, version)
+
+
+def get_cafe_bundle():
+    """
+    현재 데이터 버전의 번들 (버전별로 캐시하므로 카페가 바뀔 때만 다시 생성).
+    :return: (데이터 버전, 번들 바이트)
+    """
+    version = latest_change_version()
+    key = f"main:cafe_bundle:{version}"
+    data = cache.get(key)
+    if data is None:
+        _, data = build_cafe_bundle(version)
+        cache.set(key, data, timeout=60 * 60)
+    return version, data
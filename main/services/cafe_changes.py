@@ -0,0 +1,42 @@
+import hashlib
+import json
+
+# 내용 해시에 들어가는 원본 필드 (저장 시 계산되는 필드는 이 값들로 결정되므로 제외)
+CONTENT_FIELDS = ("name", "address", "isConcentrate", "opening_hours", "latitude", "longitude")
+
+
+def content_hash(values):
+    """
+    CONTENT_FIELDS 순서의 값 목록으로 내용 해시를 계산. 실수는 repr 그대로 직렬화되므로 값이 같으면 해시도 같다.
+    """
+    payload = json.dumps(list(values), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def cafe_content_hash(cafe):
+    """
+    Cafe 객체의 내용 해시.
+    """
+    return content_hash(getattr(cafe, field) for field in CONTENT_FIELDS)
+
+
+def log_cafe_changes(changes):
+    """
+    변경 기록을 한 번에 추가. 호출한 쪽의 트랜잭션 안에서 카페 변경과 함께 저장된다.
+    :param changes: [(cafe_id, external_id, action, content_hash), ...]
+    """
+    from ..models.cafe_change import CafeChange
+
+    CafeChange.objects.bulk_create([
+        CafeChange(cafe_id=cafe_id, external_id=external_id, action=action, content_hash=hash_value)
+        for cafe_id, external_id, action, hash_value in changes
+    ])
+
+
+def latest_change_version():
+    """
+    현재 데이터 버전 (가장 최근 변경 기록의 id, 기록이 없으면 0).
+    """
+    from ..models.cafe_change import CafeChange
+
+    return CafeChange.objects.order_by('-id').values_list('id', flat=True).first() or 0
@@ -0,0 +1,266 @@
+import math
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+from .cafe_snapshot import get_cafe_snapshot
+
+TILE_SIZE_PX = 256  # 지도 타일 한 장의 크기 (웹 메르카토르)
+MAX_MERCATOR_LAT = 85.05112878  # 웹 메르카토르로 나타낼 수 있는 위도 한계
+
+
+def mercator(latitude, longitude):
+    """
+    위경도를 웹 메르카토르 평면 좌표(0~1)로 변환. x는 동쪽, y는 남쪽으로 커진다.
+    """
+    sin = math.sin(math.radians(min(max(latitude, -MAX_MERCATOR_LAT), MAX_MERCATOR_LAT)))
+    x = longitude / 360 + 0.5
+    y = 0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+    return x, y
+
+
+def inverse_mercator(x, y):
+    """
+    mercator의 역변환.
+    :return: (latitude, longitude)
+    """
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y)))), (x - 0.5) * 360
+
+
+class CafeClusterIndex:
+    """
+    줌 단계별로 미리 묶어 둔 카페 클러스터 계층 (프로세스 내).
+    줌 z의 칸은 메르카토르 평면을 한 칸이 화면 cell_px 크기가 되도록 나눈 격자이고, z+1의 칸 네 개가 z의 칸 하나에
+    정확히 들어가므로 칸마다 (카페 수, 좌표 합)만 두면 계층 전체가 된다.
+    카페 하나를 추가/삭제하면 줌마다 칸 하나씩만 갱신하므로 전체를 다시 만들 필요가 없다.
+    조회 시에는 격자 경계 때문에 갈라진 가까운 칸들을 무게중심 거리 기준으로 다시 합친다.
+    """
+    DEFAULT_CELL_PX = 64  # 클러스터 반경에 해당하는 화면 크기 (px)
+    DEFAULT_MAX_ZOOM = 16  # 이보다 크게 확대하면 클러스터 없이 카페를 하나씩 보여줌
+
+    def __init__(self, cell_px=DEFAULT_CELL_PX, max_zoom=DEFAULT_MAX_ZOOM, version=None):
+        self.cell_px = cell_px
+        self.max_zoom = max_zoom
+        self.version = version  # 계층이 반영하고 있는 카페 버전
+        self._scale = TILE_SIZE_PX / cell_px  # 줌 0에서 한 변의 칸 수
+        # 줌별 {(col, row): [카페 수, x 합, y 합, id 합]} (카페가 하나뿐인 칸은 id 합이 곧 카페 id)
+        self._levels = [{} for _ in range(max_zoom + 1)]
+        self._points = {}  # cafe_id -> (x, y)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell_of(self, x, y, zoom):
+        cells = self._scale * 2 ** zoom
+        return math.floor(x * cells), math.floor(y * cells)
+
+    @classmethod
+    def build(cls, points, version=None, **kwargs):
+        """
+        (cafe_id, latitude, longitude) 목록으로 계층 생성.
+        가장 큰 줌의 칸을 먼저 채우고, 위 단계는 아래 단계 칸 네 개씩을 합쳐 만든다.
+        """
+        index = cls(version=version, **kwargs)
+        leaf = defaultdict(lambda: [0, 0.0, 0.0, 0])
+        for cafe_id, latitude, longitude in points:
+            x, y = mercator(latitude, longitude)
+            index._points[cafe_id] = (x, y)
+            cell = leaf[index._cell_of(x, y, index.max_zoom)]
+            cell[0] += 1
+            cell[1] += x
+            cell[2] += y
+            cell[3] += cafe_id
+        index._levels[index.max_zoom] = dict(leaf)
+
+        for zoom in range(index.max_zoom - 1, -1, -1):
+            parents = defaultdict(lambda: [0, 0.0, 0.0, 0])
+            for (col, row), (count, sum_x, sum_y, sum_id) in index._levels[zoom + 1].items():
+                parent = parents[(col >> 1, row >> 1)]
+                parent[0] += count
+                parent[1] += sum_x
+                parent[2] += sum_y
+                parent[3] += sum_id
+            index._levels[zoom] = dict(parents)
+        return index
+
+    def add(self, cafe_id, latitude, longitude):
+        """
+        카페를 계층에 추가. 이미 있는 카페라면 위치를 갱신.
+        """
+        with self._lock:
+            self.remove(cafe_id)
+            x, y = mercator(latitude, longitude)
+            self._points[cafe_id] = (x, y)
+            for zoom, level in enumerate(self._levels):
+                cell = level.setdefault(self._cell_of(x, y, zoom), [0, 0.0, 0.0, 0])
+                cell[0] += 1
+                cell[1] += x
+                cell[2] += y
+                cell[3] += cafe_id
+
+    def remove(self, cafe_id):
+        """
+        카페를 계층에서 제거. 없는 카페라면 무시.
+        """
+        with self._lock:
+            point = self._points.pop(cafe_id, None)
+            if point is None:
+                return
+            x, y = point
+            for zoom, level in enumerate(self._levels):
+                key = self._cell_of(x, y, zoom)
+                cell = level[key]
+                if cell[0] == 1:
+                    del level[key]
+                    continue
+                cell[0] -= 1
+                cell[1] -= x
+                cell[2] -= y
+                cell[3] -= cafe_id
+
+    def _expansion_zoom(self, zoom, key):
+        """
+        칸의 카페들이 처음으로 둘 이상의 칸으로 나뉘는 줌 (클러스터를 눌렀을 때 확대할 단계).
+        """
+        col, row = key
+        while zoom < self.max_zoom:
+            zoom += 1
+            level = self._levels[zoom]
+            children = [
+                child for child in ((col * 2 + d_col, row * 2 + d_row) for d_col in (0, 1) for d_row in (0, 1))
+                if child in level
+            ]
+            if len(children) != 1:
+                return zoom
+            col, row = children[0]
+        return self.max_zoom + 1
+
+    def clusters(self, min_lat, max_lat, min_lon, max_lon, zoom):
+        """
+        지도 화면(위경도 사각형)과 겹치는 줌 단계의 클러스터.
+        :param zoom: 지도 확대 단계. max_zoom보다 크면 max_zoom 계층을 쓴다
+        :return: [{"count", "latitude", "longitude", "id"(카페 하나), "expansion_zoom"(클러스터)}, ...]
+            (카페 수 내림차순)
+        """
+        requested, zoom = zoom, min(max(int(zoom), 0), self.max_zoom)
+        min_x, min_y = mercator(max_lat, min_lon)  # 북서쪽
+        max_x, max_y = mercator(min_lat, max_lon)  # 남동쪽
+        min_col, min_row = self._cell_of(min_x, min_y, zoom)
+        max_col, max_row = self._cell_of(max_x, max_y, zoom)
+
+        with self._lock:
+            level = self._levels[zoom]
+            if (max_col - min_col + 1) * (max_row - min_row + 1) > len(level):
+                cells = [(key, list(cell)) for key, cell in level.items()
+                         if min_col <= key[0] <= max_col and min_row <= key[1] <= max_row]
+            else:
+                cells = [
+                    ((col, row), list(level[(col, row)]))
+                    for col in range(min_col, max_col + 1) for row in range(min_row, max_row + 1)
+                    if (col, row) in level
+                ]
+            merged = self._merge_nearby(cells, zoom)
+            payloads = [self._to_payload(zoom, keys, cell) for keys, cell in merged]
+        for payload in payloads:
+            if "expansion_zoom" in payload:  # 요청한 줌보다는 항상 크게
+                payload["expansion_zoom"] = max(payload["expansion_zoom"], requested + 1)
+        return payloads
+
+    def _merge_nearby(self, cells, zoom):
+        """
+        무게중심이 칸 크기(화면 cell_px)보다 가까운 칸끼리 합침. 카페가 많은 칸이 주변 칸을 흡수한다.
+        :return: [([원래 칸 키, ...], [카페 수, x 합, y 합, id 합]), ...]
+        """
+        radius = 1 / (self._scale * 2 ** zoom)
+        cells.sort(key=lambda item: (-item[1][0], item[0]))
+        centers = {key: (cell[1] / cell[0], cell[2] / cell[0]) for key, cell in cells}
+        by_key = dict(cells)
+
+        absorbed = set()
+        merged = []
+        for key, cell in cells:
+            if key in absorbed:
+                continue
+            absorbed.add(key)
+            keys = [key]
+            total = list(cell)
+            center_x, center_y = centers[key]
+            col, row = key
+            for d_col in (-1, 0, 1):
+                for d_row in (-1, 0, 1):
+                    neighbor = (col + d_col, row + d_row)
+                    if neighbor in absorbed or neighbor not in by_key:
+                        continue
+                    x, y = centers[neighbor]
+                    if math.hypot(x - center_x, y - center_y) < radius:
+                        absorbed.add(neighbor)
+                        keys.append(neighbor)
+                        total = [a + b for a, b in zip(total, by_key[neighbor])]
+            merged.append((keys, total))
+        merged.sort(key=lambda item: (-item[1][0], item[0][0]))
+        return merged
+
+    def _to_payload(self, zoom, keys, cell):
+        count, sum_x, sum_y, sum_id = cell
+        latitude, longitude = inverse_mercator(sum_x / count, sum_y / count)
+        payload = {"count": count, "latitude": round(latitude, 7), "longitude": round(longitude, 7)}
+        if count == 1:
+            payload["id"] = sum_id
+        elif len(keys) > 1:  # 합친 클러스터는 다음 줌에서 다시 나뉨
+            payload["expansion_zoom"] = zoom + 1
+        else:
+            payload["expansion_zoom"] = self._expansion_zoom(zoom, keys[0])
+        return payload
+
+
+_clusters = None
+_clusters_lock = threading.Lock()
+
+
+def build_cafe_clusters(snapshot=None):
+    """
+    카페 스냅샷으로 클러스터 계층을 생성.
+    """
+    if snapshot is None:
+        snapshot = get_cafe_snapshot()
+    return CafeClusterIndex.build(
+        zip(snapshot.ids, snapshot.latitudes, snapshot.longitudes),
+        version=snapshot.version,
+        cell_px=getattr(settings, "CAFE_CLUSTER_RADIUS_PX", CafeClusterIndex.DEFAULT_CELL_PX),
+        max_zoom=getattr(settings, "CAFE_CLUSTER_MAX_ZOOM", CafeClusterIndex.DEFAULT_MAX_ZOOM),
+    )
+
+
+def get_cafe_clusters():
+    """
+    프로세스 전역 클러스터 계층을 반환.
+    처음 호출될 때, 또는 기반 스냅샷의 버전이 바뀌었을 때(일괄 가져오기, 다른 프로세스의 변경) 다시 생성.
+    카페 한 곳의 저장/삭제는 시그널에서 add/remove로 바로 반영한다.
+    """
+    global _clusters
+    snapshot = get_cafe_snapshot()
+    clusters = _clusters
+    if clusters is None or clusters.version != snapshot.version:
+        with _clusters_lock:
+            if _clusters is None or _clusters.version != snapshot.version:
+                _clusters = build_cafe_clusters(snapshot)
+            clusters = _clusters
+    return clusters
+
+
+def peek_cafe_clusters():
+    """
+    이미 생성된 클러스터 계층만 반환 (없으면 None). 시그널에서 불필요한 생성을 막기 위해 사용.
+    """
+    return _clusters
+
+
+def reset_cafe_clusters():
+    """
+    클러스터 계층을 버림. 다음 조회 때 다시 생성.
+    """
+    global _clusters
+    with _clusters_lock:
+        _clusters = None
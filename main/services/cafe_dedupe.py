@@ -0,0 +1,160 @@
+import math
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import Count
+
+from .cafe_changes import log_cafe_changes
+from .cafe_version import bump_cafe_version
+from .district_rankings import schedule_district_refresh
+from .geo import EARTH_RADIUS_KM, haversine_km
+from .korean_text import normalize_text
+from .ratings import recompute_rating_aggregates
+
+DEFAULT_RADIUS_M = 30.0  # 같은 카페로 볼 최대 거리 (m)
+DEFAULT_SIMILARITY = 0.8  # 같은 카페로 볼 최소 이름 유사도 (0~1)
+
+
+def name_similarity(a, b):
+    """
+    정규화된 두 이름의 유사도 (0~1). 한쪽이 다른 쪽을 포함하면("스타벅스" / "스타벅스합정점") 1.
+    """
+    if not a or not b:
+        return 0.0
+    if a in b or b in a:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def find_duplicate_pairs(cafes, radius_m=DEFAULT_RADIUS_M, min_similarity=DEFAULT_SIMILARITY):
+    """
+    반경 radius_m 이내에 있고 이름이 비슷한 카페 쌍을 찾는다.
+    한 칸이 반경 이상인 격자에 카페를 나눠 담고 주변 3x3 칸의 카페끼리만 비교하므로 전체 쌍을 비교하지 않는다.
+    :param cafes: [(id, name, latitude, longitude), ...]
+    :return: [(id_a, id_b, 거리(m), 유사도), ...]  (id_a < id_b)
+    """
+    cell_lat = math.degrees(radius_m / 1000 / EARTH_RADIUS_KM)
+    grid = defaultdict(list)
+    entries = []
+    for cafe_id, name, latitude, longitude in cafes:
+        # 경도 칸 크기는 해당 위도 띠 기준으로 보정 (서울 규모에서는 띠 안의 차이가 무시할 만큼 작다)
+        cell_lon = cell_lat / max(math.cos(math.radians(latitude)), 1e-6)
+        cell = (math.floor(latitude / cell_lat), math.floor(longitude / cell_lon))
+        entry = (cafe_id, normalize_text(name), latitude, longitude, cell)
+        grid[cell].append(entry)
+        entries.append(entry)
+
+    pairs = []
+    for cafe_id, name, latitude, longitude, (row, col) in entries:
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                for other_id, other_name, other_lat, other_lon, _ in grid.get((row + d_row, col + d_col), ()):
+                    if other_id <= cafe_id:
+                        continue
+                    distance_m = haversine_km(latitude, longitude, other_lat, other_lon) * 1000
+                    if distance_m > radius_m:
+                        continue
+                    similarity = name_similarity(name, other_name)
+                    if similarity >= min_similarity:
+                        pairs.append((cafe_id, other_id, distance_m, similarity))
+    pairs.sort()
+    return pairs
+
+
+def group_duplicates(pairs):
+    """
+    중복 쌍을 연결 요소(union-find)로 묶음.
+    :return: [[cafe_id, ...], ...]  (각 그룹은 2개 이상, id 오름차순)
+    """
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b, *_ in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups = defaultdict(list)
+    for cafe_id in parent:
+        groups[find(cafe_id)].append(cafe_id)
+    return [sorted(group) for group in groups.values()]
+
+
+def find_duplicate_groups(radius_m=DEFAULT_RADIUS_M, min_similarity=DEFAULT_SIMILARITY):
+    """
+    활성 카페 중 중복으로 보이는 그룹과 각 그룹의 남길 카페(별점+리뷰가 가장 많고, 같으면 가장 먼저 등록된 카페)를 찾는다.
+    :return: ([(남길 카페 id, [합칠 카페 id, ...]), ...], 중복 쌍 목록)
+    """
+    from ..models.cafe import Cafe
+
+    cafes = Cafe.objects.filter(is_active=True).values_list("id", "name", "latitude", "longitude")
+    pairs = find_duplicate_pairs(cafes.iterator(chunk_size=2000), radius_m, min_similarity)
+    groups = group_duplicates(pairs)
+
+    ids = [cafe_id for group in groups for cafe_id in group]
+    activity = {
+        cafe_id: rating_count + review_count
+        for cafe_id, rating_count, review_count in Cafe.objects.filter(id__in=ids)
+        .annotate(review_count=Count("reviews")).values_list("id", "rating_count", "review_count")
+    }
+    merges = []
+    for group in groups:
+        survivor = min(group, key=lambda cafe_id: (-activity.get(cafe_id, 0), cafe_id))
+        merges.append((survivor, [cafe_id for cafe_id in group if cafe_id != survivor]))
+    return merges, pairs
+
+
+def merge_cafes(merges):
+    """
+    중복 카페를 남길 카페로 합침 (한 트랜잭션).
+    - 별점: 한 사용자가 그룹 안 여러 카페에 남긴 별점은 남길 카페의 별점(없으면 가장 최근 별점) 하나만 옮김
+    - 리뷰: 모두 남길 카페로 옮김
+    - 합친 카페는 merged_into를 기록하고 삭제 표시 (외부 키가 남아 있어 다시 가져와도 되살아나지 않음)
+    :param merges: [(남길 카페 id, [합칠 카페 id, ...]), ...]
+    :return: 합친 카페 수
+    """
+    from ..models.cafe import Cafe
+    from ..models.rating import Rating
+    from ..models.review import Review
+
+    merges = [(survivor, duplicates) for survivor, duplicates in merges if duplicates]
+    if not merges:
+        return 0
+    target = {cafe_id: survivor for survivor, duplicates in merges for cafe_id in duplicates}
+    affected = [*target, *(survivor for survivor, _ in merges)]
+
+    with transaction.atomic():
+        # 사용자별로 남길 별점 하나 고르기
+        keep = {}
+        for rating_id, user_id, cafe_id, created_at in (
+                Rating.objects.select_for_update().filter(cafe_id__in=affected)
+                .values_list("id", "user_id", "cafe_id", "created_at")):
+            survivor = target.get(cafe_id, cafe_id)
+            rank = (cafe_id == survivor, created_at, rating_id)
+            current = keep.get((survivor, user_id))
+            if current is None or rank > current[0]:
+                keep[(survivor, user_id)] = (rank, rating_id, cafe_id)
+        kept_ids = {rating_id for _, rating_id, _ in keep.values()}
+        Rating.objects.filter(cafe_id__in=list(target)).exclude(id__in=kept_ids).delete()
+        for survivor, duplicates in merges:
+            Rating.objects.filter(cafe_id__in=duplicates).update(cafe_id=survivor)
+            Review.objects.filter(cafe_id__in=duplicates).update(cafe_id=survivor)
+            Cafe.objects.filter(id__in=duplicates).update(is_active=False, merged_into_id=survivor)
+
+        recompute_rating_aggregates(affected)
+        log_cafe_changes([
+            (cafe_id, external_id, "deleted", "")
+            for cafe_id, external_id in Cafe.objects.filter(id__in=list(target)).values_list("id", "external_id")
+        ])
+        districts = set(Cafe.objects.filter(id__in=affected).values_list("district_code", flat=True))
+        # 일괄 update는 시그널을 보내지 않으므로 인덱스/캐시 버전과 자치구 순위를 직접 갱신
+        transaction.on_commit(bump_cafe_version)
+        schedule_district_refresh(districts)
+    return len(target)
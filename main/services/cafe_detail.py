@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Count
+
+from ..serializers.cafe import CafeDetailSerializer
+from .cafe_response_cache import seconds_until_status_change
+from .cafe_version import get_cafe_version
+
+DEFAULT_CACHE_SIZE = 2048  # 프로세스마다 보관하는 상세 정보 수
+DEFAULT_CACHE_TIMEOUT = 60  # 상세 정보 최대 유지 시간 (초). 다른 프로세스의 별점/리뷰 변경이 늦게 보이는 한도
+
+
+class _LruCache:
+    """
+    프로세스 내 LRU 캐시. 값마다 만료 시각(time.monotonic)과 카페 버전을 함께 둔다.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()  # key -> (만료 시각, 카페 버전, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, entry_version, value = entry
+            if entry_version != version or expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, version, timeout):
+        max_size = getattr(settings, "CAFE_DETAIL_CACHE_SIZE", DEFAULT_CACHE_SIZE)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_details = _LruCache()  # cafe_id -> 직렬화된 상세 정보
+_slugs = _LruCache()  # slug -> cafe_id
+_invalidations = 0  # 무효화 횟수. 조회 중에 무효화가 있었으면 읽은 값을 캐시하지 않음
+
+
+def _resolve_slug(slug, version):
+    from ..models.cafe import Cafe
+
+    cafe_id = _slugs.get(slug, version)
+    if cafe_id is None:
+        cafe_id = Cafe.objects.filter(slug=slug, is_active=True).values_list("id", flat=True).first()
+        if cafe_id is not None:
+            _slugs.set(slug, cafe_id, version, getattr(settings, "CAFE_DETAIL_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT))
+    return cafe_id
+
+
+def cafe_detail_payload(cafe_id=None, slug=None):
+    """
+    카페 상세 정보(CafeDetailSerializer)를 프로세스 내 캐시에서 읽고, 없으면 DB에서 읽어 캐시 (read-through).
+    - 카페/별점/리뷰가 바뀌면 시그널이 해당 카페를 무효화하고, 카페 버전이 바뀌면(일괄 가져오기 등) 모두 무효
+    - is_open이 들어 있으므로 그 카페의 영업 상태가 바뀌는 시각에 만료
+    - 다른 프로세스의 변경은 settings.CAFE_DETAIL_CACHE_TIMEOUT 안에 반영
+    :return: 상세 정보 dict, 없거나 삭제 표시된 카페면 None
+    """
+    from ..models.cafe import Cafe
+
+    version = get_cafe_version()
+    if slug is not None:
+        cafe_id = _resolve_slug(slug, version)
+        if cafe_id is None:
+            return None
+
+    payload = _details.get(cafe_id, version)
+    if payload is not None:
+        return payload
+
+    invalidations = _invalidations
+    cafe = Cafe.objects.filter(id=cafe_id, is_active=True).annotate(review_count=Count("reviews")).first()
+    if cafe is None:
+        return None
+    payload = dict(CafeDetailSerializer(cafe).data)
+    if invalidations == _invalidations:
+        hours = None if cafe.opening_minute is None else (cafe.opening_minute, cafe.closing_minute)
+        timeout = seconds_until_status_change(
+            [hours], getattr(settings, "CAFE_DETAIL_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT))
+        _details.set(cafe_id, payload, version, timeout)
+    return payload
+
+
+def invalidate_cafe_detail(cafe_id):
+    """
+    카페 하나의 캐시된 상세 정보를 버림 (이 프로세스).
+    """
+    global _invalidations
+    _invalidations += 1
+    _details.pop(cafe_id)
+
+
+def reset_cafe_detail_cache():
+    """
+    캐시된 상세 정보를 모두 버림.
+    """
+    global _invalidations
+    _invalidations += 1
+    _details.clear()
+    _slugs.clear()
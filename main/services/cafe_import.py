@@ -0,0 +1,260 @@
+import hashlib
+import json
+from itertools import islice
+
+from django.db import transaction
+
+from .cafe_changes import CONTENT_FIELDS, cafe_content_hash, log_cafe_changes
+from .cafe_version import bump_cafe_version
+from .district_rankings import schedule_district_refresh
+from .slugs import cafe_slug
+
+DEFAULT_BATCH_SIZE = 1000  # 트랜잭션 하나에서 처리하는 카페 수
+READ_CHUNK_SIZE = 1 << 16  # JSON 배열을 읽을 때 한 번에 읽는 문자 수
+
+# 원본 데이터에서 가져오는 필드와 저장 시 계산되는 필드 (bulk_create는 save()를 거치지 않으므로 직접 계산)
+IMPORT_FIELDS = CONTENT_FIELDS
+DERIVED_FIELDS = ("opening_minute", "closing_minute", "district_code", "content_hash", "is_active")
+
+
+def derive_external_id(name, address):
+    """
+    외부 ID가 없는 데이터용 안정 키. 같은 이름의 체인점도 주소로 구분된다.
+    """
+    key = "\n".join(" ".join((value or "").split()) for value in (name, address))
+    return "na:" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def iter_json_array(file, chunk_size=READ_CHUNK_SIZE):
+    """
+    최상위 JSON 배열의 원소를 파일 전체를 메모리에 올리지 않고 하나씩 읽음.
+    :raises ValueError: 배열이 아니거나 형식이 잘못된 경우
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+
+    def fill():
+        nonlocal buffer, pos
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        separators = " \t\r\n," if started else " \t\r\n"
+        while True:
+            while pos < len(buffer) and buffer[pos] in separators:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                break
+        if pos >= len(buffer):
+            raise ValueError("JSON 배열이 끝나지 않았습니다.")
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("최상위 값이 JSON 배열이 아닙니다.")
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+
+        while True:
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+                break
+            except json.JSONDecodeError:
+                # 원소가 읽은 범위 끝에서 잘렸다면 더 읽고 다시 시도
+                if not fill():
+                    raise
+        yield item
+
+
+def iter_ndjson(file):
+    """
+    한 줄에 JSON 객체 하나인 NDJSON(JSON Lines)을 한 줄씩 읽음.
+    """
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_cafe_records(path, file_format="auto"):
+    """
+    파일의 카페 레코드를 스트리밍으로 읽음.
+    :param file_format: "json"(배열), "ndjson", "auto"(확장자가 .ndjson/.jsonl이면 NDJSON)
+    """
+    if file_format == "auto":
+        file_format = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "json"
+    with open(path, "r", encoding="utf-8-sig") as file:
+        if file_format == "ndjson":
+            yield from iter_ndjson(file)
+        else:
+            yield from iter_json_array(file)
+
+
+def _clean_text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def cafe_from_record(record):
+    """
+    레코드 하나를 저장 전 Cafe 객체로 변환. 필수 값(name, latitude, longitude)이 없거나 잘못되면 None.
+    외부 키는 external_id(또는 id) 값, 없으면 이름 + 주소로 만든다.
+    """
+    from ..models.cafe import Cafe
+
+    if not isinstance(record, dict):
+        return None
+    name = _clean_text(record.get("name"))
+    try:
+        latitude = float(record["latitude"])
+        longitude = float(record["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not name:
+        return None
+
+    address = _clean_text(record.get("address"))
+    external_id = _clean_text(record.get("external_id", record.get("id"))) or derive_external_id(name, address)
+    return Cafe(
+        external_id=external_id,
+        slug=cafe_slug(name, external_id),  # 새로 추가될 때만 저장 (기존 카페의 slug는 유지)
+        name=name,
+        address=address,
+        isConcentrate=bool(record.get("isConcentrate", False)),
+        opening_hours=_clean_text(record.get("opening_hours")),
+        latitude=latitude,
+        longitude=longitude,
+    )
+
+
+def import_cafes(records, batch_size=DEFAULT_BATCH_SIZE, sync=False):
+    """
+    카페 레코드를 외부 키 기준으로 upsert.
+    batch_size개씩 한 트랜잭션에서 기존 행의 내용 해시를 한 번에 조회해 비교하고, 새로 생기거나 내용이 바뀐 행만
+    bulk_create(update_conflicts=True) 한 번으로 저장한 뒤 CafeChange 기록을 남긴다. 같은 파일을 다시 넣으면 아무것도 쓰지 않는다.
+    save()와 시그널을 거치지 않으므로 영업 시간/자치구 계산, 카페 버전 증가, 자치구 순위 갱신을 직접 한다.
+    :param sync: True면 레코드를 전체 데이터로 보고, 외부 키가 있는 카페 중 레코드에 없는 카페를 삭제 표시(is_active=False)
+    :return: {"inserted": n, "updated": n, "unchanged": n, "deleted": n, "skipped": n}
+    """
+    from ..models.cafe import Cafe
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0, "skipped": 0}
+    districts = set()
+    seen = set()
+    records = iter(records)
+
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+
+        cafes = {}
+        for record in batch:
+            cafe = cafe_from_record(record)
+            if cafe is None:
+                counts["skipped"] += 1
+                continue
+            if cafe.external_id in cafes:
+                counts["skipped"] += 1  # 같은 배치 안의 중복 키는 마지막 레코드만 반영
+            cafes[cafe.external_id] = cafe
+        seen.update(cafes)
+
+        with transaction.atomic():
+            existing = {
+                external_id: (cafe_id, district_code, stored_hash, is_active, merged_into_id)
+                for external_id, cafe_id, district_code, stored_hash, is_active, merged_into_id
+                in Cafe.objects.filter(external_id__in=list(cafes))
+                .values_list("external_id", "id", "district_code", "content_hash", "is_active", "merged_into_id")
+            }
+            changed = []
+            for external_id, cafe in cafes.items():
+                cafe.content_hash = cafe_content_hash(cafe)
+                stored = existing.get(external_id)
+                if stored is not None and stored[4] is not None:
+                    counts["skipped"] += 1  # 중복 정리로 다른 카페에 합쳐진 카페는 되살리지 않음
+                    continue
+                if stored is not None and stored[2] == cafe.content_hash and stored[3]:
+                    counts["unchanged"] += 1
+                    continue
+                cafe.compile_opening_hours()
+                cafe.assign_district()
+                changed.append(cafe)
+                districts.add(cafe.district_code)
+                if stored is None:
+                    counts["inserted"] += 1
+                else:
+                    counts["updated"] += 1
+                    districts.add(stored[1])  # 주소가 바뀌어 빠져나온 자치구
+            if changed:
+                Cafe.objects.bulk_create(
+                    changed,
+                    update_conflicts=True,
+                    unique_fields=["external_id"],
+                    update_fields=[*IMPORT_FIELDS, *DERIVED_FIELDS],
+                )
+                _fill_missing_ids(changed, existing)
+                log_cafe_changes([
+                    (cafe.pk, cafe.external_id, "created" if cafe.external_id not in existing else "updated",
+                     cafe.content_hash)
+                    for cafe in changed
+                ])
+
+    if sync:
+        counts["deleted"] = _tombstone_missing(seen, districts, batch_size)
+
+    if counts["inserted"] or counts["updated"] or counts["deleted"]:
+        # 인덱스/스냅샷/응답 캐시가 새 데이터를 보도록 버전을 올림 (커밋 후)
+        transaction.on_commit(bump_cafe_version)
+        schedule_district_refresh(districts)
+    return counts
+
+
+def _fill_missing_ids(cafes, existing):
+    """
+    bulk_create가 행의 id를 돌려주지 않는 DB라면 기존 행은 조회해 둔 id로, 새 행은 외부 키로 한 번에 조회해서 채움.
+    """
+    from ..models.cafe import Cafe
+
+    missing = {}
+    for cafe in cafes:
+        if cafe.pk is None:
+            if cafe.external_id in existing:
+                cafe.pk = existing[cafe.external_id][0]
+            else:
+                missing[cafe.external_id] = cafe
+    if missing:
+        for external_id, cafe_id in Cafe.objects.filter(external_id__in=list(missing)).values_list("external_id", "id"):
+            missing[external_id].pk = cafe_id
+
+
+def _tombstone_missing(seen, districts, batch_size):
+    """
+    외부 키가 있는 활성 카페 중 이번 데이터에 없는 카페를 삭제 표시하고 삭제 기록을 남김.
+    :return: 삭제 표시한 카페 수
+    """
+    from ..models.cafe import Cafe
+
+    missing = [
+        (cafe_id, external_id, district_code)
+        for cafe_id, external_id, district_code
+        in Cafe.objects.filter(is_active=True, external_id__isnull=False)
+        .values_list("id", "external_id", "district_code").iterator(chunk_size=batch_size)
+        if external_id not in seen
+    ]
+    for start in range(0, len(missing), batch_size):
+        chunk = missing[start:start + batch_size]
+        with transaction.atomic():
+            Cafe.objects.filter(id__in=[cafe_id for cafe_id, _, _ in chunk]).update(is_active=False)
+            log_cafe_changes([(cafe_id, external_id, "deleted", "") for cafe_id, external_id, _ in chunk])
+    districts.update(district_code for _, _, district_code in missing)
+    return len(missing)
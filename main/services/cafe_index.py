@@ -0,0 +1,246 @@
+import heapq
+import logging
+import math
+import threading
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .cafe_snapshot import get_cafe_snapshot
+from .geo import bounding_box, haversine_km
+from .opening_hours import is_open_during
+
+logger = logging.getLogger(__name__)
+
+class CafeGridIndex:
+    """
+    카페 좌표를 균일한 위경도 격자에 담아두는 프로세스 내 공간 인덱스.
+    반경 검색 시 반경을 덮는 격자 칸의 카페만 거리 계산하므로 전체 테이블을 훑지 않는다.
+    """
+    DEFAULT_CELL_DEG = 0.01  # 격자 한 칸 크기 (위도 약 1.1km, 서울 기준 경도 약 0.9km)
+    BOUND_MARGIN = 0.01  # 칸 거리 하한/상한의 안전 여유 비율
+
+    def __init__(self, cell_deg=DEFAULT_CELL_DEG, version=None):
+        self.cell_deg = cell_deg
+        self.version = version  # 인덱스가 반영하고 있는 카페 버전
+        self._cells = defaultdict(dict)  # (row, col) -> {cafe_id: (latitude, longitude, 영업 슬롯 마스크)}
+        self._locations = {}  # cafe_id -> (row, col)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._locations)
+
+    def _cell_of(self, latitude, longitude):
+        return math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg)
+
+    def add(self, cafe_id, latitude, longitude, hours_mask=0):
+        """
+        카페를 인덱스에 추가. 이미 있는 카페라면 위치와 영업 시간을 갱신.
+        :param hours_mask: 영업 슬롯 마스크 (opening_hours.slot_mask)
+        """
+        with self._lock:
+            self.remove(cafe_id)
+            cell = self._cell_of(latitude, longitude)
+            self._cells[cell][cafe_id] = (latitude, longitude, hours_mask)
+            self._locations[cafe_id] = cell
+
+    def remove(self, cafe_id):
+        """
+        카페를 인덱스에서 제거. 없는 카페라면 무시.
+        """
+        with self._lock:
+            cell = self._locations.pop(cafe_id, None)
+            if cell is None:
+                return
+            bucket = self._cells[cell]
+            bucket.pop(cafe_id, None)
+            if not bucket:
+                del self._cells[cell]
+
+    def _cell_bounds(self, latitude, longitude, cell):
+        """
+        기준점에서 격자 칸까지의 (최소 거리 하한, 최대 거리 상한)을 km로 계산.
+        위경도 사각형과 대원 거리의 차이(50km 반경에서 1% 미만)만큼 여유를 둔다.
+        """
+        row, col = cell
+        lat0, lon0 = row * self.cell_deg, col * self.cell_deg
+        lat1, lon1 = lat0 + self.cell_deg, lon0 + self.cell_deg
+        near_lat = min(max(latitude, lat0), lat1)
+        near_lon = min(max(longitude, lon0), lon1)
+        far_lat = lat0 if latitude - lat0 > lat1 - latitude else lat1
+        far_lon = lon0 if longitude - lon0 > lon1 - longitude else lon1
+        lower = haversine_km(latitude, longitude, near_lat, near_lon) * (1 - self.BOUND_MARGIN)
+        upper = haversine_km(latitude, longitude, far_lat, far_lon) * (1 + self.BOUND_MARGIN)
+        return lower, upper
+
+    def iter_nearest(self, latitude, longitude, radius_km, after=None, open_mask=None):
+        """
+        반경 안의 카페를 (거리, cafe_id) 순서대로 하나씩 꺼내는 최선 우선(best-first) 탐색.
+        격자 칸은 기준점과의 최소 거리 순으로 열어보므로, 필요한 만큼만 꺼내면 그만큼의 칸만 본다.
+        :param after: (거리, cafe_id). 지정하면 이 값보다 뒤에 오는 카페만 반환 (커서 이어보기).
+            최대 거리가 커서 거리보다 가까운 칸은 거리 계산 없이 건너뛴다.
+        :param open_mask: 영업 구간 마스크 (opening_hours.window_mask). 지정하면 그 구간 내내
+            영업하는 카페만 후보로 삼으므로, 닫힌 카페를 건너뛰며 계속 탐색한다.
+        :return: (거리(km), cafe_id) 제너레이터
+        """
+        CELL, CAFE = 0, 1
+        # 반경을 감싸는 사각형 밖의 칸은 열지 않는다. 극 근처에서는 칸 거리 하한이 경도와 상관없이 작아서
+        # 이 제한이 없으면 경도 방향으로 끝없이 칸을 넓혀 간다.
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        min_row, min_col = self._cell_of(max(min_lat, -90.0), max(min_lon, -180.0))
+        max_row, max_col = self._cell_of(min(max_lat, 90.0), min(max_lon, 180.0))
+        with self._lock:
+            # 사각형의 칸 수가 카페가 있는 칸보다 많으면(아주 넓은 반경, 극 근처) 빈 칸을 하나씩 넓혀 가는 대신
+            # 사각형 안의 카페가 있는 칸만 처음부터 힙에 넣는다
+            sparse = (max_row - min_row + 1) * (max_col - min_col + 1) > len(self._cells)
+            if sparse:
+                cells = [cell for cell in self._cells
+                         if min_row <= cell[0] <= max_row and min_col <= cell[1] <= max_col]
+        if sparse:
+            heap = [(self._cell_bounds(latitude, longitude, cell)[0], CELL, cell) for cell in cells]
+            heapq.heapify(heap)
+        else:
+            start = self._cell_of(latitude, longitude)
+            heap = [(0.0, CELL, start)]
+            seen = {start}
+        after_distance = after[0] if after is not None else None
+
+        while heap:
+            key, kind, item = heapq.heappop(heap)
+            if key > radius_km:
+                return
+            if kind == CAFE:
+                if after is None or (key, item) > after:
+                    yield key, item
+                continue
+
+            with self._lock:
+                bucket = self._cells.get(item)
+                entries = list(bucket.items()) if bucket else ()
+            if entries and (after_distance is None or self._cell_bounds(latitude, longitude, item)[1] >= after_distance):
+                for cafe_id, (lat, lon, hours_mask) in entries:
+                    if not is_open_during(hours_mask, open_mask):
+                        continue
+                    distance = haversine_km(latitude, longitude, lat, lon)
+                    if distance <= radius_km:
+                        heapq.heappush(heap, (distance, CAFE, cafe_id))
+
+            if sparse:
+                continue
+            row, col = item
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    neighbor = (row + d_row, col + d_col)
+                    if neighbor in seen or not (min_row <= neighbor[0] <= max_row and min_col <= neighbor[1] <= max_col):
+                        continue
+                    seen.add(neighbor)
+                    lower = self._cell_bounds(latitude, longitude, neighbor)[0]
+                    if lower <= radius_km:
+                        heapq.heappush(heap, (lower, CELL, neighbor))
+
+    def within_bounds(self, min_lat, max_lat, min_lon, max_lon, open_mask=None):
+        """
+        위경도 사각형(지도 화면) 안의 카페를 반환.
+        사각형이 덮는 격자 칸만 보고, 칸 수가 카페가 있는 칸보다 많으면(아주 넓은 화면) 있는 칸만 훑는다.
+        :param open_mask: 영업 구간 마스크. 지정하면 그 구간 내내 영업하는 카페만 반환
+        :return: [(cafe_id, latitude, longitude), ...]
+        """
+        min_row, min_col = self._cell_of(min_lat, min_lon)
+        max_row, max_col = self._cell_of(max_lat, max_lon)
+        with self._lock:
+            if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self._cells):
+                cells = [cell for cell in self._cells
+                         if min_row <= cell[0] <= max_row and min_col <= cell[1] <= max_col]
+            else:
+                cells = [(row, col) for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1)]
+            buckets = [list(self._cells[cell].items()) for cell in cells if cell in self._cells]
+
+        return [
+            (cafe_id, lat, lon)
+            for bucket in buckets
+            for cafe_id, (lat, lon, hours_mask) in bucket
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon and is_open_during(hours_mask, open_mask)
+        ]
+
+    def nearest(self, latitude, longitude, radius_km, limit, after=None, open_mask=None):
+        """
+        반경 안에서 가장 가까운 카페를 거리순으로 반환.
+        :param latitude: 검색 중심 위도
+        :param longitude: 검색 중심 경도
+        :param radius_km: 검색 반경 (km)
+        :param limit: 최대 결과 개수
+        :param after: (거리, cafe_id) 커서. 지정하면 그 다음 카페부터 반환
+        :param open_mask: 영업 구간 마스크. 지정하면 그 구간 내내 영업하는 카페만 반환
+        :return: [(거리(km), cafe_id), ...]
+        """
+        return list(islice(self.iter_nearest(latitude, longitude, radius_km, after=after, open_mask=open_mask), limit))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def build_cafe_index(snapshot=None):
+    """
+    카페 스냅샷으로 격자 인덱스를 생성.
+    """
+    if snapshot is None:
+        snapshot = get_cafe_snapshot()
+    index = CafeGridIndex(version=snapshot.version)
+    for cafe_id, latitude, longitude, hours_mask in zip(
+            snapshot.ids, snapshot.latitudes, snapshot.longitudes, snapshot.slot_masks()):
+        index.add(cafe_id, latitude, longitude, hours_mask)
+    return index
+
+
+def get_cafe_index():
+    """
+    프로세스 전역 인덱스를 반환.
+    처음 호출될 때, 또는 기반 스냅샷의 버전이 바뀌었을 때(다른 프로세스의 변경, 새 스냅샷 파일 발행) 다시 생성.
+    """
+    global _index
+    snapshot = get_cafe_snapshot()
+    index = _index
+    if index is None or index.version != snapshot.version:
+        with _index_lock:
+            if _index is None or _index.version != snapshot.version:
+                _index = build_cafe_index(snapshot)
+            index = _index
+    return index
+
+
+def warm_cafe_index():
+    """
+    워커 시작 시(wsgi/asgi 애플리케이션 생성 직후) 격자 인덱스를 미리 생성해
+    첫 지도 요청이 인덱스 생성 비용을 치르지 않게 한다.
+    settings.CAFE_INDEX_WARMUP이 꺼져 있거나 검색 방식이 grid가 아니면 아무것도 하지 않는다.
+    DB에 접근할 수 없으면(마이그레이션 전 등) 로그만 남기고 첫 검색 때 생성하도록 둔다.
+    """
+    if not getattr(settings, "CAFE_INDEX_WARMUP", True):
+        return
+    if getattr(settings, "CAFE_SEARCH_BACKEND", "grid") != "grid":
+        return
+    try:
+        index = get_cafe_index()
+    except DatabaseError:
+        logger.exception("카페 격자 인덱스를 미리 만들지 못했습니다. 첫 검색 때 생성합니다.")
+        return
+    logger.info("카페 격자 인덱스 생성 완료: %d개", len(index))
+
+
+def peek_cafe_index():
+    """
+    이미 생성된 인덱스만 반환 (없으면 None). 시그널에서 불필요한 생성을 막기 위해 사용.
+    """
+    return _index
+
+
+def reset_cafe_index():
+    """
+    인덱스를 버림. 다음 검색 때 다시 생성.
+    """
+    global _index
+    with _index_lock:
+        _index = None
@@ -0,0 +1,96 @@
+import heapq
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from .cafe_search import find_nearby_cafes
+
+DEFAULT_WEIGHTS = {
+    "distance": 0.5,  # 거리 감쇠 점수 (0~1)
+    "rating": 0.35,  # 베이지안 평균 별점을 0~1로 환산한 점수
+    "concentrate": 0.15,  # 집중하기 좋은 카페 여부 (0 또는 1)
+}
+DEFAULT_DISTANCE_HALF_LIFE_KM = 1.0  # 이 거리만큼 멀어질 때마다 거리 점수가 절반
+DEFAULT_PRIOR_TIMEOUT = 10 * 60  # 별점 사전 분포 캐시 유지 시간 (초)
+DEFAULT_PRIOR_MEAN = 3.0  # 별점이 하나도 없을 때 쓰는 사전 평균
+MAX_RANK_CANDIDATES = 300  # 점수를 매길 반경 내 후보 카페 수 상한
+
+RATING_PRIOR_KEY = "main:cafe_rating_prior"
+
+
+def compute_rating_prior():
+    """
+    전체 카페의 별점 집계로 베이지안 평균의 사전 분포를 계산.
+    - mean: 전체 별점의 평균
+    - weight: 별점이 있는 카페의 평균 별점 개수 (settings.CAFE_RANKING_PRIOR_WEIGHT로 고정 가능)
+    :return: (mean, weight)
+    """
+    from ..models.cafe import Cafe
+
+    totals = Cafe.objects.aggregate(
+        total_sum=Sum("rating_sum"),
+        total_count=Sum("rating_count"),
+        rated=Count("id", filter=Q(rating_count__gt=0)),
+    )
+    rating_sum = totals["total_sum"] or 0
+    rating_count = totals["total_count"] or 0
+    mean = rating_sum / rating_count if rating_count else DEFAULT_PRIOR_MEAN
+    weight = getattr(settings, "CAFE_RANKING_PRIOR_WEIGHT", None)
+    if weight is None:
+        weight = rating_count / totals["rated"] if totals["rated"] else 1.0
+    return mean, max(float(weight), 1.0)
+
+
+def get_rating_prior():
+    """
+    캐시에 미리 계산해 둔 사전 분포를 반환 (없거나 만료되면 다시 계산).
+    """
+    prior = cache.get(RATING_PRIOR_KEY)
+    if prior is None:
+        prior = compute_rating_prior()
+        cache.set(RATING_PRIOR_KEY, prior,
+                  timeout=getattr(settings, "CAFE_RANKING_PRIOR_TIMEOUT", DEFAULT_PRIOR_TIMEOUT))
+    return prior
+
+
+def bayesian_rating(rating_sum, rating_count, prior):
+    """
+    사전 평균 쪽으로 당긴 평균 별점. 별점 개수가 적을수록 사전 평균에 가깝다.
+    """
+    mean, weight = prior
+    return (weight * mean + rating_sum) / (weight + rating_count)
+
+
+def rank_cafes(cafes, limit, prior=None):
+    """
+    거리 감쇠, 베이지안 평균 별점, 집중하기 좋은 카페 여부를 가중합한 점수 순으로 상위 limit개를 반환.
+    후보 카페는 이미 distance 속성과 별점 집계 필드를 갖고 있으므로 한 번 훑으며 점수만 계산한다.
+    가중치는 settings.CAFE_RANKING_WEIGHTS, 거리 반감 거리는 settings.CAFE_RANKING_DISTANCE_HALF_LIFE_KM.
+    :param cafes: distance(km) 속성이 붙은 Cafe 목록 (find_nearby_cafes 결과)
+    :return: score 속성이 붙은 Cafe 리스트 (점수 내림차순, 같으면 가까운 순)
+    """
+    if prior is None:
+        prior = get_rating_prior()
+    weights = {**DEFAULT_WEIGHTS, **getattr(settings, "CAFE_RANKING_WEIGHTS", {})}
+    half_life = getattr(settings, "CAFE_RANKING_DISTANCE_HALF_LIFE_KM", DEFAULT_DISTANCE_HALF_LIFE_KM)
+    w_distance, w_rating, w_concentrate = weights["distance"], weights["rating"], weights["concentrate"]
+
+    for cafe in cafes:
+        rating = bayesian_rating(cafe.rating_sum, cafe.rating_count, prior)
+        cafe.score = (
+            w_distance * 0.5 ** (cafe.distance / half_life) +
+            w_rating * (rating - 1) / 4 +
+            w_concentrate * (1.0 if cafe.isConcentrate else 0.0)
+        )
+    return heapq.nsmallest(limit, cafes, key=lambda cafe: (-cafe.score, cafe.distance, cafe.id))
+
+
+def find_ranked_cafes(latitude, longitude, radius_km, limit, open_mask=None):
+    """
+    반경 이내 후보 카페(가까운 순 최대 MAX_RANK_CANDIDATES개)를 한 번의 쿼리로 불러와 점수 순으로 반환.
+    :return: distance(km), score 속성이 붙은 Cafe 리스트
+    """
+    candidates = find_nearby_cafes(latitude, longitude, radius_km=radius_km,
+                                   limit=MAX_RANK_CANDIDATES, open_mask=open_mask)
+    return rank_cafes(candidates, limit)
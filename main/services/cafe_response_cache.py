@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import localtime, now
+
+from ..serializers.cafe import CafeSerializer
+from .cafe_search import find_nearby_cafes
+from .cafe_version import get_cafe_version
+from .geo import geohash_bounds, haversine_km
+from .opening_hours import MINUTES_PER_DAY, is_open_during, slot_mask
+
+DEFAULT_GEOHASH_PRECISION = 6  # 서울 기준 약 0.6km x 1km 칸
+DEFAULT_MAX_TIMEOUT = 15 * 60  # 캐시 최대 유지 시간 (초)
+MAX_CANDIDATES = 200  # 칸 하나에 저장하는 후보 카페 수 상한
+
+
+def nearby_cafe_payloads(latitude, longitude, radius_km, limit, open_mask=None):
+    """
+    반경 이내 가까운 카페 limit개의 직렬화 결과를 반환 (find_nearby_cafes + CafeSerializer와 동일).
+    좌표를 geohash 칸으로 묶어, 칸 안의 어느 지점에서 검색해도 답이 들어 있는 후보 목록을
+    직렬화된 채로 캐시에 두고, 실제 좌표에 대한 거리 계산, 영업 필터와 정렬은 그 작은 후보 목록에서만 한다.
+    캐시 키에는 카페 버전이 들어가므로 카페가 바뀌면 자동으로 무효화되고,
+    후보 카페 중 가장 먼저 오는 개점/폐점 시각에 만료되어 is_open 값이 어긋나지 않는다.
+    영업 필터(open_mask)는 현재 시각에서 만들어지므로 키에 넣지 않고, 필터가 있으면 상위 k개로 줄이지 않은
+    반경 내 후보 전체를 캐시해 조회 뒤에 거른다.
+    """
+    if not getattr(settings, "CAFE_RESPONSE_CACHE_ENABLED", True):
+        cafes = find_nearby_cafes(latitude, longitude, radius_km=radius_km, limit=limit, open_mask=open_mask)
+        return CafeSerializer(cafes, many=True).data
+
+    precision = getattr(settings, "CAFE_RESPONSE_CACHE_GEOHASH_PRECISION", DEFAULT_GEOHASH_PRECISION)
+    cell, bounds = geohash_bounds(latitude, longitude, precision)
+    key = "main:nearby:{version}:{cell}:{radius}:{limit}".format(
+        version=get_cafe_version(), cell=cell, radius=radius_km,
+        limit="open" if open_mask is not None else limit,  # 영업 필터용 후보는 limit과 무관
+    )
+
+    candidates = cache.get(key)
+    if candidates is None:
+        candidates = _cell_candidates(bounds, radius_km, None if open_mask is not None else limit)
+        if candidates is None:
+            # 후보가 너무 많은 밀집 지역은 캐시하지 않고 바로 검색
+            cafes = find_nearby_cafes(latitude, longitude, radius_km=radius_km, limit=limit, open_mask=open_mask)
+            return CafeSerializer(cafes, many=True).data
+        cache.set(key, candidates, timeout=_seconds_until_next_boundary(candidates))
+
+    hits = []
+    for cafe_id, cafe_lat, cafe_lon, hours, payload in candidates:
+        if open_mask is not None and (hours is None or not is_open_during(slot_mask(*hours), open_mask)):
+            continue
+        distance = haversine_km(latitude, longitude, cafe_lat, cafe_lon)
+        if distance <= radius_km:
+            hits.append((distance, cafe_id, payload))
+    # 캐시를 쓰지 않는 검색과 같은 순서가 되도록 거리가 같으면 id 순
+    hits.sort(key=lambda hit: (hit[0], hit[1]))
+    return [payload for _, _, payload in hits[:limit]]
+
+
+def _cell_candidates(bounds, radius_km, limit):
+    """
+    칸 안의 모든 지점에 대해 상위 limit개가 반드시 포함되는 후보 목록을 계산.
+    칸 중심 c에서 칸 끝까지 거리를 h라 하면, 칸 안의 점 p의 답은 c에서 min(반경 + h, d_k + 2h)
+    안에 있다 (d_k는 c에서 k번째로 가까운 카페까지의 거리).
+    limit이 None이면(영업 필터용) d_k로 줄이지 않고 c에서 반경 + h 안의 카페 전체를 후보로 삼는다.
+    :return: [(id, 위도, 경도, (여는 분, 닫는 분) 또는 None, 직렬화 결과), ...], 후보가 너무 많으면 None
+    """
+    min_lat, max_lat, min_lon, max_lon = bounds
+    center_lat = (min_lat + max_lat) / 2
+    center_lon = (min_lon + max_lon) / 2
+    half_diagonal = haversine_km(center_lat, center_lon, max_lat, max_lon)
+    reach = radius_km + half_diagonal
+
+    if limit is None:
+        cafes = find_nearby_cafes(center_lat, center_lon, reach, MAX_CANDIDATES + 1)
+    else:
+        nearest = find_nearby_cafes(center_lat, center_lon, reach, limit)
+        if len(nearest) == limit:
+            reach = min(reach, nearest[-1].distance + 2 * half_diagonal)
+
+        cafes = list(nearest)
+        if nearest:
+            # k번째 카페 다음부터 이어서 reach 안의 나머지 후보를 가져옴
+            last = nearest[-1]
+            cafes += find_nearby_cafes(center_lat, center_lon, reach, MAX_CANDIDATES + 1,
+                                       after=(last.distance, last.id))
+        cafes = [cafe for cafe in cafes if cafe.distance <= reach]
+    if len(cafes) > MAX_CANDIDATES:
+        return None
+
+    payloads = [dict(payload) for payload in CafeSerializer(cafes, many=True).data]
+    return [
+        (
+            cafe.id,
+            cafe.latitude,
+            cafe.longitude,
+            None if cafe.opening_minute is None else (cafe.opening_minute, cafe.closing_minute),
+            payload,
+        )
+        for cafe, payload in zip(cafes, payloads)
+    ]
+
+
+def _seconds_until_next_boundary(candidates):
+    """
+    후보 카페들 중 가장 먼저 영업 상태가 바뀌는 시각까지 남은 초 (최대 유지 시간 이내).
+    """
+    return seconds_until_status_change(
+        (hours for _, _, _, hours, _ in candidates),
+        getattr(settings, "CAFE_RESPONSE_CACHE_TIMEOUT", DEFAULT_MAX_TIMEOUT),
+    )
+
+
+def seconds_until_status_change(hours_list, max_timeout):
+    """
+    카페들 중 가장 먼저 영업 상태(is_open)가 바뀌는 시각까지 남은 초 (max_timeout 이내).
+    직렬화된 is_open 값을 캐시할 때 유지 시간으로 사용.
+    :param hours_list: [(여는 분, 닫는 분) 또는 None, ...]
+    """
+    current = localtime(now())
+    minute = current.hour * 60 + current.minute
+    until_next = MINUTES_PER_DAY
+    for hours in hours_list:
+        if hours is None:
+            continue
+        for boundary in hours:
+            delta = (boundary - minute) % MINUTES_PER_DAY
+            if delta:
+                until_next = min(until_next, delta)
+    seconds = until_next * 60 - current.second
+    return max(1, min(seconds, max_timeout))
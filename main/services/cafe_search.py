@@ -0,0 +1,157 @@
+import base64
+import json
+import logging
+from itertools import islice
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import F, FloatField, ExpressionWrapper, Q, Value
+from django.db.models.functions import ACos, Cos, Least, Radians, Sin
+
+from ..models.cafe import Cafe
+from .cafe_index import get_cafe_index
+from .cafe_snapshot import get_cafe_snapshot
+from .geo import EARTH_RADIUS_KM, bounding_box
+from .opening_hours import is_open_during, slot_mask
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(distance, cafe_id):
+    """
+    마지막으로 받은 카페의 (거리, id)를 불투명한 커서 문자열로 인코딩.
+    """
+    payload = json.dumps({"d": distance, "id": cafe_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    encode_cursor의 역변환.
+    :return: (거리, cafe_id)
+    :raises ValueError: 잘못된 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(payload["d"]), int(payload["id"])
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError("잘못된 커서입니다.") from e
+
+
+def _memory_search():
+    """
+    settings.CAFE_SEARCH_BACKEND에 맞는 메모리 검색 함수(nearest)를 반환.
+    - "grid": 프로세스 내 격자 인덱스 (기본값)
+    - "snapshot": 열 단위 스냅샷의 위도 띠에 대한 일괄 거리 계산
+    - "orm": None (DB 거리 계산)
+    메모리 구조를 만들 수 없으면 None을 반환해 ORM 검색으로 대체하게 한다.
+    """
+    backend = getattr(settings, "CAFE_SEARCH_BACKEND", "grid")
+    if backend not in ("grid", "snapshot"):
+        return None
+    try:
+        if backend == "grid":
+            return get_cafe_index().nearest
+        return get_cafe_snapshot().nearest
+    except DatabaseError:
+        logger.exception("카페 메모리 인덱스 생성 실패, ORM 검색으로 대체합니다.")
+        return None
+
+
+def find_nearby_cafes(latitude, longitude, radius_km, limit, after=None, open_mask=None):
+    """
+    좌표에서 반경 radius_km 이내의 가장 가까운 카페를 거리순으로 반환.
+    after((거리, cafe_id))를 주면 그 카페 다음부터 이어서 반환.
+    open_mask(opening_hours.window_mask)를 주면 그 구간 내내 영업하는 카페만 찾을 때까지 계속 탐색.
+    검색 방식은 settings.CAFE_SEARCH_BACKEND를 따른다 (_memory_search 참고).
+    :return: distance(km) 속성이 붙은 Cafe 리스트
+    """
+    search = _memory_search()
+    if search is not None:
+        return _load_in_order(search(latitude, longitude, radius_km, limit, after=after, open_mask=open_mask))
+    cafes = _orm_nearby_cafes(latitude, longitude, radius_km)
+    if after is not None:
+        distance, cafe_id = after
+        cafes = cafes.filter(Q(distance__gt=distance) | Q(distance=distance, id__gt=cafe_id))
+    if open_mask is None:
+        return list(cafes[:limit])
+    return list(islice(_open_only(cafes, open_mask), limit))
+
+
+def _open_only(cafes, open_mask):
+    """
+    거리순 쿼리셋을 순서대로 읽으며 구간 내내 영업하는 카페만 내보냄 (ORM 검색용).
+    """
+    cafes = cafes.exclude(opening_minute__isnull=True).exclude(closing_minute__isnull=True)
+    for cafe in cafes.iterator(chunk_size=100):
+        if is_open_during(slot_mask(cafe.opening_minute, cafe.closing_minute), open_mask):
+            yield cafe
+
+
+def find_nearby_cafes_batch(points, radius_km, limit, open_mask=None):
+    """
+    여러 좌표 각각에 대해 반경 이내의 가장 가까운 카페를 찾는다.
+    좌표별 검색은 메모리 인덱스에서 끝내고, 결과에 등장한 카페는 한 번의 쿼리로 불러온다.
+    :param points: [(latitude, longitude), ...]
+    :param open_mask: 영업 구간 마스크. 지정하면 그 구간 내내 영업하는 카페만 반환
+    :return: (좌표별 [(거리(km), cafe_id), ...] 리스트, {cafe_id: Cafe})
+    """
+    search = _memory_search()
+    results = []
+    for latitude, longitude in points:
+        if search is not None:
+            hits = search(latitude, longitude, radius_km, limit, open_mask=open_mask)
+        elif open_mask is not None:
+            hits = [
+                (cafe.distance, cafe.id)
+                for cafe in islice(_open_only(_orm_nearby_cafes(latitude, longitude, radius_km), open_mask), limit)
+            ]
+        else:
+            hits = list(_orm_nearby_cafes(latitude, longitude, radius_km).values_list("distance", "id")[:limit])
+        results.append(hits)
+
+    cafes = Cafe.objects.filter(is_active=True).in_bulk({cafe_id for hits in results for _, cafe_id in hits})
+    # 인덱스 갱신 전에 삭제(표시)되거나 병합된 카페는 결과에서 제외
+    results = [[(distance, cafe_id) for distance, cafe_id in hits if cafe_id in cafes] for hits in results]
+    return results, cafes
+
+
+def _load_in_order(hits):
+    """
+    (거리, cafe_id) 목록을 한 번의 쿼리로 Cafe 객체로 바꾸고 거리순을 유지.
+    """
+    cafes = Cafe.objects.filter(is_active=True).in_bulk([cafe_id for _, cafe_id in hits])
+    result = []
+    for distance, cafe_id in hits:
+        cafe = cafes.get(cafe_id)
+        if cafe is None:  # 인덱스 갱신 전에 삭제(표시)되거나 병합된 카페 (다른 워커의 변경, 발행된 스냅샷 파일)
+            continue
+        cafe.distance = distance
+        result.append(cafe)
+    return result
+
+
+def _orm_nearby_cafes(latitude, longitude, radius_km):
+    """
+    DB에서 구면 코사인 법칙으로 거리를 계산하는 검색 경로.
+    (latitude, longitude) 복합 인덱스를 타는 BETWEEN 사각형으로 후보를 먼저 줄이고,
+    살아남은 행에 대해서만 정확한 거리를 계산.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    return Cafe.objects.filter(
+        is_active=True,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    ).annotate(
+        distance=ExpressionWrapper(
+            # 같은 지점이면 반올림 오차로 코사인이 1을 살짝 넘어 ACOS가 NULL이 되므로 1로 자른다
+            EARTH_RADIUS_KM * ACos(Least(
+                Cos(Radians(F("latitude"))) * Cos(Radians(latitude)) *
+                Cos(Radians(F("longitude")) - Radians(longitude)) +
+                Sin(Radians(F("latitude"))) * Sin(Radians(latitude)),
+                Value(1.0),
+            )),
+            output_field=FloatField()
+        )
+    ).filter(distance__lte=radius_km).order_by("distance", "id")
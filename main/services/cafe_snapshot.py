@@ -0,0 +1,318 @@
+import heapq
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+
+from .cafe_version import get_cafe_version
+from .geo import bounding_box, distances_km, radian_columns
+from .opening_hours import is_open_during, slot_mask
+
+logger = logging.getLogger(__name__)
+
+NO_HOURS = -1  # 영업 시간 정보가 없거나 형식이 잘못된 카페
+
+# 스냅샷 파일 헤더: 매직, 파일 형식 버전, 예약, 데이터 버전, 카페 수
+SNAPSHOT_MAGIC = b"NMDCAFE\0"
+SNAPSHOT_FORMAT = 2  # 2: 거리 계산용 라디안/cos 열 제거
+SNAPSHOT_HEADER = struct.Struct("<8sIIQQ")
+
+
+def pack_opening_hours(open_minute, close_minute):
+    """
+    분 단위 영업 시간(Cafe.opening_minute / closing_minute)을 (여는 분 << 16 | 닫는 분) 정수 하나로 압축.
+    :return: 압축된 정수, 영업 시간 정보가 없으면 NO_HOURS
+    """
+    if open_minute is None or close_minute is None:
+        return NO_HOURS
+    return (open_minute << 16) | close_minute
+
+
+def unpack_opening_hours(packed):
+    """
+    pack_opening_hours의 역변환.
+    :return: (여는 분, 닫는 분) 또는 None
+    """
+    if packed == NO_HOURS:
+        return None
+    return packed >> 16, packed & 0xFFFF
+
+
+class CafeSnapshot:
+    """
+    카페 데이터를 열(column) 단위 배열로 보관하는 읽기 전용 스냅샷.
+    - ids: int64 카페 ID
+    - latitudes / longitudes: float64 좌표
+    - opening_hours: int32 압축 영업 시간 (pack_opening_hours)
+    - concentrate: uint8 집중하기 좋은 카페 여부
+    격자 인덱스, 클러스터 계층이 이 스냅샷으로 만들어지고, 열 전체에 대한 일괄 거리 계산/상위 k개 선택(nearest)도 제공한다.
+    열은 array 또는 (mmap 위의) memoryview 어느 쪽이든 된다.
+    """
+    COLUMNS = (
+        ("ids", "q"),
+        ("latitudes", "d"),
+        ("longitudes", "d"),
+        ("opening_hours", "i"),
+        ("concentrate", "B"),
+    )
+
+    def __init__(self, ids, latitudes, longitudes, opening_hours, concentrate, version=None):
+        self.ids = ids
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.opening_hours = opening_hours
+        self.concentrate = concentrate
+        self.version = version
+        self._slot_masks = None
+        self._search_columns = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows, version=None):
+        """
+        (id, latitude, longitude, opening_minute, closing_minute, isConcentrate) 튜플 목록으로 스냅샷 생성.
+        """
+        ids = array("q")
+        latitudes = array("d")
+        longitudes = array("d")
+        opening_hours = array("i")
+        concentrate = array("B")
+        for cafe_id, latitude, longitude, open_minute, close_minute, is_concentrate in rows:
+            ids.append(cafe_id)
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+            opening_hours.append(pack_opening_hours(open_minute, close_minute))
+            concentrate.append(1 if is_concentrate else 0)
+        return cls(ids, latitudes, longitudes, opening_hours, concentrate, version=version)
+
+    def slot_masks(self):
+        """
+        행별 영업 슬롯 마스크 (opening_hours.slot_mask). 처음 필요할 때 한 번만 계산.
+        """
+        if self._slot_masks is None:
+            masks = []
+            for packed in self.opening_hours:
+                hours = unpack_opening_hours(packed)
+                masks.append(slot_mask(*hours) if hours else 0)
+            self._slot_masks = masks
+        return self._slot_masks
+
+    def rows_for(self, cafe_ids):
+        """
+        카페 ID 목록을 스냅샷 행 번호 목록으로 변환 (ids는 오름차순으로 저장되어 있음).
+        스냅샷에 없는 ID는 건너뛴다.
+        :return: [(cafe_id, 행 번호), ...]
+        """
+        ids = self.ids
+        rows = []
+        for cafe_id in cafe_ids:
+            row = bisect_left(ids, cafe_id)
+            if row < len(ids) and ids[row] == cafe_id:
+                rows.append((cafe_id, row))
+        return rows
+
+    def search_columns(self):
+        """
+        거리 계산용 열을 처음 필요할 때 한 번만 계산.
+        - lat_rad / lon_rad / cos_lat: distances_km에 넘기는 라디안 좌표와 cos(위도)
+        - by_latitude / sorted_latitudes: 위도순 행 번호와 그 위도 (반경의 위도 띠를 이분 탐색으로 자르기 위함)
+        :return: (lat_rad, lon_rad, cos_lat, by_latitude, sorted_latitudes)
+        """
+        if self._search_columns is None:
+            latitudes = self.latitudes
+            by_latitude = array("q", sorted(range(len(latitudes)), key=latitudes.__getitem__))
+            sorted_latitudes = array("d", (latitudes[row] for row in by_latitude))
+            self._search_columns = (*radian_columns(latitudes, self.longitudes), by_latitude, sorted_latitudes)
+        return self._search_columns
+
+    def distances(self, latitude, longitude, rows=None):
+        """
+        기준점에서 모든 카페(또는 rows로 지정한 행)까지의 거리(km)를 한 번에 계산.
+        :return: rows 순서의 거리 리스트
+        """
+        lat_rad, lon_rad, cos_lat, _, _ = self.search_columns()
+        return distances_km(latitude, longitude, lat_rad, lon_rad, cos_lat, rows)
+
+    def nearest(self, latitude, longitude, radius_km, limit, after=None, open_mask=None):
+        """
+        반경 안에서 가장 가까운 카페 limit개를 거리순으로 반환.
+        반경의 위도 띠에 드는 행만 이분 탐색으로 잘라 경도 범위로 한 번 더 거른 뒤,
+        남은 행의 거리를 한 번에 계산하고 전체를 정렬하지 않고 부분 선택(heap)으로 상위 limit개만 고른다.
+        :param after: (거리, cafe_id) 커서. 지정하면 그 다음 카페부터 반환
+        :param open_mask: 영업 구간 마스크. 지정하면 그 구간 내내 영업하는 카페만 반환
+        :return: [(거리(km), cafe_id), ...]
+        """
+        _, _, _, by_latitude, sorted_latitudes = self.search_columns()
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        rows = by_latitude[bisect_left(sorted_latitudes, min_lat):bisect_right(sorted_latitudes, max_lat)]
+        lon_span = max_lon - min_lon
+        if lon_span < 360:
+            # 날짜변경선을 넘는 범위도 한 번에 비교하도록 서쪽 끝에서 동쪽으로 잰 경도 차이로 거른다
+            longitudes = self.longitudes
+            rows = [row for row in rows if (longitudes[row] - min_lon) % 360 <= lon_span]
+        if open_mask is not None:
+            masks = self.slot_masks()
+            rows = [row for row in rows if is_open_during(masks[row], open_mask)]
+
+        ids = self.ids
+        hits = [
+            (distance, ids[row])
+            for row, distance in zip(rows, self.distances(latitude, longitude, rows))
+            if distance <= radius_km
+        ]
+        if after is not None:
+            hits = [hit for hit in hits if hit > after]
+        return heapq.nsmallest(limit, hits)
+
+
+def _aligned(offset):
+    return (offset + 7) & ~7
+
+
+def write_snapshot_file(snapshot, path, version):
+    """
+    스냅샷을 바이너리 파일로 기록. 임시 파일에 쓴 뒤 os.replace로 교체하므로
+    파일을 읽고 있는 워커는 항상 완전한 이전 파일 또는 새 파일만 본다.
+    각 열은 8바이트 경계에 정렬된 리틀 엔디언 배열로 헤더 뒤에 순서대로 놓인다.
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("카페 스냅샷 파일은 리틀 엔디언 환경에서만 생성할 수 있습니다.")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cafe_snapshot.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, 0, version, len(snapshot)))
+            offset = SNAPSHOT_HEADER.size
+            for name, typecode in CafeSnapshot.COLUMNS:
+                padding = _aligned(offset) - offset
+                file.write(b"\0" * padding)
+                data = array(typecode, getattr(snapshot, name)).tobytes()
+                file.write(data)
+                offset += padding + len(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def read_snapshot_version(path):
+    """
+    스냅샷 파일 헤더의 데이터 버전을 반환. 파일이 없거나 형식이 다르면 None.
+    """
+    try:
+        with open(path, "rb") as file:
+            header = file.read(SNAPSHOT_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < SNAPSHOT_HEADER.size:
+        return None
+    magic, file_format, _, version, _ = SNAPSHOT_HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC or file_format != SNAPSHOT_FORMAT:
+        return None
+    return version
+
+
+def load_snapshot_file(path):
+    """
+    스냅샷 파일을 읽기 전용으로 mmap하고 열을 복사 없이 memoryview로 연결.
+    같은 파일을 여는 워커들은 운영체제 페이지 캐시를 공유한다.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < SNAPSHOT_HEADER.size:
+        raise ValueError(f"카페 스냅샷 파일이 손상되었습니다: {path}")
+    magic, file_format, _, version, count = SNAPSHOT_HEADER.unpack_from(mapped)
+    if magic != SNAPSHOT_MAGIC or file_format != SNAPSHOT_FORMAT:
+        raise ValueError(f"카페 스냅샷 파일 형식이 올바르지 않습니다: {path}")
+
+    view = memoryview(mapped)
+    columns = {}
+    offset = SNAPSHOT_HEADER.size
+    for name, typecode in CafeSnapshot.COLUMNS:
+        offset = _aligned(offset)
+        size = struct.calcsize(typecode) * count
+        if offset + size > len(mapped):
+            raise ValueError(f"카페 스냅샷 파일이 손상되었습니다: {path}")
+        columns[name] = view[offset:offset + size].cast(typecode)
+        offset += size
+    return CafeSnapshot(version=version, **columns)
+
+
+_snapshot = None
+_snapshot_file_key = None  # mmap한 파일의 (inode, 수정 시각, 크기)
+_snapshot_lock = threading.Lock()
+
+
+def build_cafe_snapshot(version=None):
+    """
+    DB의 모든 (삭제 표시되지 않은) 카페로 스냅샷 생성.
+    """
+    from ..models.cafe import Cafe
+
+    rows = Cafe.objects.filter(is_active=True).values_list(
+        "id", "latitude", "longitude", "opening_minute", "closing_minute", "isConcentrate"
+    ).order_by("id").iterator()
+    return CafeSnapshot.from_rows(rows, version=version)
+
+
+def _get_file_snapshot(path):
+    """
+    발행된 스냅샷 파일을 사용. 파일이 새로 교체되었으면 새 파일로 다시 mmap.
+    """
+    global _snapshot, _snapshot_file_key
+    stat = os.stat(path)
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if _snapshot is None or _snapshot_file_key != key:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot_file_key != key:
+                _snapshot = load_snapshot_file(path)
+                _snapshot_file_key = key
+    return _snapshot
+
+
+def get_cafe_snapshot():
+    """
+    프로세스 전역 스냅샷을 반환.
+    settings.CAFE_SNAPSHOT_PATH가 설정되어 있으면 발행된 스냅샷 파일을 mmap해서 사용하고,
+    아니면 DB에서 만들고 카페 버전 카운터가 바뀔 때마다 다시 생성.
+    """
+    global _snapshot, _snapshot_file_key
+    path = getattr(settings, "CAFE_SNAPSHOT_PATH", None)
+    if path:
+        try:
+            return _get_file_snapshot(path)
+        except (OSError, ValueError):
+            logger.exception("카페 스냅샷 파일을 읽을 수 없어 DB에서 생성합니다: %s", path)
+
+    version = get_cafe_version()
+    snapshot = _snapshot
+    if snapshot is None or _snapshot_file_key is not None or snapshot.version != version:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot_file_key is not None or _snapshot.version != version:
+                _snapshot = build_cafe_snapshot(version=version)
+                _snapshot_file_key = None
+            snapshot = _snapshot
+    return snapshot
+
+
+def reset_cafe_snapshot():
+    """
+    스냅샷을 버림. 다음 조회 때 다시 생성.
+    """
+    global _snapshot, _snapshot_file_key
+    with _snapshot_lock:
+        _snapshot = None
+        _snapshot_file_key = None
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+
+from .cafe_changes import latest_change_version
+
+# 클라이언트가 보관하는 카페 필드 (영업 상태는 분 단위 영업 시간으로 클라이언트가 계산)
+SYNC_FIELDS = (
+    "id", "external_id", "name", "address", "isConcentrate", "opening_hours",
+    "opening_minute", "closing_minute", "latitude", "longitude", "district_code",
+)
+DEFAULT_MAX_DELTA = 5000  # 이보다 변경 기록이 많으면 전체 데이터를 보내는 편이 작다
+FULL_SNAPSHOT_TIMEOUT = 60 * 60  # 버전별 전체 데이터 캐시 유지 시간 (초)
+
+
+def _active_cafes(cafe_ids=None):
+    from ..models.cafe import Cafe
+
+    cafes = Cafe.objects.filter(is_active=True)
+    if cafe_ids is not None:
+        cafes = cafes.filter(id__in=cafe_ids)
+    return list(cafes.order_by("id").values(*SYNC_FIELDS))
+
+
+def full_cafe_dataset(version):
+    """
+    version 시점의 전체 활성 카페 목록. 같은 버전 요청이 몰리므로 버전별로 캐시.
+    """
+    key = f"main:cafe_sync_full:{version}"
+    cafes = cache.get(key)
+    if cafes is None:
+        cafes = _active_cafes()
+        cache.set(key, cafes, timeout=FULL_SNAPSHOT_TIMEOUT)
+    return cafes
+
+
+def oldest_delta_version():
+    """
+    변경 기록만으로 따라잡을 수 있는 가장 오래된 클라이언트 버전.
+    오래된 CafeChange 기록을 지웠다면 그보다 이전 버전은 전체 데이터를 받아야 한다.
+    """
+    from ..models.cafe_change import CafeChange
+
+    first = CafeChange.objects.aggregate(first=Min("id"))["first"]
+    return first - 1 if first is not None else 0
+
+
+def cafe_delta(since):
+    """
+    클라이언트 버전 since 이후 추가/변경/삭제된 카페를 반환.
+    카페별로 마지막 기록만 반영하므로 그 사이에 여러 번 바뀐 카페도 한 번만 내려간다.
+    since가 없거나, 기록이 정리되어 따라잡을 수 없거나, 변경이 너무 많으면 전체 데이터를 반환.
+    :return: {"version", "full", "cafes": [...], "removed": [cafe_id, ...]}
+    """
+    from ..models.cafe_change import CafeChange
+
+    version = latest_change_version()
+    max_delta = getattr(settings, "CAFE_SYNC_MAX_DELTA", DEFAULT_MAX_DELTA)
+
+    changes = None
+    if since is not None and oldest_delta_version() <= since <= version:
+        changes = list(
+            CafeChange.objects.filter(id__gt=since, id__lte=version)
+            .order_by("id").values_list("cafe_id", "action")[:max_delta + 1]
+        )
+        if len(changes) > max_delta:
+            changes = None
+    if changes is None:
+        return {"version": version, "full": True, "cafes": full_cafe_dataset(version), "removed": []}
+
+    last_actions = dict(changes)  # 카페별 마지막 기록
+    cafes = _active_cafes([cafe_id for cafe_id, action in last_actions.items() if action != "deleted"])
+    present = {cafe["id"] for cafe in cafes}
+    # 마지막 기록이 삭제이거나, 조회 시점에 이미 비활성/삭제된 카페는 removed로 보냄
+    removed = sorted(cafe_id for cafe_id in last_actions if cafe_id not in present)
+    return {"version": version, "full": False, "cafes": cafes, "removed": removed}
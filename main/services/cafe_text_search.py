@@ -0,0 +1,186 @@
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+
+from .cafe_version import get_cafe_version
+from .geo import haversine_km
+from .korean_text import bigrams, normalize_text
+
+NAME_WEIGHT = 2.0  # 이름에서 맞은 2-gram은 주소에서 맞은 것보다 두 배
+MIN_COVERAGE = 0.5  # 검색어 2-gram 중 이만큼은 맞아야 결과에 포함 (오타 허용)
+SUBSTRING_BONUS = 0.5  # 정규화된 검색어가 이름에 그대로 들어 있으면 가산
+PREFIX_BONUS = 0.25  # 이름이 검색어로 시작하면 추가 가산
+
+
+class CafeTextIndex:
+    """
+    카페 이름/주소의 글자 2-gram 역색인 (프로세스 내).
+    한국어는 띄어쓰기가 들쭉날쭉하고 형태소 분석 없이도 부분 일치가 필요하므로 공백을 지운 문자열의 2-gram을 쓴다.
+    이름과 주소는 목록을 따로 두어 카페별로 어느 쪽에서 몇 개가 맞았는지 목록을 한 번씩 세는 것으로 계산한다.
+    """
+
+    def __init__(self, version=None):
+        self.version = version  # 색인이 반영하고 있는 카페 버전
+        self._name_postings = defaultdict(set)  # 2-gram -> {이름에 그 2-gram이 있는 cafe_id}
+        self._address_postings = defaultdict(set)  # 2-gram -> {주소에 그 2-gram이 있는 cafe_id}
+        self._documents = {}  # cafe_id -> (정규화된 이름, 정규화된 주소, 위도, 경도)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add(self, cafe_id, name, address, latitude, longitude):
+        """
+        카페를 색인에 추가. 이미 있는 카페라면 내용을 갱신.
+        """
+        with self._lock:
+            self.remove(cafe_id)
+            name, address = normalize_text(name), normalize_text(address)
+            self._documents[cafe_id] = (name, address, latitude, longitude)
+            for gram in bigrams(name):
+                self._name_postings[gram].add(cafe_id)
+            for gram in bigrams(address):
+                self._address_postings[gram].add(cafe_id)
+
+    def remove(self, cafe_id):
+        """
+        카페를 색인에서 제거. 없는 카페라면 무시.
+        """
+        with self._lock:
+            document = self._documents.pop(cafe_id, None)
+            if document is None:
+                return
+            for text, postings in ((document[0], self._name_postings), (document[1], self._address_postings)):
+                for gram in bigrams(text):
+                    posting = postings[gram]
+                    posting.discard(cafe_id)
+                    if not posting:
+                        del postings[gram]
+
+    @staticmethod
+    def _count(postings, grams):
+        """
+        카페별로 검색어 2-gram이 몇 개 들어 있는지 (Counter.update는 목록을 C 루프로 센다).
+        """
+        counts = Counter()
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting:
+                counts.update(posting)
+        return counts
+
+    def search(self, query, limit, latitude=None, longitude=None, radius_km=None):
+        """
+        검색어와 이름/주소가 비슷한 카페를 점수순으로 반환.
+        이름이나 주소 어느 한쪽에 검색어 2-gram이 MIN_COVERAGE 이상 들어 있어야 결과에 포함.
+        점수 = (이름에서 맞은 2-gram x NAME_WEIGHT + 주소에서 맞은 2-gram) / (검색어 2-gram 수 x NAME_WEIGHT)
+               + 이름 포함/접두 가산점.
+        :param latitude, longitude, radius_km: 지정하면 반경 안의 카페만, 점수가 같으면 가까운 순
+        :return: [(점수, cafe_id, 거리(km) 또는 None), ...]
+        """
+        normalized = normalize_text(query)
+        grams = bigrams(normalized)
+        if not grams:
+            return []
+        total = len(grams)
+        min_match = max(1, math.ceil(total * MIN_COVERAGE))
+        located = latitude is not None and longitude is not None
+
+        with self._lock:
+            name_counts = self._count(self._name_postings, grams)
+            address_counts = self._count(self._address_postings, grams)
+            candidates = {cafe_id for cafe_id, count in name_counts.items() if count >= min_match}
+            candidates.update(cafe_id for cafe_id, count in address_counts.items() if count >= min_match)
+            # 이름에 검색어 2-gram이 모두 있는 카페만 포함/접두 여부를 확인하면 된다
+            names = {cafe_id: self._documents[cafe_id][0] for cafe_id in candidates if name_counts[cafe_id] == total}
+            locations = {cafe_id: self._documents[cafe_id][2:] for cafe_id in candidates} if located else None
+
+        hits = []
+        for cafe_id in candidates:
+            distance = None
+            if located:
+                distance = haversine_km(latitude, longitude, *locations[cafe_id])
+                if radius_km is not None and distance > radius_km:
+                    continue
+            score = (name_counts[cafe_id] * NAME_WEIGHT + address_counts[cafe_id]) / (total * NAME_WEIGHT)
+            name = names.get(cafe_id)
+            if name is not None and normalized in name:
+                score += SUBSTRING_BONUS
+                if name.startswith(normalized):
+                    score += PREFIX_BONUS
+            hits.append((-score, distance or 0.0, cafe_id))
+
+        return [(-score, cafe_id, distance if located else None)
+                for score, distance, cafe_id in heapq.nsmallest(limit, hits)]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def build_cafe_text_index(version=None):
+    """
+    DB의 활성 카페로 검색 색인 생성.
+    """
+    from ..models.cafe import Cafe
+
+    index = CafeTextIndex(version=version)
+    rows = Cafe.objects.filter(is_active=True).values_list(
+        "id", "name", "address", "latitude", "longitude").iterator(chunk_size=2000)
+    for cafe_id, name, address, latitude, longitude in rows:
+        index.add(cafe_id, name, address, latitude, longitude)
+    return index
+
+
+def get_cafe_text_index():
+    """
+    프로세스 전역 검색 색인을 반환.
+    처음 호출될 때, 또는 카페 버전이 바뀌었는데 이 프로세스가 반영하지 못했을 때(일괄 가져오기, 다른 프로세스의 변경) 다시 생성.
+    카페 한 곳의 저장/삭제는 시그널에서 add/remove로 바로 반영한다.
+    """
+    global _index
+    version = get_cafe_version()
+    index = _index
+    if index is None or index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                _index = build_cafe_text_index(version)
+            index = _index
+    return index
+
+
+def peek_cafe_text_index():
+    """
+    이미 생성된 색인만 반환 (없으면 None). 시그널에서 불필요한 생성을 막기 위해 사용.
+    """
+    return _index
+
+
+def reset_cafe_text_index():
+    """
+    색인을 버림. 다음 검색 때 다시 생성.
+    """
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def search_cafes(query, limit, latitude=None, longitude=None, radius_km=None):
+    """
+    검색 색인으로 카페를 찾아 점수순 Cafe 목록으로 반환.
+    :return: score, distance(km 또는 None) 속성이 붙은 Cafe 리스트
+    """
+    from ..models.cafe import Cafe
+
+    hits = get_cafe_text_index().search(query, limit, latitude, longitude, radius_km)
+    cafes = Cafe.objects.filter(is_active=True).in_bulk([cafe_id for _, cafe_id, _ in hits])
+    result = []
+    for score, cafe_id, distance in hits:
+        cafe = cafes.get(cafe_id)
+        if cafe is None:  # 색인 갱신 전에 삭제(표시)된 카페
+            continue
+        cafe.score = score
+        cafe.distance = distance
+        result.append(cafe)
+    return result
@@ -0,0 +1,27 @@
+from django.core.cache import cache
+
+CAFE_VERSION_KEY = "main:cafe_version"
+
+
+def get_cafe_version():
+    """
+    카페 데이터 버전 카운터를 반환.
+    프로세스 내 인덱스/스냅샷은 이 값이 바뀌면 다시 만들어진다.
+    여러 워커가 값을 공유하려면 CACHES에 공유 캐시(redis, memcached 등)를 설정해야 한다.
+    """
+    version = cache.get(CAFE_VERSION_KEY)
+    if version is None:
+        cache.add(CAFE_VERSION_KEY, 0, timeout=None)
+        version = cache.get(CAFE_VERSION_KEY, 0)
+    return version
+
+
+def bump_cafe_version():
+    """
+    카페가 추가/수정/삭제되었음을 알리고 새 버전을 반환.
+    """
+    try:
+        return cache.incr(CAFE_VERSION_KEY)
+    except ValueError:  # 키가 없거나 캐시에서 밀려난 경우
+        cache.add(CAFE_VERSION_KEY, 0, timeout=None)
+        return cache.incr(CAFE_VERSION_KEY)
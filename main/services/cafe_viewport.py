@@ -0,0 +1,158 @@
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .cafe_index import get_cafe_index
+from .cafe_ranking import bayesian_rating, get_rating_prior
+from .opening_hours import is_open_during, slot_mask
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE_PX = 256  # 지도 타일 한 장의 크기 (네이버 지도도 웹 메르카토르 256px 타일)
+DEFAULT_SAMPLE_CELL_PX = 64  # 샘플링 격자 한 칸의 화면 크기 (px), 칸마다 카페 하나만 남김
+DEFAULT_SCORE_TIMEOUT = 60  # 별점 점수표를 다시 읽는 주기 (초)
+MIN_ZOOM, MAX_ZOOM = 1, 21
+
+
+def sample_cell_deg(zoom):
+    """
+    zoom 단계에서 샘플링 격자 한 칸의 크기 (도).
+    칸은 (0, 0)을 기준으로 한 전역 격자라서 지도를 옮겨도 같은 칸에서는 같은 카페가 대표로 남는다.
+    """
+    cell_px = getattr(settings, "CAFE_VIEWPORT_SAMPLE_CELL_PX", DEFAULT_SAMPLE_CELL_PX)
+    return cell_px * 360.0 / (TILE_SIZE_PX * 2 ** zoom)
+
+
+class _ScoreTable:
+    """
+    카페별 베이지안 평균 별점을 프로세스 메모리에 보관하는 표 (대표 카페 선택용).
+    별점은 카페 버전을 올리지 않고 바뀌므로 버전 대신 settings.CAFE_VIEWPORT_SCORE_TIMEOUT 주기로 다시 읽는다.
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._default = 0.0
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        from ..models.cafe import Cafe
+
+        prior = get_rating_prior()
+        scores = {
+            cafe_id: bayesian_rating(rating_sum, rating_count, prior)
+            for cafe_id, rating_sum, rating_count
+            in Cafe.objects.filter(is_active=True, rating_count__gt=0)
+            .values_list("id", "rating_sum", "rating_count").iterator(chunk_size=2000)
+        }
+        # 별점이 없는 카페는 사전 평균 (표에 담지 않음)
+        self._scores, self._default = scores, bayesian_rating(0, 0, prior)
+        self._loaded_at = time.monotonic()
+
+    def get(self):
+        """
+        :return: 점수 조회 함수 (cafe_id -> 점수)
+        """
+        timeout = getattr(settings, "CAFE_VIEWPORT_SCORE_TIMEOUT", DEFAULT_SCORE_TIMEOUT)
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > timeout:
+            with self._lock:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at > timeout:
+                    self._load()
+        scores, default = self._scores, self._default
+        return lambda cafe_id: scores.get(cafe_id, default)
+
+    def reset(self):
+        with self._lock:
+            self._loaded_at = None
+
+
+_score_table = _ScoreTable()
+
+
+def reset_viewport_scores():
+    """
+    점수표를 버림. 다음 조회 때 다시 읽음.
+    """
+    _score_table.reset()
+
+
+def _cafes_in_bounds(min_lat, max_lat, min_lon, max_lon, open_mask=None):
+    """
+    화면 안의 카페 (cafe_id, latitude, longitude). 격자 인덱스에서 찾고, 쓸 수 없으면 DB에서 찾는다.
+    """
+    if getattr(settings, "CAFE_SEARCH_BACKEND", "grid") != "orm":
+        try:
+            return get_cafe_index().within_bounds(min_lat, max_lat, min_lon, max_lon, open_mask=open_mask)
+        except DatabaseError:
+            logger.exception("카페 메모리 인덱스 생성 실패, ORM 검색으로 대체합니다.")
+
+    from ..models.cafe import Cafe
+
+    rows = Cafe.objects.filter(
+        is_active=True,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    ).values_list("id", "latitude", "longitude", "opening_minute", "closing_minute")
+    return [
+        (cafe_id, lat, lon)
+        for cafe_id, lat, lon, open_minute, close_minute in rows
+        if open_mask is None or is_open_during(slot_mask(open_minute, close_minute), open_mask)
+    ]
+
+
+def sample_viewport(cafes, zoom, limit, score):
+    """
+    카페가 limit개를 넘으면 zoom 단계의 격자 칸마다 점수가 가장 높은 카페 하나만 남긴다.
+    그래도 limit개를 넘으면 칸을 두 배씩 키워 다시 묶고(큰 칸의 대표 = 작은 칸 대표들 중 최고점),
+    남는 자리는 바로 전 단계 대표들 중 점수가 높은 순으로 채운다.
+    :param cafes: [(cafe_id, latitude, longitude), ...]
+    :param score: cafe_id -> 점수
+    :return: ([(점수, cafe_id), ...] 점수 내림차순, 샘플링 여부)
+    """
+    def order(entry):
+        # 점수가 같으면 id가 작은 카페 (요청마다 같은 대표)
+        return -entry[0], entry[1]
+
+    ranked = [(score(cafe_id), cafe_id, lat, lon) for cafe_id, lat, lon in cafes]
+    sampled = len(ranked) > limit
+    cell_deg = sample_cell_deg(zoom)
+    finer = []
+    while len(ranked) > limit:
+        best = {}
+        for entry in ranked:
+            cell = (math.floor(entry[2] / cell_deg), math.floor(entry[3] / cell_deg))
+            current = best.get(cell)
+            if current is None or order(entry) < order(current):
+                best[cell] = entry
+        finer, ranked = ranked, list(best.values())
+        cell_deg *= 2
+    if sampled and len(ranked) < limit:
+        chosen = {entry[1] for entry in ranked}
+        ranked += sorted((entry for entry in finer if entry[1] not in chosen), key=order)[:limit - len(ranked)]
+    ranked.sort(key=order)
+    return [(cafe_score, cafe_id) for cafe_score, cafe_id, _, _ in ranked], sampled
+
+
+def viewport_cafes(min_lat, max_lat, min_lon, max_lon, zoom, limit, open_mask=None):
+    """
+    지도 화면(위경도 사각형) 안의 카페를 최대 limit개 반환. 넘치면 sample_viewport로 고르게 추린다.
+    :return: {"total": 화면 안 카페 수, "sampled": 샘플링 여부, "cafes": [score 속성이 붙은 Cafe, ...]}
+    """
+    from ..models.cafe import Cafe
+
+    candidates = _cafes_in_bounds(min_lat, max_lat, min_lon, max_lon, open_mask)
+    hits, sampled = sample_viewport(candidates, zoom, limit, _score_table.get())
+
+    loaded = Cafe.objects.filter(is_active=True).in_bulk([cafe_id for _, cafe_id in hits])
+    cafes = []
+    for cafe_score, cafe_id in hits:
+        cafe = loaded.get(cafe_id)
+        if cafe is None:  # 인덱스 갱신 전에 삭제(표시)된 카페
+            continue
+        cafe.score = cafe_score
+        cafes.append(cafe)
+    return {"total": len(candidates), "sampled": sampled, "cafes": cafes}
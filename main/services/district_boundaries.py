@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+from .districts import DISTRICT_AREAS, SEOUL_DISTRICTS, district_code_from_address
+
+logger = logging.getLogger(__name__)
+
+NODE_CAPACITY = 4  # R-tree 노드 하나에 담는 자식 수
+
+# GeoJSON feature properties에서 자치구 코드/이름을 찾을 때 확인하는 키 (통계청, 국토부 데이터 등)
+CODE_PROPERTIES = ("code", "SIG_CD", "sig_cd", "sgg", "SGG_CD")
+NAME_PROPERTIES = ("name", "SIG_KOR_NM", "sig_kor_nm", "sggnm", "SGG_NM")
+
+_CODES_BY_NAME = {area.split()[-1]: code for code, area in SEOUL_DISTRICTS}  # "OO구" -> 코드
+
+
+def point_in_rings(longitude, latitude, rings):
+    """
+    짝홀(even-odd) 규칙 광선 투사로 점이 다각형 안에 있는지 판정.
+    바깥 경계와 구멍(hole) 고리를 모두 rings로 받으므로 구멍 안의 점은 밖으로 판정된다.
+    :param rings: [[(경도, 위도), ...], ...]
+    """
+    inside = False
+    for ring in rings:
+        x0, y0 = ring[-1]
+        for x1, y1 in ring:
+            if (y1 > latitude) != (y0 > latitude):
+                crossing = x0 + (latitude - y0) * (x1 - x0) / (y1 - y0)
+                if longitude < crossing:
+                    inside = not inside
+            x0, y0 = x1, y1
+    return inside
+
+
+def _bbox(points):
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _union(boxes):
+    return (
+        min(box[0] for box in boxes), min(box[1] for box in boxes),
+        max(box[2] for box in boxes), max(box[3] for box in boxes),
+    )
+
+
+class DistrictBoundaryIndex:
+    """
+    자치구 경계 다각형을 STR(Sort-Tile-Recursive) 방식으로 묶은 R-tree.
+    점 하나를 분류할 때 경계 사각형에 들어가는 다각형만 정확한 포함 판정을 한다.
+    """
+
+    def __init__(self, polygons):
+        """
+        :param polygons: [(자치구 코드, [[(경도, 위도), ...], ...]), ...]  (다각형 하나당 바깥 경계 + 구멍 고리)
+        """
+        entries = [(_bbox(rings[0]), (code, rings)) for code, rings in polygons if rings and rings[0]]
+        self._root = self._build(entries) if entries else None
+        self.size = len(entries)
+
+    @classmethod
+    def _build(cls, entries):
+        """
+        (사각형, 값) 목록을 경도 방향 띠로 나눈 뒤 띠 안에서 위도 순으로 묶는 과정을 루트 하나가 남을 때까지 반복.
+        노드는 (사각형, 자식 목록, 잎 여부).
+        """
+        level = [(box, value, True) for box, value in entries]
+        while len(level) > 1:
+            node_count = -(-len(level) // NODE_CAPACITY)
+            slice_count = max(1, round(node_count ** 0.5))
+            slice_size = -(-len(level) // slice_count)
+            level.sort(key=lambda node: (node[0][0] + node[0][2]) / 2)
+            parents = []
+            for start in range(0, len(level), slice_size):
+                strip = sorted(level[start:start + slice_size], key=lambda node: (node[0][1] + node[0][3]) / 2)
+                for offset in range(0, len(strip), NODE_CAPACITY):
+                    children = strip[offset:offset + NODE_CAPACITY]
+                    parents.append((_union([child[0] for child in children]), children, False))
+            level = parents
+        return level[0]
+
+    def locate(self, latitude, longitude):
+        """
+        좌표가 속한 자치구 코드를 반환. 어느 다각형에도 속하지 않으면 None.
+        """
+        if self._root is None or latitude is None or longitude is None:
+            return None
+        stack = [self._root]
+        while stack:
+            (min_x, min_y, max_x, max_y), content, is_leaf = stack.pop()
+            if not (min_x <= longitude <= max_x and min_y <= latitude <= max_y):
+                continue
+            if is_leaf:
+                code, rings = content
+                if point_in_rings(longitude, latitude, rings):
+                    return code
+            else:
+                stack.extend(content)
+        return None
+
+
+def _feature_code(properties):
+    """
+    feature 속성에서 SEOUL_DISTRICTS 코드를 결정. 이름("마포구")을 우선 사용하고, 없으면 코드 값을 그대로 확인.
+    """
+    for key in NAME_PROPERTIES:
+        name = properties.get(key)
+        if name:
+            code = _CODES_BY_NAME.get(str(name).split()[-1])
+            if code:
+                return code
+    for key in CODE_PROPERTIES:
+        code = str(properties.get(key, ""))[:5]
+        if code in DISTRICT_AREAS:
+            return code
+    return None
+
+
+def load_district_boundaries(path):
+    """
+    WGS84 좌표의 GeoJSON FeatureCollection(Polygon / MultiPolygon)에서 경계 인덱스를 생성.
+    서울 25개 구로 매칭되지 않는 feature는 건너뛴다.
+    """
+    with open(path, encoding="utf-8") as file:
+        collection = json.load(file)
+
+    polygons = []
+    for feature in collection.get("features", ()):
+        code = _feature_code(feature.get("properties") or {})
+        geometry = feature.get("geometry") or {}
+        if code is None:
+            continue
+        if geometry.get("type") == "Polygon":
+            parts = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            parts = geometry["coordinates"]
+        else:
+            continue
+        for rings in parts:
+            polygons.append((code, [[(float(x), float(y)) for x, y, *_ in ring] for ring in rings]))
+    return DistrictBoundaryIndex(polygons)
+
+
+_boundaries = None
+_boundaries_path = None
+_boundaries_lock = threading.Lock()
+
+
+def get_district_boundaries():
+    """
+    settings.DISTRICT_BOUNDARIES_PATH의 경계 인덱스를 프로세스당 한 번만 읽어서 반환.
+    파일이 없거나 읽을 수 없으면 None (주소 기반 분류만 사용).
+    """
+    global _boundaries, _boundaries_path
+    path = getattr(settings, "DISTRICT_BOUNDARIES_PATH", None)
+    if _boundaries_path != path:
+        with _boundaries_lock:
+            if _boundaries_path != path:
+                boundaries = None
+                if path and os.path.exists(path):
+                    try:
+                        boundaries = load_district_boundaries(path)
+                    except (OSError, ValueError, KeyError, TypeError):
+                        logger.exception("자치구 경계 파일을 읽을 수 없습니다: %s", path)
+                _boundaries, _boundaries_path = boundaries, path
+    return _boundaries
+
+
+def classify_district(latitude, longitude, address=None):
+    """
+    좌표가 속한 자치구 코드를 경계 다각형으로 판정하고, 경계 데이터가 없거나 서울 밖이면 주소로 판정.
+    :return: 자치구 코드 또는 None
+    """
+    boundaries = get_district_boundaries()
+    code = boundaries.locate(latitude, longitude) if boundaries is not None else None
+    return code or district_code_from_address(address)
@@ -0,0 +1,129 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils.timezone import now
+
+from .cafe_ranking import bayesian_rating, get_rating_prior
+from .districts import SEOUL_DISTRICTS
+
+LEADERBOARD_SIZE = 50  # 자치구별로 저장하는 순위 수
+RANKING_KINDS = ("all", "concentrate")
+DEFAULT_REFRESH_INTERVAL = 60  # 별점/리뷰 변경으로 인한 자치구 순위 재계산 최소 간격 (초)
+
+
+def refresh_district_ranking(district_code):
+    """
+    자치구 하나의 순위를 다시 계산해 DistrictCafeRanking 행을 교체.
+    그 구의 카페만 한 번의 쿼리로 읽으므로 다른 구의 순위는 건드리지 않는다.
+    점수는 베이지안 평균 별점, 같으면 별점 수, 리뷰 수가 많은 순.
+    """
+    from ..models.cafe import Cafe
+    from ..models.ranking import DistrictCafeRanking
+
+    prior = get_rating_prior()
+    cafes = list(
+        Cafe.objects.filter(district_code=district_code, is_active=True)
+        .only('id', 'isConcentrate', 'rating_sum', 'rating_count')
+        .annotate(review_count=Count('reviews'))
+    )
+    for cafe in cafes:
+        cafe.score = bayesian_rating(cafe.rating_sum, cafe.rating_count, prior)
+    cafes.sort(key=lambda cafe: (-cafe.score, -cafe.rating_count, -cafe.review_count, cafe.id))
+
+    rows = []
+    for kind in RANKING_KINDS:
+        ranked = cafes if kind == "all" else [cafe for cafe in cafes if cafe.isConcentrate]
+        rows += [
+            DistrictCafeRanking(
+                district_code=district_code, kind=kind, rank=rank, cafe_id=cafe.id,
+                score=cafe.score, rating_count=cafe.rating_count, review_count=cafe.review_count,
+            )
+            for rank, cafe in enumerate(ranked[:LEADERBOARD_SIZE], start=1)
+        ]
+
+    with transaction.atomic():
+        DistrictCafeRanking.objects.filter(district_code=district_code).delete()
+        DistrictCafeRanking.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_all_district_rankings():
+    """
+    모든 자치구의 순위를 다시 계산 (초기 생성, 별점 사전 분포가 크게 바뀌었을 때).
+    """
+    from ..models.ranking import DistrictCafeRanking
+
+    codes = [code for code, _ in SEOUL_DISTRICTS]
+    DistrictCafeRanking.objects.exclude(district_code__in=codes).delete()
+    return sum(refresh_district_ranking(code) for code in codes)
+
+
+def schedule_district_refresh(district_codes):
+    """
+    현재 트랜잭션이 커밋된 뒤 해당 자치구들을 갱신 필요로 표시하고, 재계산 간격이 지난 구만 바로 다시 계산.
+    별점 하나 바뀔 때마다 구 전체를 재계산하지 않도록 구마다 DISTRICT_RANKING_REFRESH_INTERVAL초에 한 번만 재계산하며,
+    간격 안에 쌓인 변경은 다음 변경 때 또는 refresh_district_rankings --dirty 명령(주기 실행)으로 반영된다.
+    """
+    codes = {code for code in district_codes if code}
+    if codes:
+        transaction.on_commit(lambda: refresh_dirty_districts(mark_districts_dirty(codes)))
+
+
+def mark_districts_dirty(district_codes):
+    """
+    자치구들의 순위를 다시 계산해야 함을 DB(DistrictRankingState)에 표시.
+    :return: 표시한 자치구 코드 집합
+    """
+    from ..models.ranking import DistrictRankingState
+
+    codes = {code for code in district_codes if code}
+    DistrictRankingState.objects.bulk_create(
+        [DistrictRankingState(district_code=code) for code in codes], ignore_conflicts=True
+    )
+    DistrictRankingState.objects.filter(district_code__in=codes).update(dirty=True)
+    return codes
+
+
+def refresh_dirty_districts(district_codes=None, interval=None):
+    """
+    표시된 자치구 중 마지막 재계산 후 interval초가 지난 구의 순위를 다시 계산.
+    구마다 조건부 UPDATE로 재계산 차례를 잡으므로 여러 워커가 동시에 불러도 한 곳에서만 재계산한다.
+    재계산 중에 들어온 변경은 다시 표시되어 다음 차례에 반영된다.
+    :param district_codes: 대상 자치구 (None이면 표시된 모든 구)
+    :param interval: 재계산 최소 간격 (초, 기본값 settings.DISTRICT_RANKING_REFRESH_INTERVAL)
+    :return: 다시 계산한 자치구 수
+    """
+    from ..models.ranking import DistrictRankingState
+
+    if interval is None:
+        interval = getattr(settings, "DISTRICT_RANKING_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL)
+    current = now()
+    due = Q(refreshed_at__isnull=True) | Q(refreshed_at__lte=current - timedelta(seconds=interval))
+    states = DistrictRankingState.objects.filter(due, dirty=True)
+    if district_codes is not None:
+        states = states.filter(district_code__in=district_codes)
+
+    refreshed = 0
+    for code in list(states.values_list('district_code', flat=True)):
+        if DistrictRankingState.objects.filter(due, district_code=code, dirty=True).update(
+                dirty=False, refreshed_at=current):
+            refresh_district_ranking(code)
+            refreshed += 1
+    return refreshed
+
+
+def district_leaderboard(district_code, kind="all", limit=LEADERBOARD_SIZE):
+    """
+    자치구의 저장된 순위를 (district_code, kind, rank) 인덱스로 한 번에 조회.
+    :return: cafe가 함께 로드된 DistrictCafeRanking 쿼리셋
+    """
+    from ..models.ranking import DistrictCafeRanking
+
+    return (
+        DistrictCafeRanking.objects
+        .filter(district_code=district_code, kind=kind)
+        .select_related('cafe')
+        .order_by('rank')[:limit]
+    )
@@ -0,0 +1,56 @@
+SEOUL_PREFIXES = ("서울특별시", "서울시", "서울")  # 주소 첫 단어로 허용하는 서울 표기
+
+# 서울 25개 자치구 (행정표준코드 시군구 코드, Profile.AREA_CHOICES 값)
+SEOUL_DISTRICTS = (
+    ("11110", "서울특별시 종로구"),
+    ("11140", "서울특별시 중구"),
+    ("11170", "서울특별시 용산구"),
+    ("11200", "서울특별시 성동구"),
+    ("11215", "서울특별시 광진구"),
+    ("11230", "서울특별시 동대문구"),
+    ("11260", "서울특별시 중랑구"),
+    ("11290", "서울특별시 성북구"),
+    ("11305", "서울특별시 강북구"),
+    ("11320", "서울특별시 도봉구"),
+    ("11350", "서울특별시 노원구"),
+    ("11380", "서울특별시 은평구"),
+    ("11410", "서울특별시 서대문구"),
+    ("11440", "서울특별시 마포구"),
+    ("11470", "서울특별시 양천구"),
+    ("11500", "서울특별시 강서구"),
+    ("11530", "서울특별시 구로구"),
+    ("11545", "서울특별시 금천구"),
+    ("11560", "서울특별시 영등포구"),
+    ("11590", "서울특별시 동작구"),
+    ("11620", "서울특별시 관악구"),
+    ("11650", "서울특별시 서초구"),
+    ("11680", "서울특별시 강남구"),
+    ("11710", "서울특별시 송파구"),
+    ("11740", "서울특별시 강동구"),
+)
+
+DISTRICT_AREAS = dict(SEOUL_DISTRICTS)  # 코드 -> "서울특별시 OO구"
+_CODES_BY_AREA = {area: code for code, area in SEOUL_DISTRICTS}
+_CODES_BY_NAME = {area.split()[-1]: code for code, area in SEOUL_DISTRICTS}  # "OO구" -> 코드
+
+
+def district_code_for_area(area):
+    """
+    Profile.area 값("서울특별시 OO구")을 자치구 코드로 변환.
+    :return: 코드, 알 수 없는 지역이면 None
+    """
+    return _CODES_BY_AREA.get(area)
+
+
+def district_code_from_address(address):
+    """
+    "서울 마포구 도화2길 27" 같은 주소 문자열에서 자치구 코드를 찾음.
+    다른 시에도 같은 이름의 구(중구, 강서구 등)가 있으므로 서울 주소만 인정.
+    :return: 코드, 서울 주소가 아니거나 구를 찾지 못하면 None
+    """
+    if not address:
+        return None
+    words = address.split()
+    if len(words) < 2 or words[0] not in SEOUL_PREFIXES:
+        return None
+    return _CODES_BY_NAME.get(words[1])
@@ -0,0 +1,105 @@
+import math
+from array import array
+
+EARTH_RADIUS_KM = 6371.0  # 지구 반지름 (km)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    두 좌표 사이의 대원 거리(km)를 계산.
+    :param lat1: 지점 1 위도
+    :param lon1: 지점 1 경도
+    :param lat2: 지점 2 위도
+    :param lon2: 지점 2 경도
+    :return: 거리 (km)
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distances_km(latitude, longitude, lat_rad, lon_rad, cos_lat, rows=None):
+    """
+    기준점에서 여러 지점까지의 대원 거리(km)를 한 번에 계산.
+    지점 쪽 라디안 좌표와 cos(위도)는 미리 계산된 열(column)로 받아 지점마다 다시 계산하지 않는다.
+    :param lat_rad: 지점 위도 (라디안) 열
+    :param lon_rad: 지점 경도 (라디안) 열
+    :param cos_lat: 지점 cos(위도) 열
+    :param rows: 계산할 행 번호 목록 (없으면 모든 행)
+    :return: rows 순서의 거리 리스트
+    """
+    phi = math.radians(latitude)
+    lam = math.radians(longitude)
+    cos_phi = math.cos(phi)
+    sin, asin, sqrt = math.sin, math.asin, math.sqrt
+    if rows is None:
+        rows = range(len(lat_rad))
+    return [
+        2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(
+            sin((lat_rad[i] - phi) / 2) ** 2 + cos_phi * cos_lat[i] * sin((lon_rad[i] - lam) / 2) ** 2
+        )))
+        for i in rows
+    ]
+
+
+def radian_columns(latitudes, longitudes):
+    """
+    distances_km에 넘길 (위도 라디안, 경도 라디안, cos(위도)) 열을 계산.
+    """
+    lat_rad = array("d", map(math.radians, latitudes))
+    lon_rad = array("d", map(math.radians, longitudes))
+    cos_lat = array("d", map(math.cos, lat_rad))
+    return lat_rad, lon_rad, cos_lat
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    중심 좌표에서 반경 radius_km 원을 감싸는 위경도 사각형 계산.
+    경도 1도의 길이는 위도가 높을수록 줄어들기 때문에(서울 기준 약 88km) 경도 폭은 cos(위도)로 보정.
+    :return: (min_lat, max_lat, min_lon, max_lon)
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    # 원의 극 쪽 가장자리에서 경도 폭이 가장 넓으므로 그 위도 기준으로 보정
+    edge_lat = min(90.0, abs(latitude) + d_lat)
+    cos_lat = math.cos(math.radians(edge_lat))
+    if cos_lat < 1e-12:
+        d_lon = 180.0
+    else:
+        d_lon = min(180.0, d_lat / cos_lat)
+    return latitude - d_lat, latitude + d_lat, longitude - d_lon, longitude + d_lon
+
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_bounds(latitude, longitude, precision):
+    """
+    좌표가 속한 geohash 칸의 문자열과 경계를 계산.
+    :param precision: geohash 문자 수 (6이면 서울 기준 약 0.6km x 1km)
+    :return: (geohash, (min_lat, max_lat, min_lon, max_lon))
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # 경도 비트부터 시작
+    while len(chars) < precision:
+        target, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (target[0] + target[1]) / 2
+        if coordinate >= mid:
+            value = (value << 1) | 1
+            target[0] = mid
+        else:
+            value <<= 1
+            target[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars), (lat_range[0], lat_range[1], lon_range[0], lon_range[1])
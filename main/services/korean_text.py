@@ -0,0 +1,86 @@
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_text(text):
+    """
+    비교/검색용 문자열: 유니코드 정규화(NFKC), 소문자, 공백/문장부호 제거.
+    "스타벅스 합정점"과 "스타벅스(합정점)"은 같은 값이 된다.
+    """
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def bigrams(text):
+    """
+    정규화된 문자열의 글자 2-gram 집합. 한 글자짜리는 그 글자 하나.
+    띄어쓰기를 지운 뒤 만들므로 "스타벅스 합정"과 "스타벅스합정"의 2-gram이 같다.
+    """
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+# 한글 음절(가~힣) = 0xAC00 + (초성 x 21 + 중성) x 28 + 종성
+HANGUL_BASE, HANGUL_LAST = 0xAC00, 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+# 두 번 눌러 입력하는 겹모음/겹받침은 입력 순서대로 풀어 둔다 (입력 중인 글자도 접두어로 맞도록)
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+_CONSONANTS = frozenset(CHOSEONG) | frozenset("ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄ")
+# NFKC(normalize_text)는 따로 입력한 자모(ㄱ, U+3131)를 조합용 자모(U+1100)로 바꾸므로 다시 되돌린다
+_TO_COMPATIBILITY = {
+    **{0x1100 + i: char for i, char in enumerate(CHOSEONG)},
+    **{0x1161 + i: char for i, char in enumerate(JUNGSEONG)},
+    **{0x11A8 + i: char for i, char in enumerate(JONGSEONG[1:])},
+}
+
+
+def decompose_jamo(text):
+    """
+    한글 음절을 자모 입력 순서로 풀어 씀. "스탑" -> "ㅅㅡㅌㅏㅂ" ("스타벅스"를 입력하는 도중의 모습과 같은 접두어).
+    한글이 아닌 글자는 그대로 둔다.
+    """
+    result = []
+    for char in text.translate(_TO_COMPATIBILITY):
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            code -= HANGUL_BASE
+            jung = JUNGSEONG[code // 28 % 21]
+            jong = JONGSEONG[code % 28]
+            result.append(CHOSEONG[code // 588])
+            result.append(COMPOUND_JAMO.get(jung, jung))
+            result.append(COMPOUND_JAMO.get(jong, jong))
+        else:
+            result.append(COMPOUND_JAMO.get(char, char))
+    return "".join(result)
+
+
+def choseong(text):
+    """
+    한글 음절을 초성으로 바꿈. "스타벅스" -> "ㅅㅌㅂㅅ". 한글 음절이 아닌 글자는 그대로 둔다.
+    """
+    return "".join(
+        CHOSEONG[(ord(char) - HANGUL_BASE) // 588] if HANGUL_BASE <= ord(char) <= HANGUL_LAST else char
+        for char in text.translate(_TO_COMPATIBILITY)
+    )
+
+
+def is_choseong_query(text):
+    """
+    초성 검색으로 볼 입력인지: 모두 자음이거나, 자음 뒤에 다른 글자가 이어지는 경우("스ㅌㅂ").
+    끝 글자만 자음인 경우("스타ㅂ")는 음절을 입력하는 중이므로 초성 검색이 아니다.
+    """
+    text = text.translate(_TO_COMPATIBILITY)
+    if not text:
+        return False
+    if all(char in _CONSONANTS for char in text):
+        return True
+    return any(char in _CONSONANTS for char in text[:-1])
@@ -0,0 +1,125 @@
+import heapq
+
+from ..models.cafe import Cafe
+from .geo import bounding_box, distances_km, haversine_km, radian_columns
+
+OBJECTIVES = ("total", "max", "fair")
+SEARCH_MARGIN_KM = 1.0  # 참가자를 감싸는 원 바깥으로 더 살펴볼 여유 반경
+MAX_SEARCH_RADIUS_KM = 100.0  # 후보 검색 반경 상한 (이보다 넓어야 하면 결과가 잘렸다고 알림)
+MAX_CANDIDATES = 5000  # 거리 행렬을 만들 후보 카페 수 상한 (무게중심에서 가까운 순)
+
+
+def _score(distances, objective, fairness_weight):
+    """
+    한 카페에 대한 참가자별 거리 목록을 목적 함수 값으로 변환 (작을수록 좋음).
+    - total: 이동 거리 합
+    - max: 가장 먼 사람의 이동 거리
+    - fair: 평균 거리와 최대 거리를 fairness_weight 비율로 섞은 값
+    """
+    if objective == "total":
+        return sum(distances)
+    if objective == "max":
+        return max(distances)
+    mean = sum(distances) / len(distances)
+    return (1 - fairness_weight) * mean + fairness_weight * max(distances)
+
+
+def _required_radius(score, spreads, objective, fairness_weight):
+    """
+    무게중심에서 이 반경보다 먼 카페는 목적 함수 값이 score보다 작을 수 없는 반경.
+    무게중심에서 D만큼 떨어진 카페와 참가자 i 사이의 거리는 삼각 부등식에 의해 D - spreads[i] 이상이므로
+    - total: 합 >= N·D - Σspreads
+    - max: 최대 >= D - min(spreads)
+    - fair: (1-w)·평균 + w·최대 >= D - ((1-w)·평균 spread + w·min(spreads))
+    :param spreads: 무게중심에서 각 참가자까지의 거리 (km)
+    """
+    if objective == "total":
+        return (score + sum(spreads)) / len(spreads)
+    if objective == "max":
+        return score + min(spreads)
+    mean = sum(spreads) / len(spreads)
+    return score + (1 - fairness_weight) * mean + fairness_weight * min(spreads)
+
+
+def _candidates(center_lat, center_lon, radius):
+    """
+    무게중심에서 radius 이내의 카페를 (id, 위도, 경도) 열로 불러온다.
+    위경도 인덱스를 타는 사각형으로 거른 뒤 무게중심 거리로 한 번 더 거르고, MAX_CANDIDATES개를 넘으면 가까운 순으로 자른다.
+    :return: (ids, latitudes, longitudes, covered). covered는 후보에 들지 않은 카페가 무게중심에서 떨어진 최소 거리 하한
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(center_lat, center_lon, radius)
+    rows = list(Cafe.objects.filter(
+        is_active=True,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    ).values_list("id", "latitude", "longitude"))
+    if not rows:
+        return [], [], [], radius
+
+    ids, latitudes, longitudes = zip(*rows)
+    center_distances = distances_km(center_lat, center_lon, *radian_columns(latitudes, longitudes))
+    inside = sorted((distance, row) for row, distance in enumerate(center_distances) if distance <= radius)
+    covered = radius
+    if len(inside) > MAX_CANDIDATES:
+        covered = inside[MAX_CANDIDATES][0]  # 잘려 나간 카페 중 가장 가까운 거리
+        inside = inside[:MAX_CANDIDATES]
+    rows = [row for _, row in inside]
+    return [ids[row] for row in rows], [latitudes[row] for row in rows], [longitudes[row] for row in rows], covered
+
+
+def rank_meeting_cafes(participants, objective="total", fairness_weight=0.5, limit=5):
+    """
+    N명의 위치에서 모이기 좋은 카페를 목적 함수 순으로 반환.
+    참가자 무게중심 주변의 후보를 (id, 위도, 경도) 열로만 불러와, 후보 좌표의 라디안/cos 열을 한 번 계산한 뒤
+    참가자마다 한 번의 일괄 계산(distances_km)으로 참가자 × 후보 거리 행렬을 만든다.
+    후보 반경은 참가자 분포에서 시작해, 찾은 limit번째 점수로 구한 반경(_required_radius)이 더 넓으면 그만큼 넓혀 다시 찾는다.
+    :param participants: [(latitude, longitude), ...]
+    :param objective: "total" | "max" | "fair"
+    :param fairness_weight: fair 목적에서 최대 거리의 비중 (0~1)
+    :param limit: 최대 결과 개수
+    :return: ([(점수(km), Cafe, [참가자별 거리(km), ...]), ...] 점수 오름차순,
+        잘림 여부 - 반경/후보 수 상한 때문에 검색 범위 밖의 카페가 결과에 들 수도 있으면 True)
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective는 {', '.join(OBJECTIVES)} 중 하나여야 합니다.")
+    if not participants:
+        return [], False
+
+    center_lat = sum(lat for lat, _ in participants) / len(participants)
+    center_lon = sum(lon for _, lon in participants) / len(participants)
+    spreads = [haversine_km(center_lat, center_lon, lat, lon) for lat, lon in participants]
+    # 합/최대 거리를 최소화하는 지점은 참가자들을 감싸는 원 근처에 있으므로 그 안부터 찾는다
+    radius = min(max(spreads) + SEARCH_MARGIN_KM, MAX_SEARCH_RADIUS_KM)
+
+    while True:
+        ids, latitudes, longitudes, covered = _candidates(center_lat, center_lon, radius)
+        ranked = []
+        if ids:
+            columns = radian_columns(latitudes, longitudes)
+            # 거리 행렬: matrix[i][j] = 참가자 i에서 후보 j까지의 거리
+            matrix = [distances_km(lat, lon, *columns) for lat, lon in participants]
+            scored = (
+                (_score(column, objective, fairness_weight), cafe_id, column)
+                for cafe_id, column in zip(ids, zip(*matrix))
+            )
+            ranked = heapq.nsmallest(limit, scored, key=lambda item: (item[0], item[1]))
+
+        if len(ranked) < limit:
+            required = float("inf")  # 결과가 모자라면 범위 밖의 어떤 카페든 결과에 들 수 있음
+        else:
+            required = _required_radius(ranked[-1][0], spreads, objective, fairness_weight)
+        if required <= covered:
+            truncated = False
+            break
+        if radius >= MAX_SEARCH_RADIUS_KM or covered < radius:  # 더 넓힐 수 없음 (반경 또는 후보 수 상한)
+            # 모든 카페가 이미 후보였다면 범위 밖에 남은 카페가 없으므로 잘린 것이 아님
+            truncated = Cafe.objects.filter(is_active=True).count() > len(ids)
+            break
+        radius = min(required, MAX_SEARCH_RADIUS_KM)
+
+    cafes = Cafe.objects.filter(is_active=True).in_bulk([cafe_id for _, cafe_id, _ in ranked])
+    return [
+        (score, cafes[cafe_id], list(column))
+        for score, cafe_id, column in ranked
+        if cafe_id in cafes
+    ], truncated
@@ -1,21 +1,187 @@
+import logging
+import random
+import threading
+import time
+
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})  # 잠시 뒤 다시 시도하면 성공할 수 있는 응답
+
+
+class NaverApiUnavailable(requests.RequestException):
+    """
+    회로 차단기가 열려 있거나 재시도를 모두 써서 네이버 API를 호출할 수 없음.
+    """
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 threshold번 쌓이면 reset_timeout초 동안 호출을 막는 회로 차단기 (프로세스 내).
+    막힌 시간이 지나면 호출 하나만 시험 삼아 보내고(half-open), 성공하면 닫고 실패하면 다시 막는다.
+    느린/죽은 외부 API 때문에 워커가 타임아웃만큼씩 줄줄이 묶이지 않게 하기 위함.
+    실패는 연결 오류, 타임아웃, 429/5xx 응답이다. 4xx 응답은 API가 살아서 바로 답한 것이므로 성공으로 세어
+    연속 실패를 끊는다 (잘못된 검색어나 키 때문에 다른 요청까지 막지 않도록, 호출한 쪽에는 HTTPError로 알린다).
+    """
+
+    def __init__(self, threshold=5, reset_timeout=30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None  # 막힌 시각 (time.monotonic), 닫혀 있으면 None
+        self._trial = False  # half-open 상태에서 시험 호출이 진행 중인지
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        """
+        지금 호출해도 되는지. half-open 상태에서는 한 번에 하나의 시험 호출만 허용.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.threshold:
+                if self._opened_at is None or self._trial:
+                    logger.warning("네이버 API 회로 차단: 연속 실패 %d회, %g초 동안 호출 중단",
+                                   self._failures, self.reset_timeout)
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+def build_session(pool_size=10):
+    """
+    연결을 재사용하는 requests.Session. 호출마다 TCP/TLS 연결을 새로 맺지 않도록 프로세스에서 하나를 공유한다.
+    재시도는 NaverMapService가 직접 하므로 어댑터 자체의 재시도는 끈다.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class NaverMapService:
     """
     네이버 지도 API를 호출하여 장소 정보를 검색하는 서비스 클래스.
+    - 공유 Session으로 연결 재사용
+    - 호출마다 (연결, 응답) 타임아웃, 재시도를 포함한 전체 호출은 deadline초 안에 끝냄
+    - 연결 오류/타임아웃/429/5xx는 지수 백오프(+지터)로 max_retries번까지 재시도
+    - 연속 실패가 쌓이면 회로 차단기가 열려 바로 NaverApiUnavailable을 낸다
+    요청마다 만들지 말고 get_naver_map_service()로 프로세스 전역 인스턴스를 쓴다.
     """
     BASE_URL = "https://naveropenapi.apigw.ntruss.com/map-place/v1/search"
 
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, base_url=None, session=None, timeout=(3.0, 5.0), deadline=10.0,
+                 max_retries=2, backoff=0.2, max_backoff=2.0, breaker=None):
         """
         네이버 API 호출에 필요한 헤더 설정.
         :param client_id: 네이버 API 클라이언트 ID
         :param client_secret: 네이버 API 클라이언트 Secret
+        :param base_url: 장소 검색 URL (기본값 BASE_URL, 테스트용 가짜 서버 주소 등)
+        :param session: 공유할 requests.Session (기본값 새 Session)
+        :param timeout: 한 번의 요청 타임아웃 (초, 숫자 또는 (연결, 응답) 튜플)
+        :param deadline: 재시도와 대기를 포함한 호출 전체의 시간 한도 (초)
+        :param max_retries: 첫 요청 이후 최대 재시도 횟수
+        :param backoff: 첫 재시도 전 대기 시간 (초, 재시도마다 두 배)
+        :param max_backoff: 재시도 전 대기 시간 상한 (초)
+        :param breaker: CircuitBreaker (기본값 새 차단기)
         """
         self.headers = {
             "X-NCP-APIGW-API-KEY-ID": client_id,
             "X-NCP-APIGW-API-KEY": client_secret
         }
+        self.base_url = base_url or self.BASE_URL
+        self.session = session or build_session()
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+
+    def _retry_delay(self, attempt, response=None):
+        """
+        attempt번째 재시도 전 대기 시간. 429/503의 Retry-After(초)가 있으면 따르되 max_backoff를 넘지 않는다.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)  # 여러 워커가 동시에 다시 몰리지 않도록
+
+    def _remaining_timeout(self, started):
+        """
+        이번 요청의 타임아웃. deadline까지 남은 시간을 넘지 않는다.
+        """
+        remaining = max(self.deadline - (time.monotonic() - started), 0.001)
+        if isinstance(self.timeout, tuple):
+            return tuple(min(value, remaining) for value in self.timeout)
+        return min(self.timeout, remaining)
+
+    def _get(self, params):
+        """
+        재시도/차단기를 거쳐 GET 요청을 보내고 JSON 응답을 반환.
+        :raises NaverApiUnavailable: 차단기가 열려 있거나 재시도를 모두 썼을 때
+        :raises requests.HTTPError: 재시도하지 않는 오류 응답 (4xx)
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise NaverApiUnavailable("네이버 API 호출이 일시적으로 중단되었습니다.")
+
+            response = None
+            try:
+                response = self.session.get(self.base_url, headers=self.headers, params=params,
+                                            timeout=self._remaining_timeout(started))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except requests.RequestException:  # 잘못된 URL 등 재시도해도 소용없는 오류
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    # 4xx도 API는 정상 응답한 것이므로 차단기에는 성공으로 치고, 요청 오류는 재시도 없이 HTTPError로 낸다
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.HTTPError(f"{response.status_code} 응답", response=response)
+            self.breaker.record_failure()
+
+            delay = self._retry_delay(attempt, response)
+            if attempt >= self.max_retries or time.monotonic() - started + delay >= self.deadline:
+                raise NaverApiUnavailable(f"네이버 API 호출 실패 ({attempt + 1}회 시도): {error}") from error
+            logger.info("네이버 API 호출 실패, %.2f초 후 재시도: %s", delay, error)
+            time.sleep(delay)
+            attempt += 1
 
     def search_place(self, query, latitude=None, longitude=None, radius=None, count=None):
         """
@@ -38,15 +204,8 @@ class NaverMapService:
             "count": count  # 최대 반환 결과 수 (옵션)
         }
 
-        # API 요청
-        response = requests.get(self.BASE_URL, headers=self.headers, params=params)
-
-        # 응답 처리
-        if response.status_code == 200:
-            data = response.json()
-            return self._parse_places(data)
-        else:
-            response.raise_for_status()
+        # API 요청 및 응답 처리
+        return self._parse_places(self._get(params))
 
     def _parse_places(self, data):
         """
@@ -93,4 +252,45 @@ class NaverMapService:
         """
         사용자 위치와 선택한 카페 간의 길찾기 URL 생성
         """
-        return self.get_directions_url(user_lat, user_lon, place_lat, place_lon)
\ No newline at end of file
+        return self.get_directions_url(user_lat, user_lon, place_lat, place_lon)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_naver_map_service():
+    """
+    settings로 설정한 프로세스 전역 NaverMapService (연결 풀과 회로 차단기를 모든 요청이 공유).
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = NaverMapService(
+                    settings.NAVER_CLIENT_ID,
+                    settings.NAVER_CLIENT_SECRET,
+                    base_url=getattr(settings, "NAVER_API_BASE_URL", None),
+                    session=build_session(getattr(settings, "NAVER_API_POOL_SIZE", 10)),
+                    timeout=(getattr(settings, "NAVER_API_CONNECT_TIMEOUT", 3.0),
+                             getattr(settings, "NAVER_API_READ_TIMEOUT", 5.0)),
+                    deadline=getattr(settings, "NAVER_API_DEADLINE", 10.0),
+                    max_retries=getattr(settings, "NAVER_API_MAX_RETRIES", 2),
+                    backoff=getattr(settings, "NAVER_API_BACKOFF", 0.2),
+                    breaker=CircuitBreaker(
+                        threshold=getattr(settings, "NAVER_API_BREAKER_THRESHOLD", 5),
+                        reset_timeout=getattr(settings, "NAVER_API_BREAKER_RESET_TIMEOUT", 30.0),
+                    ),
+                )
+    return _service
+
+
+def reset_naver_map_service():
+    """
+    전역 인스턴스를 버림 (설정 변경 후 또는 테스트용). 다음 호출 때 다시 생성.
+    """
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.session.close()
+        _service = None
@@ -0,0 +1,152 @@
+import json
+import socket
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SEARCH_PATH = "/map-place/v1/search"
+
+# 기본으로 돌려주는 장소 (네이버 장소 검색 응답 형식)
+DEFAULT_PLACES = [
+    {"name": "합정역 2호선", "category": "지하철역", "road_address": "서울특별시 마포구 양화로 지하 55",
+     "x": "126.9139", "y": "37.5495"},
+    {"name": "홍대입구역 2호선", "category": "지하철역", "road_address": "서울특별시 마포구 양화로 지하 160",
+     "x": "126.9236", "y": "37.5575"},
+    {"name": "강남역 2호선", "category": "지하철역", "road_address": "서울특별시 강남구 강남대로 지하 396",
+     "x": "127.0276", "y": "37.4979"},
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: 클라이언트의 연결 재사용 여부를 확인할 수 있도록
+
+    def setup(self):
+        super().setup()
+        self.server.fake.connection_opened()
+
+    def do_GET(self):
+        fake = self.server.fake
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        action = fake.request_received(url.path, params, dict(self.headers))
+
+        if action == "drop":  # 응답 없이 연결을 끊음 (ConnectionError)
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if isinstance(action, tuple):  # ("delay", 초): 늦게 응답 (Timeout)
+            time.sleep(action[1])
+            action = None
+        if url.path != SEARCH_PATH:
+            action = 404
+        elif not fake.authorized(self.headers):
+            action = 401
+
+        status = action or 200
+        body = {"places": fake.search(params)} if status == 200 else {"error": {"code": status}}
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if status in (429, 503) and fake.retry_after is not None:
+            self.send_header("Retry-After", str(fake.retry_after))
+        try:
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):  # 클라이언트가 타임아웃으로 먼저 연결을 끊음
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        if self.server.fake.verbose:
+            super().log_message(format, *args)
+
+
+class FakeNaverServer:
+    """
+    네이버 장소 검색 API를 흉내 내는 로컬 HTTP 서버. 외부 네트워크 없이 NaverMapService의 연결 재사용, 타임아웃,
+    재시도, 회로 차단기를 확인하기 위함.
+    - script에 넣은 동작을 요청마다 하나씩 꺼내 적용: HTTP 상태 코드(int), ("delay", 초), "drop"(연결 끊기).
+      비어 있으면 places 중 이름에 query가 들어 있거나 분류가 query인 장소를 200으로 응답
+    - requests, connections로 받은 요청 수와 맺어진 연결 수를 확인
+    사용 예:
+        with FakeNaverServer() as fake:
+            fake.script.extend([503, "drop"])
+            service = NaverMapService("id", "secret", base_url=fake.url)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, places=None, client_id=None, client_secret=None, verbose=False):
+        """
+        :param port: 0이면 빈 포트를 골라 씀
+        :param places: 검색 대상 장소 목록 (기본값 DEFAULT_PLACES)
+        :param client_id, client_secret: 지정하면 헤더의 키가 다를 때 401로 응답
+        """
+        self.places = list(DEFAULT_PLACES if places is None else places)
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.verbose = verbose
+        self.script = deque()
+        self.retry_after = None  # 429/503 응답의 Retry-After 헤더 값 (초)
+        self.requests = []  # [(경로, 파라미터, 헤더)]
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    def connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def request_received(self, path, params, headers):
+        """
+        요청을 기록하고 이번 요청에 적용할 동작을 꺼냄 (없으면 None).
+        """
+        with self._lock:
+            self.requests.append((path, params, headers))
+            return self.script.popleft() if self.script else None
+
+    def authorized(self, headers):
+        if self.client_id is None and self.client_secret is None:
+            return True
+        return (headers.get("X-NCP-APIGW-API-KEY-ID") == self.client_id
+                and headers.get("X-NCP-APIGW-API-KEY") == self.client_secret)
+
+    def search(self, params):
+        query = params.get("query", "")
+        places = [place for place in self.places if query in place["name"] or query == place.get("category")]
+        count = params.get("count")
+        return places[:int(count)] if count else places
+
+    def start(self):
+        """
+        백그라운드 스레드에서 서버 시작.
+        """
+        # stop()이 오래 기다리지 않도록 종료 요청을 자주 확인
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:  # shutdown()은 serve_forever가 돌고 있지 않으면 끝나지 않는다
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,127 @@
+from functools import lru_cache
+
+from django.utils.timezone import localtime, now
+
+MINUTES_PER_DAY = 24 * 60
+
+STATUS_BEFORE = "영업 전"
+STATUS_OPEN = "영업 중"
+STATUS_CLOSED = "영업 종료"
+
+
+def parse_opening_hours(opening_hours):
+    """
+    "HH:MM - HH:MM" 형식의 영업 시간을 (여는 시각, 닫는 시각) 분 단위 정수로 변환.
+    닫는 시각이 여는 시각보다 이르면("22:00 - 02:00") 자정을 넘겨 영업하는 카페로 본다.
+    :return: (open_minute, close_minute) 또는 해석할 수 없으면 None
+    """
+    if not opening_hours:
+        return None
+    try:
+        start, end = opening_hours.split("-")
+        return parse_clock(start), parse_clock(end)
+    except ValueError:
+        return None
+
+
+def parse_clock(text):
+    """
+    "HH:MM" 시각을 하루 중 분으로 변환 ("24:00"은 1440).
+    :raises ValueError: 잘못된 형식
+    """
+    hour, minute = text.strip().split(":")
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour <= 24 and 0 <= minute < 60) or (hour == 24 and minute):
+        raise ValueError(f"잘못된 시각입니다: {text}")
+    return hour * 60 + minute
+
+
+def format_opening_hours(open_minute, close_minute):
+    """
+    분 단위 영업 시간을 "HH:MM - HH:MM" 문자열로 변환.
+    """
+    return f"{open_minute // 60:02d}:{open_minute % 60:02d} - {close_minute // 60:02d}:{close_minute % 60:02d}"
+
+
+def is_open_at(open_minute, close_minute, minute):
+    """
+    하루 중 minute(0~1439)에 영업 중인지 여부. 여는 시각과 닫는 시각이 같으면 24시간 영업.
+    """
+    if open_minute == close_minute:
+        return True
+    if open_minute < close_minute:
+        return open_minute <= minute < close_minute
+    return minute >= open_minute or minute < close_minute  # 자정을 넘기는 영업
+
+
+def opening_status(open_minute, close_minute, minute):
+    """
+    하루 중 minute 시점의 영업 상태 ("영업 전", "영업 중", "영업 종료").
+    자정을 넘기는 카페가 닫혀 있는 시간은 그날 다시 열기 전이므로 "영업 전".
+    """
+    if is_open_at(open_minute, close_minute, minute):
+        return STATUS_OPEN
+    if minute < open_minute:
+        return STATUS_BEFORE
+    return STATUS_CLOSED
+
+
+def current_minute():
+    """
+    현재 로컬 시각(settings.TIME_ZONE)을 하루 중 분(0~1439)으로 반환.
+    """
+    current = localtime(now())
+    return current.hour * 60 + current.minute
+
+
+# 시간대 마스크는 하루 1440분을 분마다 한 비트로 나타낸다. 슬롯을 15분 등으로 넓히면 슬롯 일부만 영업하는 카페
+# (09:10 개점 카페의 09:00~09:15 슬롯)가 필터에서 빠져 is_open_at과 결과가 달라지므로 분 단위를 쓴다.
+SLOT_MINUTES = 1  # 시간대 슬롯 하나의 길이 (분)
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+ALL_SLOTS = (1 << SLOTS_PER_DAY) - 1
+
+
+def _range_mask(start_minute, end_minute):
+    """
+    [start_minute, end_minute) 분의 비트를 켠 정수 (0 <= start_minute <= end_minute <= 1440).
+    """
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+
+@lru_cache(maxsize=4096)
+def slot_mask(open_minute, close_minute):
+    """
+    하루 1440분 중 영업하는 분의 비트를 켠 정수. 비트 m은 is_open_at(open_minute, close_minute, m)과 같다.
+    영업 시간 조합은 종류가 적으므로 결과를 캐시해 둔다 (같은 영업 시간의 카페들은 같은 정수를 공유).
+    :return: 1440비트 마스크, 영업 시간 정보가 없으면 0
+    """
+    if open_minute is None or close_minute is None:
+        return 0
+    if open_minute == close_minute:
+        return ALL_SLOTS
+    open_minute = min(open_minute, MINUTES_PER_DAY)
+    close_minute = min(close_minute, MINUTES_PER_DAY)
+    if open_minute < close_minute:
+        return _range_mask(open_minute, close_minute)
+    return _range_mask(open_minute, MINUTES_PER_DAY) | _range_mask(0, close_minute)  # 자정을 넘기는 영업
+
+
+def window_mask(start_minute, end_minute):
+    """
+    [start_minute, end_minute) 구간의 분 비트를 켠 정수.
+    end_minute가 start_minute보다 이르면 자정을 넘기는 구간으로 본다.
+    카페의 slot_mask가 이 마스크를 모두 포함하면 구간 내내 영업 중이며,
+    window_mask(m, m + 1)은 is_open_at(..., m)과 정확히 같은 판정이 된다.
+    """
+    if end_minute == start_minute:
+        end_minute = start_minute + 1
+    if end_minute < start_minute:
+        return window_mask(start_minute, MINUTES_PER_DAY) | window_mask(0, end_minute)
+    return _range_mask(start_minute, end_minute)
+
+
+def is_open_during(hours_mask, required_mask):
+    """
+    카페 슬롯 마스크가 요구 구간 마스크를 모두 포함하는지 여부. required_mask가 None이면 항상 True.
+    """
+    return required_mask is None or hours_mask & required_mask == required_mask
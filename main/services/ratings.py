@@ -0,0 +1,134 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+
+STARS = range(1, 6)  # 별점 범위 (1~5)
+
+
+def _star_field(star):
+    return f'rating_{star}'
+
+
+def apply_rating_change(cafe_id, old=None, new=None):
+    """
+    카페의 별점 집계(합계, 개수, 별점별 개수)에 별점 하나의 변화를 반영.
+    F() 식으로 DB에서 직접 더하고 빼므로 동시에 여러 사용자가 별점을 남겨도 값이 어긋나지 않는다.
+    Rating 변경과 같은 트랜잭션 안에서 호출해야 한다.
+    :param old: 이전 별점 (새로 추가된 별점이면 None)
+    :param new: 새 별점 (삭제된 별점이면 None)
+    """
+    from ..models.cafe import Cafe
+
+    if old == new:
+        return
+    changes = {}
+    if old is not None:
+        changes['rating_sum'] = F('rating_sum') - old
+        changes[_star_field(old)] = F(_star_field(old)) - 1
+    if new is not None:
+        changes['rating_sum'] = changes.get('rating_sum', F('rating_sum')) + new
+        changes[_star_field(new)] = F(_star_field(new)) + 1
+    if old is None:
+        changes['rating_count'] = F('rating_count') + 1
+    elif new is None:
+        changes['rating_count'] = F('rating_count') - 1
+    Cafe.objects.filter(pk=cafe_id).update(**changes)
+
+
+def rate_cafe(user, cafe, value):
+    """
+    사용자의 카페 별점을 추가하거나 (이미 있으면) 수정하고 집계를 갱신.
+    :return: (Rating, 새로 생성되었는지 여부)
+    """
+    from ..models.rating import Rating
+
+    with transaction.atomic():
+        rating = Rating.objects.select_for_update().filter(user=user, cafe=cafe).first()
+        if rating is None:
+            try:
+                # 같은 사용자의 동시 요청이 먼저 만들었다면 unique_together 위반 -> 수정으로 처리
+                with transaction.atomic():
+                    rating = Rating.objects.create(user=user, cafe=cafe, rating=value)
+            except IntegrityError:
+                rating = Rating.objects.select_for_update().get(user=user, cafe=cafe)
+            else:
+                apply_rating_change(cafe.pk, new=value)
+                return rating, True
+
+        old = rating.rating
+        rating.rating = value
+        rating.save(update_fields=['rating'])
+        apply_rating_change(cafe.pk, old=old, new=value)
+        return rating, False
+
+
+def update_rating(rating, value):
+    """
+    기존 별점의 값을 바꾸고 집계를 갱신.
+    """
+    from ..models.rating import Rating
+
+    with transaction.atomic():
+        old = Rating.objects.select_for_update().values_list('rating', flat=True).get(pk=rating.pk)
+        rating.rating = value
+        rating.save(update_fields=['rating'])
+        apply_rating_change(rating.cafe_id, old=old, new=value)
+    return rating
+
+
+def delete_rating(rating):
+    """
+    별점을 삭제하고 집계에서 뺀다.
+    """
+    from ..models.rating import Rating
+
+    with transaction.atomic():
+        old = Rating.objects.select_for_update().values_list('rating', flat=True).filter(pk=rating.pk).first()
+        if old is None:  # 이미 삭제됨
+            return
+        rating.delete()
+        apply_rating_change(rating.cafe_id, old=old)
+
+
+def rating_aggregates(ratings):
+    """
+    Rating 쿼리셋을 카페별로 집계.
+    :return: {cafe_id: {'rating_sum': ..., 'rating_count': ..., 'rating_1': ..., ...}}
+    """
+    annotations = {
+        'rating_sum': Sum('rating'),
+        'rating_count': Count('id'),
+        **{_star_field(star): Count('id', filter=Q(rating=star)) for star in STARS},
+    }
+    return {
+        row.pop('cafe_id'): row
+        for row in ratings.values('cafe_id').annotate(**annotations).order_by()
+    }
+
+
+def recompute_rating_aggregates(cafe_ids=None, batch_size=500):
+    """
+    Rating 테이블에서 카페별 별점 집계를 다시 계산해 일괄 저장 (집계가 어긋났을 때 복구용).
+    :param cafe_ids: 다시 계산할 카페 ID 목록 (None이면 전체)
+    :return: 값이 바뀐 카페 수
+    """
+    from ..models.cafe import Cafe
+    from ..models.rating import Rating
+
+    fields = ['rating_sum', 'rating_count', *(_star_field(star) for star in STARS)]
+    cafes = Cafe.objects.only('id', *fields).order_by('id')
+    ratings = Rating.objects.all()
+    if cafe_ids is not None:
+        cafes = cafes.filter(id__in=cafe_ids)
+        ratings = ratings.filter(cafe_id__in=cafe_ids)
+
+    aggregates = rating_aggregates(ratings)
+    empty = dict.fromkeys(fields, 0)
+    changed = []
+    for cafe in cafes.iterator(chunk_size=batch_size):
+        expected = aggregates.get(cafe.id, empty)
+        if any(getattr(cafe, field) != expected[field] for field in fields):
+            for field in fields:
+                setattr(cafe, field, expected[field])
+            changed.append(cafe)
+    Cafe.objects.bulk_update(changed, fields, batch_size=batch_size)
+    return len(changed)
@@ -0,0 +1,17 @@
+import hashlib
+import uuid
+
+from django.utils.text import slugify
+
+SLUG_HASH_LENGTH = 10  # 같은 이름의 카페(체인점)를 구분하는 해시 길이
+MAX_NAME_SLUG_LENGTH = 80
+
+
+def cafe_slug(name, external_id=None):
+    """
+    카페 상세 주소에 쓰는 slug: "이름-해시". 해시는 외부 키로 만들어 같은 데이터는 항상 같은 slug가 되고,
+    외부 키가 없는 카페(직접 등록)는 임의 값을 쓴다. 한 번 정해지면 이름이 바뀌어도 바꾸지 않는다.
+    """
+    base = slugify(name or "", allow_unicode=True)[:MAX_NAME_SLUG_LENGTH].strip("-") or "cafe"
+    key = external_id if external_id is not None else uuid.uuid4().hex
+    return f"{base}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:SLUG_HASH_LENGTH]}"
@@ -0,0 +1,171 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models.cafe import Cafe
+from .models.rating import Rating
+from .models.review import Review
+from .services.cafe_autocomplete import peek_cafe_autocomplete
+from .services.cafe_changes import log_cafe_changes
+from .services.cafe_clusters import peek_cafe_clusters
+from .services.cafe_detail import invalidate_cafe_detail
+from .services.cafe_index import peek_cafe_index
+from .services.cafe_text_search import peek_cafe_text_index
+from .services.cafe_version import bump_cafe_version
+from .services.district_rankings import schedule_district_refresh
+from .services.opening_hours import slot_mask
+
+
+def _mark_applied(structure, version):
+    """
+    직전 버전까지 반영된 구조라면 이번 변경을 직접 반영했으므로 새 버전으로 표시.
+    그 사이 다른 프로세스의 변경이 있었다면 표시하지 않아 다음 조회 때 다시 생성되게 둔다.
+    """
+    if structure.version == version - 1:
+        structure.version = version
+
+
+@receiver(post_save, sender=Cafe)
+def update_cafe_index_on_save(sender, instance, **kwargs):
+    """
+    카페 저장 시 버전을 올리고 이미 만들어진 공간 인덱스, 클러스터 계층, 검색 색인, 자동완성에 반영 (트랜잭션 커밋 후).
+    """
+    def apply():
+        version = bump_cafe_version()
+        index = peek_cafe_index()
+        if index is not None:
+            if instance.is_active:
+                index.add(instance.pk, instance.latitude, instance.longitude,
+                          slot_mask(instance.opening_minute, instance.closing_minute))
+            else:  # 삭제 표시된 카페는 검색에서 제외
+                index.remove(instance.pk)
+            _mark_applied(index, version)
+        clusters = peek_cafe_clusters()
+        if clusters is not None:
+            if instance.is_active:
+                clusters.add(instance.pk, instance.latitude, instance.longitude)
+            else:
+                clusters.remove(instance.pk)
+            _mark_applied(clusters, version)
+        text_index = peek_cafe_text_index()
+        if text_index is not None:
+            if instance.is_active:
+                text_index.add(instance.pk, instance.name, instance.address, instance.latitude, instance.longitude)
+            else:
+                text_index.remove(instance.pk)
+            _mark_applied(text_index, version)
+        autocomplete = peek_cafe_autocomplete()
+        if autocomplete is not None:
+            if instance.is_active:
+                autocomplete.add(instance.pk, instance.name, instance.rating_count)
+            else:
+                autocomplete.remove(instance.pk)
+            _mark_applied(autocomplete, version)
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_delete, sender=Cafe)
+def update_cafe_index_on_delete(sender, instance, **kwargs):
+    """
+    카페 삭제 시 변경 기록을 남기고, 버전을 올리고 공간 인덱스, 클러스터 계층, 검색 색인, 자동완성에서 제거 (트랜잭션 커밋 후).
+    """
+    cafe_id = instance.pk
+    if instance.is_active:  # 이미 삭제 표시된 카페는 삭제 기록이 있음
+        log_cafe_changes([(cafe_id, instance.external_id, 'deleted', '')])
+
+    def apply():
+        version = bump_cafe_version()
+        index = peek_cafe_index()
+        if index is not None:
+            index.remove(cafe_id)
+            _mark_applied(index, version)
+        clusters = peek_cafe_clusters()
+        if clusters is not None:
+            clusters.remove(cafe_id)
+            _mark_applied(clusters, version)
+        text_index = peek_cafe_text_index()
+        if text_index is not None:
+            text_index.remove(cafe_id)
+            _mark_applied(text_index, version)
+        autocomplete = peek_cafe_autocomplete()
+        if autocomplete is not None:
+            autocomplete.remove(cafe_id)
+            _mark_applied(autocomplete, version)
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def update_autocomplete_weight(sender, instance, **kwargs):
+    """
+    별점이 바뀌면 자동완성 추천 순서에 쓰는 그 카페의 별점 수를 갱신 (트랜잭션 커밋 후, 별점 집계가 반영된 상태에서).
+    별점 수는 카페 버전과 무관하므로 버전은 건드리지 않는다.
+    """
+    cafe_id = instance.cafe_id
+
+    def apply():
+        autocomplete = peek_cafe_autocomplete()
+        if autocomplete is None:
+            return
+        row = Cafe.objects.filter(pk=cafe_id, is_active=True).values_list('name', 'rating_count').first()
+        if row is not None:
+            autocomplete.add(cafe_id, *row)
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Cafe)
+def refresh_district_ranking_on_cafe_save(sender, instance, **kwargs):
+    """
+    자치구, 삭제 표시, 집중 여부, 별점 집계가 바뀐 경우에만 그 카페의 자치구 순위와,
+    자치구가 바뀌어 빠져나온 이전 자치구 순위를 갱신 (이름, 영업시간 등만 바뀐 저장은 순위와 무관).
+    """
+    previous = getattr(instance, '_previous_ranking_state', None)
+    current = tuple(getattr(instance, field) for field in Cafe.RANKING_FIELDS)
+    if previous == current:
+        return
+    if previous is None and not instance.is_active:
+        return  # 삭제 표시된 채로 새로 만든 카페는 순위에 들지 않음
+    schedule_district_refresh({instance.district_code, previous[0] if previous else None})
+
+
+@receiver(post_delete, sender=Cafe)
+def refresh_district_ranking_on_cafe_delete(sender, instance, **kwargs):
+    """
+    카페 삭제 시 비어 버린 순위를 메우도록 그 카페의 자치구 순위를 갱신 (삭제 표시된 카페는 이미 순위에 없음).
+    """
+    if instance.is_active:
+        schedule_district_refresh({instance.district_code})
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_district_ranking_on_feedback(sender, instance, **kwargs):
+    """
+    별점/리뷰가 바뀌면 해당 카페의 자치구 순위를 갱신 (트랜잭션 커밋 후, 자치구마다 일정 간격에 한 번만 재계산).
+    카페와 함께 지워지는 경우에는 카페 삭제 시그널이 처리한다.
+    """
+    cafe_id = instance.cafe_id
+
+    def apply():
+        schedule_district_refresh({Cafe.objects.filter(pk=cafe_id).values_list('district_code', flat=True).first()})
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Cafe)
+@receiver(post_delete, sender=Cafe)
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_cafe_detail_cache(sender, instance, **kwargs):
+    """
+    카페 정보, 별점, 리뷰가 바뀌면 이 프로세스에 캐시된 그 카페의 상세 정보를 버림 (트랜잭션 커밋 후).
+    """
+    cafe_id = instance.pk if sender is Cafe else instance.cafe_id
+    transaction.on_commit(lambda: invalidate_cafe_detail(cafe_id))
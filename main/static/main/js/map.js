@@ -98,29 +98,70 @@ document.addEventListener('DOMContentLoaded', () => {
     );
 });
 
+// "더 보기" 페이지네이션 상태
+const NEAREST_PAGE_SIZE = 5;
+const NEAREST_RADIUS_KM = 3;
+let nearestCursor = null;
+let nearestLoading = false;
+let nearestOrigin = null;
+let loadedCafes = [];
+
 async function fetchNearbyCafes(latitude, longitude) {
+    nearestOrigin = { latitude, longitude };
+    nearestCursor = null;
+    loadedCafes = [];
+    document.querySelector('.wp-search-result').innerHTML = ''; // 기존 데이터를 초기화
+
+    await fetchMoreCafes();
+}
+
+async function fetchMoreCafes() {
+    if (nearestLoading || !nearestOrigin) {
+        return;
+    }
+    nearestLoading = true;
     try {
-        const response = await fetch('/cafes/nearby/', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ latitude, longitude })
+        const params = new URLSearchParams({
+            latitude: nearestOrigin.latitude,
+            longitude: nearestOrigin.longitude,
+            radius: NEAREST_RADIUS_KM,
+            k: NEAREST_PAGE_SIZE
         });
+        if (nearestCursor) {
+            params.set('cursor', nearestCursor);
+        }
+
+        const response = await fetch(`/cafes/nearest/?${params.toString()}`);
 
         if (!response.ok) {
             throw new Error('API 요청 실패');
         }
 
-        const cafes = await response.json();
-        renderCafeList(cafes);
-        initializeMap(latitude, longitude, cafes); // 지도에 카페 마커 추가
+        const page = await response.json();
+        nearestCursor = page.next_cursor;
+        loadedCafes = loadedCafes.concat(page.results);
+        renderCafeList(page.results);
+        initializeMap(nearestOrigin.latitude, nearestOrigin.longitude); // 지도 마커는 화면 단위로 불러옴
     } catch (error) {
         console.error('카페 데이터를 가져오는 중 오류 발생:', error);
+    } finally {
+        nearestLoading = false;
     }
 }
 
+// 목록을 끝까지 스크롤하면 다음으로 가까운 카페를 이어서 불러옴
+document.addEventListener('DOMContentLoaded', () => {
+    const resultContainer = document.querySelector('.wp-search-result');
+    resultContainer.addEventListener('scroll', () => {
+        const nearBottom = resultContainer.scrollTop + resultContainer.clientHeight >= resultContainer.scrollHeight - 20;
+        if (nearBottom && nearestCursor) {
+            fetchMoreCafes();
+        }
+    });
+});
+
 function renderCafeList(cafes) {
     const resultContainer = document.querySelector('.wp-search-result');
-    resultContainer.innerHTML = ''; // 기존 데이터를 초기화
 
     cafes.forEach(cafe => {
         const cafeItem = document.createElement('div');
@@ -137,24 +178,118 @@ function renderCafeList(cafes) {
     });
 }
 
-function initializeMap(lat, lng, cafes = []) {
+// 지도는 한 번만 만들고, 옮기거나 확대/축소가 끝날 때마다 화면 안의 카페를 다시 불러옴
+// CLUSTER_MAX_ZOOM 이하에서는 서버가 묶어 준 클러스터를, 그보다 확대하면 카페 마커를 하나씩 보여줌
+const VIEWPORT_LIMIT = 200;
+const CLUSTER_MAX_ZOOM = 16;
+let cafeMap = null;
+let viewportMarkers = [];
+let viewportRequest = null;
+
+function initializeMap(lat, lng) {
+    if (cafeMap) {
+        return;
+    }
+
     const mapOptions = {
         center: new naver.maps.LatLng(lat, lng),
         zoom: 15
     };
 
-    const map = new naver.maps.Map('map', mapOptions);
+    cafeMap = new naver.maps.Map('map', mapOptions);
 
     new naver.maps.Marker({
         position: new naver.maps.LatLng(lat, lng),
-        map: map,
+        map: cafeMap,
         title: '현재 위치'
     });
 
-    cafes.forEach(cafe => {
+    naver.maps.Event.addListener(cafeMap, 'idle', fetchViewportCafes);
+    fetchViewportCafes();
+}
+
+async function fetchViewportCafes() {
+    const bounds = cafeMap.getBounds();
+    const zoom = cafeMap.getZoom();
+    const clustered = zoom <= CLUSTER_MAX_ZOOM;
+    const params = new URLSearchParams({
+        min_lat: bounds.getMin().y,
+        min_lon: bounds.getMin().x,
+        max_lat: bounds.getMax().y,
+        max_lon: bounds.getMax().x,
+        zoom: zoom
+    });
+    if (!clustered) {
+        params.set('limit', VIEWPORT_LIMIT);
+    }
+
+    // 이전 요청이 끝나기 전에 지도를 다시 옮기면 이전 요청은 취소
+    if (viewportRequest) {
+        viewportRequest.abort();
+    }
+    const request = viewportRequest = new AbortController();
+    try {
+        const url = clustered ? '/cafes/clusters/' : '/cafes/viewport/';
+        const response = await fetch(`${url}?${params.toString()}`, { signal: request.signal });
+        if (!response.ok) {
+            throw new Error('API 요청 실패');
+        }
+        const viewport = await response.json();
+        clearCafeMarkers();
+        if (clustered) {
+            renderClusterMarkers(viewport.clusters);
+        } else {
+            renderCafeMarkers(viewport.results);
+        }
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            console.error('지도 카페 데이터를 가져오는 중 오류 발생:', error);
+        }
+    } finally {
+        if (viewportRequest === request) {
+            viewportRequest = null;
+        }
+    }
+}
+
+function clearCafeMarkers() {
+    viewportMarkers.forEach(marker => marker.setMap(null));
+    viewportMarkers = [];
+}
+
+function renderClusterMarkers(clusters) {
+    clusters.forEach(cluster => {
+        const position = new naver.maps.LatLng(cluster.latitude, cluster.longitude);
+        if (cluster.count === 1) {
+            viewportMarkers.push(new naver.maps.Marker({ position: position, map: cafeMap }));
+            return;
+        }
+
+        const size = Math.min(60, 28 + Math.log2(cluster.count) * 4);
+        const marker = new naver.maps.Marker({
+            position: position,
+            map: cafeMap,
+            title: `카페 ${cluster.count}곳`,
+            icon: {
+                content: `<div class="cafe-cluster" style="width:${size}px;height:${size}px;line-height:${size}px;`
+                    + `border-radius:50%;text-align:center;color:#fff;background:rgba(60,120,220,0.8);">${cluster.count}</div>`,
+                anchor: new naver.maps.Point(size / 2, size / 2)
+            }
+        });
+
+        // 클러스터를 누르면 나뉘는 단계까지 확대
+        naver.maps.Event.addListener(marker, 'click', () => {
+            cafeMap.morph(position, cluster.expansion_zoom);
+        });
+        viewportMarkers.push(marker);
+    });
+}
+
+function renderCafeMarkers(cafes) {
+    viewportMarkers = cafes.map(cafe => {
         const marker = new naver.maps.Marker({
             position: new naver.maps.LatLng(cafe.latitude, cafe.longitude),
-            map: map,
+            map: cafeMap,
             title: cafe.name
         });
 
@@ -163,7 +298,8 @@ function initializeMap(lat, lng, cafes = []) {
         });
 
         naver.maps.Event.addListener(marker, 'click', () => {
-            infoWindow.open(map, marker);
+            infoWindow.open(cafeMap, marker);
         });
+        return marker;
     });
-}
\ No newline at end of file
+}
@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..services.cafe_autocomplete import reset_cafe_autocomplete
+from ..services.cafe_clusters import reset_cafe_clusters
+from ..services.cafe_detail import reset_cafe_detail_cache
+from ..services.cafe_index import reset_cafe_index
+from ..services.cafe_snapshot import reset_cafe_snapshot
+from ..services.cafe_text_search import reset_cafe_text_index
+from ..services.cafe_viewport import reset_viewport_scores
+
+
+def reset_cafe_structures():
+    """
+    공유 캐시(카페 버전 등)와 프로세스 내 카페 구조를 모두 비움.
+    테스트마다 DB가 되돌려지므로, 이전 테스트의 카페로 만든 인덱스가 남아 있지 않게 한다.
+    """
+    cache.clear()
+    reset_cafe_index()
+    reset_cafe_snapshot()
+    reset_cafe_clusters()
+    reset_cafe_text_index()
+    reset_cafe_autocomplete()
+    reset_cafe_detail_cache()
+    reset_viewport_scores()
+
+
+class CafeTestCase(TestCase):
+    """
+    테스트마다 카페 구조를 비우고 시작하는 TestCase.
+    """
+
+    def setUp(self):
+        super().setUp()
+        reset_cafe_structures()
+        self.addCleanup(reset_cafe_structures)
@@ -0,0 +1,130 @@
+import struct
+import zlib
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient
+
+from ..models.cafe import Cafe
+from ..services.cafe_bundle import (
+    BUNDLE_HEADER, NO_MINUTE, decode_cafe_bundle, encode_cafe_bundle,
+)
+from .base import CafeTestCase
+
+ROWS = [
+    # (id, name, address, isConcentrate, latitude, longitude, opening_minute, closing_minute)
+    (1, "스타벅스", "서울특별시 마포구 양화로 1", True, 37.5495123, 126.9139456, 9 * 60, 22 * 60),
+    (2, "스타벅스", "서울특별시 강남구 테헤란로 1", False, 37.4979, 127.0276, 22 * 60, 2 * 60),
+    (3, "주소 없는 카페", None, False, -33.8688, 151.2093, None, None),
+    (2 ** 40, "스타벅스", "서울특별시 마포구 양화로 1", True, 37.0, 127.0, 0, 24 * 60),
+]
+
+
+def _cafe(row):
+    keys = ("id", "name", "address", "isConcentrate", "latitude", "longitude", "opening_minute", "closing_minute")
+    return dict(zip(keys, row))
+
+
+def _with_header(data, **fields):
+    """
+    헤더의 일부 값만 바꾼 번들 (본문과 CRC는 그대로).
+    """
+    names = ("magic", "bundle_format", "reserved", "version", "count", "string_count", "body_size", "crc")
+    header = dict(zip(names, BUNDLE_HEADER.unpack_from(data)))
+    header.update(fields)
+    return BUNDLE_HEADER.pack(*header.values()) + data[BUNDLE_HEADER.size:]
+
+
+class CafeBundleCodecTest(SimpleTestCase):
+    """
+    encode_cafe_bundle / decode_cafe_bundle 왕복과 손상된 번들 검출.
+    """
+
+    def test_round_trip(self):
+        version, cafes = decode_cafe_bundle(encode_cafe_bundle(ROWS, 42))
+        self.assertEqual(version, 42)
+        self.assertEqual(len(cafes), len(ROWS))
+        for cafe, row in zip(cafes, ROWS):
+            expected = _cafe(row)
+            # 좌표는 1e-7도 단위로 저장
+            self.assertAlmostEqual(cafe.pop("latitude"), expected.pop("latitude"), places=7)
+            self.assertAlmostEqual(cafe.pop("longitude"), expected.pop("longitude"), places=7)
+            self.assertEqual(cafe, expected)
+
+    def test_none_values_and_no_minute_sentinel(self):
+        _, (cafe,) = decode_cafe_bundle(encode_cafe_bundle([ROWS[2]], 1))
+        self.assertIsNone(cafe["address"])
+        self.assertIsNone(cafe["opening_minute"])
+        self.assertIsNone(cafe["closing_minute"])
+
+        # 본문에는 NO_MINUTE 값으로 들어 있음
+        body = zlib.decompress(encode_cafe_bundle([ROWS[2]], 1)[BUNDLE_HEADER.size:])
+        minutes = struct.unpack_from("<HH", body, struct.calcsize("<qii"))
+        self.assertEqual(minutes, (NO_MINUTE, NO_MINUTE))
+
+    def test_strings_are_deduplicated(self):
+        data = encode_cafe_bundle(ROWS, 1)
+        string_count = BUNDLE_HEADER.unpack_from(data)[5]
+        # "스타벅스" 1개 + 주소 2개 + "주소 없는 카페" 1개 (None 주소는 문자열로 저장하지 않음)
+        self.assertEqual(string_count, 4)
+        body = zlib.decompress(data[BUNDLE_HEADER.size:])
+        self.assertEqual(body.count("스타벅스".encode("utf-8")), 1)
+
+    def test_empty(self):
+        self.assertEqual(decode_cafe_bundle(encode_cafe_bundle([], 7)), (7, []))
+
+    def test_truncated(self):
+        data = encode_cafe_bundle(ROWS, 1)
+        for size in (0, BUNDLE_HEADER.size - 1, BUNDLE_HEADER.size, len(data) - 1, len(data) // 2):
+            with self.subTest(size=size), self.assertRaises(ValueError):
+                decode_cafe_bundle(data[:size])
+
+    def test_corrupted_compressed_body(self):
+        data = bytearray(encode_cafe_bundle(ROWS, 1))
+        data[BUNDLE_HEADER.size + 10] ^= 0xFF
+        with self.assertRaises(ValueError):
+            decode_cafe_bundle(bytes(data))
+
+    def test_crc_and_length_checks(self):
+        data = encode_cafe_bundle(ROWS, 1)
+        _, _, _, _, count, string_count, body_size, crc = BUNDLE_HEADER.unpack_from(data)
+        bad_headers = {
+            "crc": {"crc": crc ^ 1},
+            "body_size": {"body_size": body_size + 1},
+            "count": {"count": count + 1000},
+            "string_count": {"string_count": string_count + 1},
+            "magic": {"magic": b"NOTABNDL"},
+            "format": {"bundle_format": 99},
+        }
+        for name, fields in bad_headers.items():
+            with self.subTest(field=name), self.assertRaises(ValueError):
+                decode_cafe_bundle(_with_header(data, **fields))
+
+    def test_body_with_valid_crc_but_wrong_layout(self):
+        # CRC가 맞더라도 문자열 오프셋이 본문과 맞지 않으면 거부
+        data = encode_cafe_bundle(ROWS, 1)
+        body = zlib.decompress(data[BUNDLE_HEADER.size:]) + b"extra"
+        header = BUNDLE_HEADER.unpack_from(data)
+        forged = BUNDLE_HEADER.pack(*header[:6], len(body), zlib.crc32(body)) + zlib.compress(body)
+        with self.assertRaises(ValueError):
+            decode_cafe_bundle(forged)
+
+
+class CafeBundleViewTest(CafeTestCase):
+    """
+    /cafes/bundle/ 응답과 ETag.
+    """
+
+    def test_bundle_and_etag(self):
+        Cafe.objects.create(name="카페", address="서울특별시 마포구 양화로 1", latitude=37.55, longitude=126.92,
+                            opening_hours="09:00 - 18:00")
+        Cafe.objects.create(name="닫은 카페", latitude=37.56, longitude=126.93, is_active=False)
+        client = APIClient()
+
+        response = client.get("/cafes/bundle/")
+        self.assertEqual(response.status_code, 200)
+        version, cafes = decode_cafe_bundle(response.content)
+        self.assertEqual(response["ETag"], f'"cafes-{version}"')
+        self.assertEqual([(cafe["name"], cafe["opening_minute"]) for cafe in cafes], [("카페", 9 * 60)])
+
+        response = client.get("/cafes/bundle/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
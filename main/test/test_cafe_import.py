@@ -0,0 +1,139 @@
+import io
+
+from ..models.cafe import Cafe
+from ..models.cafe_change import CafeChange
+from ..services.cafe_changes import cafe_content_hash
+from ..services.cafe_import import derive_external_id, import_cafes, iter_json_array
+from .base import CafeTestCase
+
+
+def _record(i, **fields):
+    return {
+        "id": f"ext-{i}",
+        "name": f"카페 {i}",
+        "address": "서울특별시 마포구 양화로 1",
+        "opening_hours": "09:00 - 21:00",
+        "latitude": 37.55 + i * 0.001,
+        "longitude": 126.92,
+        **fields,
+    }
+
+
+class CafeImportCountTest(CafeTestCase):
+    """
+    import_cafes의 inserted/updated/unchanged/skipped 집계와 저장 결과.
+    """
+
+    def test_counts_across_runs(self):
+        records = [_record(i) for i in range(5)]
+        counts = import_cafes(records, batch_size=2)  # 배치 경계를 넘어가도록
+        self.assertEqual(counts, {"inserted": 5, "updated": 0, "unchanged": 0, "deleted": 0, "skipped": 0})
+        self.assertEqual(Cafe.objects.count(), 5)
+
+        # 같은 데이터를 다시 넣으면 아무것도 쓰지 않음
+        counts = import_cafes(records, batch_size=2)
+        self.assertEqual(counts, {"inserted": 0, "updated": 0, "unchanged": 5, "deleted": 0, "skipped": 0})
+
+        records[1] = _record(1, name="이름 바뀐 카페")
+        records[3] = _record(3, opening_hours="10:00 - 22:00")
+        records.append(_record(5))
+        counts = import_cafes(records, batch_size=2)
+        self.assertEqual(counts, {"inserted": 1, "updated": 2, "unchanged": 3, "deleted": 0, "skipped": 0})
+        self.assertEqual(Cafe.objects.count(), 6)
+        self.assertEqual(Cafe.objects.get(external_id="ext-1").name, "이름 바뀐 카페")
+
+    def test_derived_fields_and_slug(self):
+        import_cafes([_record(0)])
+        cafe = Cafe.objects.get(external_id="ext-0")
+        self.assertEqual((cafe.opening_minute, cafe.closing_minute), (9 * 60, 21 * 60))
+        self.assertEqual(cafe.district_code, "11440")
+        slug = cafe.slug
+
+        # 기존 카페는 이름이 바뀌어도 slug를 유지하고, 바뀐 주소로 자치구를 다시 계산
+        import_cafes([_record(0, name="새 이름", address="서울특별시 강남구 테헤란로 1", opening_hours="22:00 - 02:00")])
+        cafe.refresh_from_db()
+        self.assertEqual(cafe.slug, slug)
+        self.assertEqual(cafe.district_code, "11680")
+        self.assertEqual((cafe.opening_minute, cafe.closing_minute), (22 * 60, 2 * 60))
+
+    def test_skipped_records(self):
+        counts = import_cafes([
+            _record(0),
+            {"name": "좌표 없음"},
+            {"name": "", "latitude": 37.5, "longitude": 127.0},
+            "not a record",
+            _record(1),
+            _record(1, name="같은 키의 마지막 레코드"),
+        ])
+        self.assertEqual(counts["inserted"], 2)
+        self.assertEqual(counts["skipped"], 4)
+        self.assertEqual(Cafe.objects.get(external_id="ext-1").name, "같은 키의 마지막 레코드")
+
+    def test_records_without_id_use_name_and_address(self):
+        record = {"name": "스타벅스", "address": "서울특별시 마포구 양화로 1", "latitude": 37.55, "longitude": 126.92}
+        other_branch = dict(record, address="서울특별시 강남구 테헤란로 1")
+        self.assertEqual(import_cafes([record, other_branch])["inserted"], 2)
+        self.assertEqual(import_cafes([record, other_branch])["unchanged"], 2)
+        self.assertTrue(Cafe.objects.filter(external_id=derive_external_id("스타벅스", "서울특별시 마포구 양화로 1")).exists())
+
+    def test_streaming_json_array(self):
+        text = '[{"a": 1},\n {"b": "긴 문자열 ' + "x" * 50 + '"} , {"c": [1, 2]}]'
+        items = list(iter_json_array(io.StringIO(text), chunk_size=7))
+        self.assertEqual(items, [{"a": 1}, {"b": "긴 문자열 " + "x" * 50}, {"c": [1, 2]}])
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"a": 1}')))
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('[{"a": 1},')))
+
+
+class CafeImportChangeLogTest(CafeTestCase):
+    """
+    내용 해시 비교로 바뀐 카페만 쓰고, 변경 기록(CafeChange)과 삭제 표시(sync=True)를 남기는지.
+    """
+
+    def _actions(self):
+        return list(CafeChange.objects.order_by("id").values_list("external_id", "action"))
+
+    def test_change_log_only_for_real_changes(self):
+        records = [_record(i) for i in range(3)]
+        import_cafes(records)
+        self.assertEqual(self._actions(), [("ext-0", "created"), ("ext-1", "created"), ("ext-2", "created")])
+        for cafe in Cafe.objects.all():
+            self.assertEqual(cafe.content_hash, cafe_content_hash(cafe))
+
+        import_cafes(records)
+        self.assertEqual(CafeChange.objects.count(), 3)  # 그대로인 데이터는 기록을 남기지 않음
+
+        records[2] = _record(2, latitude=37.6)
+        import_cafes(records)
+        self.assertEqual(self._actions()[3:], [("ext-2", "updated")])
+
+    def test_sync_tombstones_missing_cafes(self):
+        import_cafes([_record(i) for i in range(4)], sync=True)
+        manual = Cafe.objects.create(name="직접 등록", latitude=37.5, longitude=127.0)  # 외부 키가 없는 카페
+
+        counts = import_cafes([_record(0), _record(2)], sync=True, batch_size=1)
+        self.assertEqual(counts, {"inserted": 0, "updated": 0, "unchanged": 2, "deleted": 2, "skipped": 0})
+        self.assertEqual(
+            set(Cafe.objects.filter(is_active=False).values_list("external_id", flat=True)), {"ext-1", "ext-3"})
+        self.assertTrue(Cafe.objects.get(pk=manual.pk).is_active)
+        self.assertEqual(sorted(self._actions()[-2:]), [("ext-1", "deleted"), ("ext-3", "deleted")])
+
+        # 삭제 표시된 카페가 다시 들어오면 내용이 같아도 되살림
+        counts = import_cafes([_record(0), _record(1), _record(2)], sync=True)
+        self.assertEqual(counts, {"inserted": 0, "updated": 1, "unchanged": 2, "deleted": 0, "skipped": 0})
+        self.assertTrue(Cafe.objects.get(external_id="ext-1").is_active)
+        self.assertEqual(self._actions()[-1], ("ext-1", "updated"))
+
+    def test_without_sync_missing_cafes_stay(self):
+        import_cafes([_record(i) for i in range(2)])
+        self.assertEqual(import_cafes([_record(0)])["deleted"], 0)
+        self.assertEqual(Cafe.objects.filter(is_active=True).count(), 2)
+
+    def test_merged_cafes_are_not_revived(self):
+        import_cafes([_record(0), _record(1)])
+        kept, merged = Cafe.objects.get(external_id="ext-0"), Cafe.objects.get(external_id="ext-1")
+        Cafe.objects.filter(pk=merged.pk).update(is_active=False, merged_into=kept)
+        counts = import_cafes([_record(0), _record(1, name="바뀐 이름")])
+        self.assertEqual(counts["skipped"], 1)
+        self.assertFalse(Cafe.objects.get(pk=merged.pk).is_active)
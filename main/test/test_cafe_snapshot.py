@@ -0,0 +1,52 @@
+import random
+
+from django.test import SimpleTestCase
+
+from ..services.cafe_snapshot import CafeSnapshot
+from ..services.geo import haversine_km
+from ..services.opening_hours import window_mask
+
+
+def _brute_force(rows, latitude, longitude, radius_km):
+    hits = [(haversine_km(latitude, longitude, lat, lon), cafe_id) for cafe_id, lat, lon, *_ in rows]
+    return sorted(hit for hit in hits if hit[0] <= radius_km)
+
+
+class CafeSnapshotNearestTest(SimpleTestCase):
+    """
+    CafeSnapshot.nearest(위도 띠 + 일괄 거리 계산 + 부분 선택)가 전체 거리를 정렬한 결과와 같아야 한다.
+    """
+
+    def test_matches_brute_force(self):
+        generator = random.Random(7)
+        rows = [
+            (i, 37.45 + generator.random() * 0.2, 126.85 + generator.random() * 0.3, 9 * 60, 22 * 60, False)
+            for i in range(1, 2001)
+        ]
+        snapshot = CafeSnapshot.from_rows(rows)
+        for _ in range(20):
+            latitude, longitude = 37.45 + generator.random() * 0.2, 126.85 + generator.random() * 0.3
+            radius_km = generator.choice([0.3, 1.0, 5.0])
+            expected = _brute_force(rows, latitude, longitude, radius_km)
+            hits = snapshot.nearest(latitude, longitude, radius_km, 10)
+            self.assertEqual([cafe_id for _, cafe_id in hits], [cafe_id for _, cafe_id in expected[:10]])
+            for (distance, _), (expected_distance, _) in zip(hits, expected):
+                self.assertAlmostEqual(distance, expected_distance, places=9)
+            if len(hits) == 10:
+                # 커서 뒤로 이어 받으면 처음부터 받은 결과와 이어진다
+                self.assertEqual(snapshot.nearest(latitude, longitude, radius_km, 2, after=hits[7]), hits[8:10])
+
+    def test_across_date_line_and_near_pole(self):
+        rows = [(1, 0.0, 179.999, None, None, False), (2, 0.0, -179.999, None, None, False),
+                (3, 0.0, 179.0, None, None, False), (4, 89.9999, 0.0, None, None, False),
+                (5, 89.9999, 180.0, None, None, False)]
+        snapshot = CafeSnapshot.from_rows(rows)
+        self.assertEqual({cafe_id for _, cafe_id in snapshot.nearest(0.0, 180.0, 1.0, 10)}, {1, 2})
+        self.assertEqual({cafe_id for _, cafe_id in snapshot.nearest(89.9995, 0.0, 1.0, 10)}, {4, 5})
+
+    def test_open_mask(self):
+        rows = [(1, 37.55, 126.92, 9 * 60, 18 * 60, False), (2, 37.551, 126.92, 9 * 60, 23 * 60, False),
+                (3, 37.549, 126.92, None, None, False)]
+        snapshot = CafeSnapshot.from_rows(rows)
+        hits = snapshot.nearest(37.55, 126.92, 1.0, 10, open_mask=window_mask(19 * 60, 20 * 60))
+        self.assertEqual([cafe_id for _, cafe_id in hits], [2])
@@ -0,0 +1,91 @@
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from ..models.cafe import Cafe
+from ..models.cafe_change import CafeChange
+from ..services.cafe_changes import latest_change_version
+from ..services.cafe_import import import_cafes
+from ..services.cafe_sync import cafe_delta
+from .base import CafeTestCase
+
+
+def _record(i, **fields):
+    return {"id": f"ext-{i}", "name": f"카페 {i}", "address": "서울특별시 마포구 양화로 1",
+            "latitude": 37.55, "longitude": 126.92 + i * 0.001, **fields}
+
+
+class CafeDeltaSyncTest(CafeTestCase):
+    """
+    since 버전 이후의 변경분만 내려주고, 따라잡을 수 없으면 전체 데이터로 대체하는지.
+    """
+
+    def setUp(self):
+        super().setUp()
+        import_cafes([_record(i) for i in range(4)])
+        self.ids = dict(Cafe.objects.values_list("external_id", "id"))
+        self.version = latest_change_version()
+
+    def test_no_changes(self):
+        delta = cafe_delta(self.version)
+        self.assertEqual(delta, {"version": self.version, "full": False, "cafes": [], "removed": []})
+
+    def test_delta_since_version(self):
+        import_cafes([_record(1, name="새 이름"), _record(4)])
+        cafe = Cafe.objects.get(pk=self.ids["ext-2"])
+        cafe.is_active = False  # 삭제 표시
+        cafe.save()
+        Cafe.objects.get(pk=self.ids["ext-3"]).delete()
+
+        delta = cafe_delta(self.version)
+        self.assertFalse(delta["full"])
+        self.assertEqual(delta["version"], latest_change_version())
+        self.assertEqual({cafe["external_id"]: cafe["name"] for cafe in delta["cafes"]},
+                         {"ext-1": "새 이름", "ext-4": "카페 4"})
+        self.assertEqual(delta["removed"], sorted([self.ids["ext-2"], self.ids["ext-3"]]))
+
+        # 받은 버전 이후로는 변경이 없음
+        self.assertEqual(cafe_delta(delta["version"])["cafes"], [])
+
+    def test_changed_twice_is_sent_once(self):
+        import_cafes([_record(0, name="첫 변경")])
+        import_cafes([_record(0, name="두 번째 변경")])
+        delta = cafe_delta(self.version)
+        self.assertEqual([cafe["name"] for cafe in delta["cafes"]], ["두 번째 변경"])
+
+    def test_added_then_removed_is_removed(self):
+        import_cafes([_record(9)])
+        Cafe.objects.get(external_id="ext-9").delete()
+        delta = cafe_delta(self.version)
+        self.assertEqual(delta["cafes"], [])
+        self.assertEqual(len(delta["removed"]), 1)
+
+    def test_full_snapshot_fallbacks(self):
+        self.assertTrue(cafe_delta(None)["full"])
+        self.assertTrue(cafe_delta(self.version + 100)["full"])  # 서버보다 앞선 버전
+
+        # 오래된 기록을 지웠다면 그 이전 버전은 따라잡을 수 없음
+        import_cafes([_record(0, name="변경")])
+        CafeChange.objects.filter(id__lte=self.version).delete()
+        delta = cafe_delta(self.version - 1)
+        self.assertTrue(delta["full"])
+        self.assertEqual(len(delta["cafes"]), 4)
+        self.assertFalse(cafe_delta(self.version)["full"])
+
+        with override_settings(CAFE_SYNC_MAX_DELTA=1):
+            import_cafes([_record(1, name="변경"), _record(2, name="변경")])
+            self.assertTrue(cafe_delta(self.version)["full"])
+
+    def test_api(self):
+        client = APIClient()
+        response = client.get("/cafes/sync/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["full"])
+        self.assertEqual(len(response.data["cafes"]), 4)
+
+        import_cafes([_record(5)])
+        response = client.get("/cafes/sync/", {"since": response.data["version"]})
+        self.assertFalse(response.data["full"])
+        self.assertEqual([cafe["external_id"] for cafe in response.data["cafes"]], ["ext-5"])
+
+        self.assertEqual(client.get("/cafes/sync/", {"since": "x"}).status_code, 400)
+        self.assertEqual(client.get("/cafes/sync/", {"since": -1}).status_code, 400)
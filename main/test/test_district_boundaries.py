@@ -0,0 +1,146 @@
+import json
+import os
+import random
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from ..models.cafe import Cafe
+from ..services.district_boundaries import (
+    DistrictBoundaryIndex, classify_district, get_district_boundaries, point_in_rings,
+)
+from .base import CafeTestCase
+
+MAPO, SEODAEMUN, GANGNAM = "11440", "11410", "11680"
+
+
+def _square(min_lon, min_lat, max_lon, max_lat):
+    return [(min_lon, min_lat), (max_lon, min_lat), (max_lon, max_lat), (min_lon, max_lat), (min_lon, min_lat)]
+
+
+def _write_boundaries(test, features):
+    """
+    GeoJSON FeatureCollection을 임시 파일로 저장하고 경로를 반환.
+    """
+    handle, path = tempfile.mkstemp(suffix=".geojson")
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        json.dump({"type": "FeatureCollection", "features": features}, file, ensure_ascii=False)
+    test.addCleanup(os.remove, path)
+    return path
+
+
+# 경도 126.90~126.95를 위도 37.55 기준으로 나눈 가상의 두 구 (마포구는 구멍 포함) + 떨어진 두 조각으로 된 강남구
+FEATURES = [
+    {"type": "Feature", "properties": {"SIG_KOR_NM": "마포구"},
+     "geometry": {"type": "Polygon", "coordinates": [_square(126.90, 37.50, 126.95, 37.55),
+                                                     _square(126.92, 37.52, 126.93, 37.53)]}},
+    {"type": "Feature", "properties": {"SIG_CD": "11410"},
+     "geometry": {"type": "Polygon", "coordinates": [_square(126.90, 37.55, 126.95, 37.60)]}},
+    {"type": "Feature", "properties": {"name": "서울특별시 강남구"},
+     "geometry": {"type": "MultiPolygon", "coordinates": [[_square(127.00, 37.48, 127.05, 37.52)],
+                                                          [_square(127.10, 37.48, 127.12, 37.50)]]}},
+    {"type": "Feature", "properties": {"name": "성남시 분당구"},  # 서울 밖: 건너뜀
+     "geometry": {"type": "Polygon", "coordinates": [_square(127.10, 37.35, 127.15, 37.40)]}},
+]
+
+
+class DistrictBoundaryIndexTest(SimpleTestCase):
+    """
+    R-tree 후보 검색 + 짝홀 규칙 포함 판정.
+    """
+
+    def test_point_in_rings_with_hole(self):
+        rings = [_square(0, 0, 10, 10), _square(4, 4, 6, 6)]
+        self.assertTrue(point_in_rings(1, 1, rings))
+        self.assertFalse(point_in_rings(5, 5, rings))  # 구멍 안
+        self.assertFalse(point_in_rings(11, 5, rings))
+
+    def test_matches_brute_force(self):
+        # 10 x 10 격자의 삼각형 다각형 200개: 사각형이 겹쳐도 정확한 판정 결과는 전수 검사와 같아야 함
+        polygons = []
+        for i in range(10):
+            for j in range(10):
+                polygons.append((f"{i}-{j}-a", [[(i, j), (i + 1, j), (i, j + 1)]]))
+                polygons.append((f"{i}-{j}-b", [[(i + 1, j), (i + 1, j + 1), (i, j + 1)]]))
+        index = DistrictBoundaryIndex(polygons)
+        self.assertEqual(index.size, 200)
+        rng = random.Random(7)
+        for _ in range(500):
+            x, y = rng.uniform(-1, 11), rng.uniform(-1, 11)
+            expected = next((code for code, rings in polygons if point_in_rings(x, y, rings)), None)
+            self.assertEqual(index.locate(y, x), expected)
+
+    def test_empty(self):
+        self.assertIsNone(DistrictBoundaryIndex([]).locate(37.5, 127.0))
+
+
+class DistrictClassifierTest(SimpleTestCase):
+    """
+    settings.DISTRICT_BOUNDARIES_PATH 파일로 좌표를 분류하고, 없거나 서울 밖이면 주소로 분류하는지.
+    """
+
+    def test_classify_with_boundaries(self):
+        with override_settings(DISTRICT_BOUNDARIES_PATH=_write_boundaries(self, FEATURES)):
+            self.assertEqual(get_district_boundaries().size, 4)
+            self.assertEqual(classify_district(37.51, 126.91), MAPO)
+            self.assertEqual(classify_district(37.58, 126.91), SEODAEMUN)
+            self.assertEqual(classify_district(37.49, 127.11), GANGNAM)  # MultiPolygon의 두 번째 조각
+            # 좌표가 주소보다 우선
+            self.assertEqual(classify_district(37.58, 126.91, "서울특별시 강남구 테헤란로 1"), SEODAEMUN)
+            # 구멍 안이나 경계 밖이면 주소로
+            self.assertEqual(classify_district(37.525, 126.925, "서울 강남구 역삼로 1"), GANGNAM)
+            self.assertIsNone(classify_district(37.375, 127.12, "경기도 성남시 분당구 1"))
+            self.assertIsNone(classify_district(None, None))
+
+    def test_missing_or_broken_file_falls_back_to_address(self):
+        with override_settings(DISTRICT_BOUNDARIES_PATH="/nonexistent/seoul.geojson"):
+            self.assertIsNone(get_district_boundaries())
+            self.assertEqual(classify_district(37.51, 126.91, "서울특별시 마포구 양화로 1"), MAPO)
+
+        handle, path = tempfile.mkstemp(suffix=".geojson")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        with override_settings(DISTRICT_BOUNDARIES_PATH=path), \
+                self.assertLogs("main.services.district_boundaries", "ERROR"):
+            self.assertIsNone(get_district_boundaries())
+
+
+class CafeDistrictAssignmentTest(CafeTestCase):
+    """
+    Cafe.save와 assign_districts 명령이 경계 데이터로 자치구를 정하는지.
+    """
+
+    def setUp(self):
+        super().setUp()
+        settings = override_settings(DISTRICT_BOUNDARIES_PATH=_write_boundaries(self, FEATURES))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_save_uses_coordinates(self):
+        # 주소는 강남구지만 좌표는 마포구
+        cafe = Cafe.objects.create(name="카페", address="서울특별시 강남구 테헤란로 1", latitude=37.51, longitude=126.91)
+        self.assertEqual(cafe.district_code, MAPO)
+
+        cafe.latitude = 37.58
+        cafe.save(update_fields=["latitude"])
+        self.assertEqual(Cafe.objects.get(pk=cafe.pk).district_code, SEODAEMUN)
+
+        cafe.latitude, cafe.longitude = 36.0, 128.0  # 경계 밖: 주소로
+        cafe.save(update_fields=["latitude", "longitude"])
+        self.assertEqual(Cafe.objects.get(pk=cafe.pk).district_code, GANGNAM)
+
+    def test_assign_districts_command(self):
+        with override_settings(DISTRICT_BOUNDARIES_PATH="/nonexistent/seoul.geojson"):
+            address_only = Cafe.objects.create(name="주소만", address="서울특별시 강남구 테헤란로 1",
+                                               latitude=37.51, longitude=126.91)
+            unchanged = Cafe.objects.create(name="그대로", address="서울특별시 마포구 양화로 1",
+                                            latitude=37.51, longitude=126.92)
+        self.assertEqual(address_only.district_code, GANGNAM)
+
+        output = mock.MagicMock()
+        call_command("assign_districts", stdout=output)
+        self.assertEqual(Cafe.objects.get(pk=address_only.pk).district_code, MAPO)
+        self.assertEqual(Cafe.objects.get(pk=unchanged.pk).district_code, MAPO)
+        self.assertIn("1 cafes", output.write.call_args[0][0])
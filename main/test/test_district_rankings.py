@@ -0,0 +1,90 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+
+from .. import signals
+from ..models.cafe import Cafe
+from ..models.ranking import DistrictCafeRanking, DistrictRankingState
+from ..services.district_rankings import district_leaderboard
+from ..services.ratings import rate_cafe
+from .base import CafeTestCase
+
+MAPO, GANGNAM = "11440", "11680"
+
+
+@override_settings(DISTRICT_RANKING_REFRESH_INTERVAL=60)
+class DistrictRankingRefreshTest(CafeTestCase):
+    """
+    별점/리뷰/카페 변경 후 자치구 순위 갱신: 커밋 직후 간격에 맞춰 재계산하고, 조회는 저장된 순위만 읽는다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cafe = Cafe.objects.create(name="카페", address="서울특별시 마포구 양화로 1", latitude=37.55, longitude=126.92)
+        self.other = Cafe.objects.create(name="옆 카페", address="서울특별시 마포구 양화로 2",
+                                         latitude=37.551, longitude=126.92)
+        self.users = [get_user_model().objects.create_user(username=f"user{i}") for i in range(3)]
+
+    def _rate(self, user, cafe, value):
+        with self.captureOnCommitCallbacks(execute=True):
+            rate_cafe(user, cafe, value)
+
+    def _ranked_names(self):
+        return [ranking.cafe.name for ranking in district_leaderboard(MAPO)]
+
+    def test_first_change_refreshes_after_commit(self):
+        self._rate(self.users[0], self.other, 5)
+        self.assertEqual(self._ranked_names(), ["옆 카페", "카페"])
+        state = DistrictRankingState.objects.get(district_code=MAPO)
+        self.assertFalse(state.dirty)
+        self.assertIsNotNone(state.refreshed_at)
+
+    def test_changes_within_interval_wait_and_reads_do_not_refresh(self):
+        self._rate(self.users[0], self.other, 5)
+        for user in self.users:
+            self._rate(user, self.cafe, 5)  # 간격 안의 변경: 표시만 남김
+        self.assertTrue(DistrictRankingState.objects.get(district_code=MAPO).dirty)
+
+        # 조회는 재계산하지 않고 저장된 순위 한 번의 쿼리로 끝남
+        with self.assertNumQueries(1):
+            self.assertEqual(self._ranked_names(), ["옆 카페", "카페"])
+
+        # 주기 실행 명령이 쌓인 변경을 반영
+        call_command("refresh_district_rankings", "--dirty", stdout=mock.MagicMock())
+        self.assertEqual(self._ranked_names(), ["카페", "옆 카페"])
+        self.assertFalse(DistrictRankingState.objects.get(district_code=MAPO).dirty)
+
+    def test_change_after_interval_refreshes(self):
+        self._rate(self.users[0], self.other, 5)
+        DistrictRankingState.objects.filter(district_code=MAPO).update(
+            refreshed_at=DistrictRankingState.objects.get(district_code=MAPO).refreshed_at - timedelta(seconds=61))
+        for user in self.users:
+            self._rate(user, self.cafe, 5)
+        self.assertEqual(self._ranked_names(), ["카페", "옆 카페"])
+
+    def test_cafe_save_schedules_only_ranking_changes(self):
+        with mock.patch.object(signals, "schedule_district_refresh") as schedule:
+            self.cafe.name = "새 이름"
+            self.cafe.opening_hours = "09:00 - 18:00"
+            self.cafe.save()
+            schedule.assert_not_called()
+
+            self.cafe.isConcentrate = True
+            self.cafe.save()
+            schedule.assert_called_once_with({MAPO, MAPO})
+
+            schedule.reset_mock()
+            self.cafe.address = "서울특별시 강남구 테헤란로 1"
+            self.cafe.save()
+            schedule.assert_called_once_with({GANGNAM, MAPO})
+
+    def test_moved_cafe_leaves_old_district(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cafe.address = "서울특별시 강남구 테헤란로 1"
+            self.cafe.save()
+        self.assertEqual(self._ranked_names(), ["옆 카페"])
+        self.assertEqual(list(DistrictCafeRanking.objects.filter(district_code=GANGNAM, kind="all")
+                              .values_list("cafe__name", flat=True)), ["카페"])
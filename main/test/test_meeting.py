@@ -0,0 +1,84 @@
+import random
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from ..models.cafe import Cafe
+from ..services import meeting
+from ..services.geo import haversine_km
+from ..services.meeting import rank_meeting_cafes
+from .base import CafeTestCase
+
+CENTER = (37.55, 126.98)
+
+
+def _brute_force(participants, cafes, objective, fairness_weight, limit):
+    scored = []
+    for cafe in cafes:
+        distances = [haversine_km(lat, lon, cafe.latitude, cafe.longitude) for lat, lon in participants]
+        scored.append((meeting._score(distances, objective, fairness_weight), cafe.id))
+    return sorted(scored)[:limit]
+
+
+class MeetingCafeTest(CafeTestCase):
+    """
+    rank_meeting_cafes가 후보를 반경으로 추려도 전체 카페에 대해 계산한 순위와 같아야 한다.
+    """
+
+    def _create(self, points):
+        Cafe.objects.bulk_create(Cafe(name=f"카페 {i}", latitude=lat, longitude=lon) for i, (lat, lon) in enumerate(points))
+        return list(Cafe.objects.all())
+
+    def _assert_matches_brute_force(self, participants, cafes, limit=5):
+        for objective in meeting.OBJECTIVES:
+            with self.subTest(objective=objective):
+                ranked, truncated = rank_meeting_cafes(participants, objective=objective, fairness_weight=0.7, limit=limit)
+                expected = _brute_force(participants, cafes, objective, 0.7, limit)
+                self.assertFalse(truncated)
+                self.assertEqual([cafe.id for _, cafe, _ in ranked], [cafe_id for _, cafe_id in expected])
+                for (score, _, distances), (expected_score, _) in zip(ranked, expected):
+                    self.assertAlmostEqual(score, expected_score, places=6)
+                    self.assertEqual(len(distances), len(participants))
+
+    def test_matches_brute_force(self):
+        generator = random.Random(11)
+        cafes = self._create(
+            (CENTER[0] + generator.uniform(-0.5, 0.5), CENTER[1] + generator.uniform(-0.6, 0.6)) for _ in range(400))
+        for _ in range(5):
+            participants = [(CENTER[0] + generator.uniform(-0.15, 0.15), CENTER[1] + generator.uniform(-0.2, 0.2))
+                            for _ in range(generator.randint(2, 8))]
+            self._assert_matches_brute_force(participants, cafes)
+
+    def test_best_cafe_outside_participant_circle(self):
+        # 참가자를 감싸는 원 안에는 한쪽으로 치우친 카페뿐이고, 원 밖의 카페가 최대 거리 기준으로 더 낫다
+        participants = [(37.40, 126.98), (37.70, 126.98), (37.55, 127.10)]
+        cafes = self._create([(37.40, 126.985), (37.70, 126.985), (37.55, 127.25), (37.55, 126.70)])
+        self._assert_matches_brute_force(participants, cafes, limit=2)
+
+    def test_truncated_when_too_far_apart(self):
+        participants = [(37.55, 126.98), (35.10, 129.04)]  # 서울과 부산: 후보 반경 상한보다 멀리 흩어짐
+        self._create([(37.55, 126.99), (35.10, 129.05)])
+        ranked, truncated = rank_meeting_cafes(participants, objective="max", limit=1)
+        self.assertEqual(ranked, [])
+        self.assertTrue(truncated)
+
+    def test_few_cafes_are_not_truncated(self):
+        self._create([(37.55, 126.99)])
+        ranked, truncated = rank_meeting_cafes([(37.54, 126.98), (37.56, 127.0)], limit=5)
+        self.assertEqual(len(ranked), 1)
+        self.assertFalse(truncated)
+
+    def test_api(self):
+        self._create([(37.55, 126.99), (37.60, 127.05)])
+        Cafe.objects.create(name="닫은 카페", latitude=37.55, longitude=126.98, is_active=False)
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username="user"))
+        response = client.post("/cafes/meeting/", {
+            "participants": [{"latitude": 37.54, "longitude": 126.98}, {"latitude": 37.56, "longitude": 127.0}],
+            "objective": "fair", "k": 1,
+        }, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertFalse(response.data["truncated"])
+        (result,) = response.data["results"]
+        self.assertEqual(result["cafe"]["name"], "카페 0")
+        self.assertEqual(len(result["distances"]), 2)
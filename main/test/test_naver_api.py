@@ -0,0 +1,205 @@
+import time
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from ..services import naver_api
+from ..services.naver_api import (
+    CircuitBreaker, NaverApiUnavailable, NaverMapService, get_naver_map_service, reset_naver_map_service,
+)
+from ..services.naver_fake import FakeNaverServer
+
+
+class NaverApiTestCase(SimpleTestCase):
+    """
+    가짜 네이버 서버를 띄우고 재시도 대기 시간을 기록하는 TestCase.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.fake = FakeNaverServer(client_id="id", client_secret="secret").start()
+        self.addCleanup(self.fake.stop)
+        # 재시도 전 대기 시간을 기록 (지터는 1.0으로 고정)
+        self.sleeps = []
+        real_sleep = time.sleep
+        sleep = mock.patch.object(naver_api.time, "sleep",
+                                  side_effect=lambda seconds: (self.sleeps.append(seconds), real_sleep(seconds)))
+        jitter = mock.patch.object(naver_api.random, "uniform", return_value=1.0)
+        sleep.start()
+        jitter.start()
+        self.addCleanup(sleep.stop)
+        self.addCleanup(jitter.stop)
+
+    def service(self, **kwargs):
+        options = {"timeout": (1.0, 1.0), "deadline": 5.0, "max_retries": 2, "backoff": 0.01, "max_backoff": 0.5,
+                   "breaker": CircuitBreaker(threshold=10, reset_timeout=60)}
+        options.update(kwargs)
+        service = NaverMapService("id", "secret", base_url=self.fake.url, **options)
+        self.addCleanup(service.session.close)
+        return service
+
+
+class NaverMapServiceTest(NaverApiTestCase):
+
+    def test_search_and_connection_reuse(self):
+        service = self.service()
+        for _ in range(3):
+            places = service.search_place("강남")
+        self.assertEqual(places, [{"name": "강남역 2호선", "address": "서울특별시 강남구 강남대로 지하 396",
+                                   "latitude": 37.4979, "longitude": 127.0276}])
+        self.assertEqual(len(self.fake.requests), 3)
+        self.assertEqual(self.fake.connections, 1)  # 공유 Session이 연결을 재사용
+
+        _, params, headers = self.fake.requests[-1]
+        self.assertEqual(params, {"query": "강남"})  # 값이 없는 선택 파라미터는 보내지 않음
+        self.assertEqual(headers["X-NCP-APIGW-API-KEY-ID"], "id")
+
+    def test_retry_with_exponential_backoff(self):
+        self.fake.script.extend([503, 500])
+        self.assertEqual(len(self.service().search_place("지하철역")), 3)
+        self.assertEqual(len(self.fake.requests), 3)
+        self.assertEqual(self.sleeps, [0.01, 0.02])
+
+    def test_backoff_is_capped(self):
+        self.fake.script.extend([503, 503, 503])
+        self.service(max_retries=3, backoff=0.1, max_backoff=0.15).search_place("강남")
+        self.assertEqual(self.sleeps, [0.1, 0.15, 0.15])
+
+    def test_retry_after_connection_drop(self):
+        self.fake.script.append("drop")
+        self.assertEqual(len(self.service().search_place("강남")), 1)
+        self.assertEqual(len(self.fake.requests), 2)
+        self.assertEqual(self.fake.connections, 2)  # 끊긴 연결 대신 새 연결
+
+    def test_retries_exhausted(self):
+        self.fake.script.extend([503, 503, 503, 503])
+        with self.assertRaises(NaverApiUnavailable):
+            self.service(max_retries=2).search_place("강남")
+        self.assertEqual(len(self.fake.requests), 3)
+
+    def test_retry_after_header(self):
+        self.fake.retry_after = 0.05
+        self.fake.script.append(429)
+        self.service().search_place("강남")
+        self.assertEqual(self.sleeps, [0.05])  # 지수 백오프(0.01) 대신 Retry-After
+
+        # max_backoff보다 긴 Retry-After는 max_backoff만큼만 기다림
+        self.sleeps.clear()
+        self.fake.retry_after = 30
+        self.fake.script.append(503)
+        self.service(max_backoff=0.2).search_place("강남")
+        self.assertEqual(self.sleeps, [0.2])
+
+    def test_deadline_bounds_slow_responses(self):
+        self.fake.script.extend([("delay", 2.0)] * 5)
+        service = self.service(timeout=(1.0, 0.3), deadline=0.5, max_retries=5, backoff=0.05)
+        started = time.monotonic()
+        with self.assertRaises(NaverApiUnavailable):
+            service.search_place("강남")
+        elapsed = time.monotonic() - started
+        self.assertLess(elapsed, 1.0)  # 응답 타임아웃(0.3초) x 재시도 횟수가 아니라 deadline 안에서 끝남
+        self.assertLessEqual(len(self.fake.requests), 2)
+
+    def test_deadline_skips_retry_that_cannot_finish(self):
+        # Retry-After만큼 기다리면 deadline을 넘으므로 기다리지 않고 바로 포기
+        self.fake.retry_after = 5
+        self.fake.script.append(503)
+        with self.assertRaises(NaverApiUnavailable):
+            self.service(deadline=1.0, max_backoff=10).search_place("강남")
+        self.assertEqual(self.sleeps, [])
+        self.assertEqual(len(self.fake.requests), 1)
+
+
+class NaverCircuitBreakerTest(NaverApiTestCase):
+
+    def test_open_half_open_closed(self):
+        breaker = CircuitBreaker(threshold=2, reset_timeout=0.2)
+        service = self.service(max_retries=0, breaker=breaker)
+        self.fake.script.extend([503, 503])
+        with self.assertLogs("main.services.naver_api", "WARNING") as logs:
+            for _ in range(2):
+                with self.assertRaises(NaverApiUnavailable):
+                    service.search_place("강남")
+        self.assertIn("연속 실패 2회", logs.output[-1])
+        self.assertEqual(breaker.state, "open")
+
+        # 열려 있는 동안은 서버에 요청하지 않음
+        with self.assertRaises(NaverApiUnavailable):
+            service.search_place("강남")
+        self.assertEqual(len(self.fake.requests), 2)
+
+        time.sleep(0.25)
+        self.assertEqual(breaker.state, "half-open")
+        self.assertEqual(len(service.search_place("강남")), 1)  # 시험 호출 성공
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(len(self.fake.requests), 3)
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0.2)
+        service = self.service(max_retries=0, breaker=breaker)
+        self.fake.script.extend([503, 503])
+        with self.assertLogs("main.services.naver_api", "WARNING"):
+            with self.assertRaises(NaverApiUnavailable):
+                service.search_place("강남")
+            time.sleep(0.25)
+            with self.assertRaises(NaverApiUnavailable):
+                service.search_place("강남")  # 시험 호출 실패
+        self.assertEqual(breaker.state, "open")
+        self.assertEqual(len(self.fake.requests), 2)
+
+    def test_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0.1)
+        with self.assertLogs("main.services.naver_api", "WARNING"):
+            breaker.record_failure()
+        time.sleep(0.15)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # 시험 호출이 끝나기 전의 다른 호출은 막음
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+
+    def test_client_errors_count_as_success(self):
+        # 4xx는 API가 정상 응답한 것: 재시도하지 않고 HTTPError를 내며, 차단기에는 성공으로 세어 연속 실패를 끊는다
+        breaker = CircuitBreaker(threshold=2, reset_timeout=60)
+        service = self.service(max_retries=0, breaker=breaker)
+        self.fake.script.extend([503, 400, 503])
+        with self.assertRaises(NaverApiUnavailable):
+            service.search_place("강남")
+        with self.assertRaises(requests.HTTPError) as raised:
+            service.search_place("강남")
+        self.assertNotIsInstance(raised.exception, NaverApiUnavailable)
+        self.assertEqual(raised.exception.response.status_code, 400)
+        with self.assertRaises(NaverApiUnavailable):
+            service.search_place("강남")
+        self.assertEqual(breaker.state, "closed")  # 503, 400, 503은 연속 실패 2회가 아님
+        self.assertEqual(self.sleeps, [])
+
+    def test_bad_credentials_do_not_open_breaker(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=60)
+        service = NaverMapService("id", "wrong", base_url=self.fake.url, breaker=breaker)
+        self.addCleanup(service.session.close)
+        for _ in range(3):
+            with self.assertRaises(requests.HTTPError) as raised:
+                service.search_place("강남")
+            self.assertEqual(raised.exception.response.status_code, 401)
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(len(self.fake.requests), 3)
+
+
+class NaverMapServiceSingletonTest(SimpleTestCase):
+
+    def test_shared_instance_from_settings(self):
+        with FakeNaverServer() as fake, override_settings(NAVER_API_BASE_URL=fake.url, NAVER_API_MAX_RETRIES=4,
+                                                          NAVER_API_BREAKER_THRESHOLD=3):
+            reset_naver_map_service()
+            self.addCleanup(reset_naver_map_service)
+            service = get_naver_map_service()
+            self.assertIs(get_naver_map_service(), service)
+            self.assertEqual(service.max_retries, 4)
+            self.assertEqual(service.breaker.threshold, 3)
+            service.search_place("홍대")
+            get_naver_map_service().search_place("합정")
+            self.assertEqual(fake.connections, 1)
+
+            reset_naver_map_service()
+            self.assertIsNot(get_naver_map_service(), service)
@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from ..models.cafe import Cafe
+from ..services.cafe_search import decode_cursor, encode_cursor
+from .base import CafeTestCase
+
+ORIGIN = (37.5500, 126.9200)
+
+
+class NearestCafePagingTest(CafeTestCase):
+    """
+    /cafes/nearest/ 커서 페이지네이션: 페이지를 이어 붙이면 반경 이내 카페가 거리순으로 빠짐없이, 한 번씩 나와야 한다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        # 북쪽으로 약 110m 간격, "c4"와 "c4-tie"는 같은 좌표 (거리가 같으면 id 순)
+        for i in range(7):
+            Cafe.objects.create(name=f"c{i}", address="서울특별시 마포구 양화로 1",
+                                latitude=ORIGIN[0] + i * 0.001, longitude=ORIGIN[1])
+        Cafe.objects.create(name="c4-tie", address="서울특별시 마포구 양화로 1",
+                            latitude=ORIGIN[0] + 4 * 0.001, longitude=ORIGIN[1])
+        Cafe.objects.create(name="far", address="서울특별시 마포구 양화로 1",
+                            latitude=ORIGIN[0] + 0.05, longitude=ORIGIN[1])  # 약 5.5km, 반경 밖
+        Cafe.objects.create(name="closed", address="서울특별시 마포구 양화로 1",
+                            latitude=ORIGIN[0] + 0.0005, longitude=ORIGIN[1], is_active=False)
+
+    def _pages(self, k, **params):
+        names, pages, cursor = [], 0, None
+        while True:
+            query = {"latitude": ORIGIN[0], "longitude": ORIGIN[1], "radius": 1, "k": k, **params}
+            if cursor:
+                query["cursor"] = cursor
+            response = self.client.get("/cafes/nearest/", query)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertLessEqual(len(response.data["results"]), k)
+            names += [cafe["name"] for cafe in response.data["results"]]
+            pages += 1
+            cursor = response.data["next_cursor"]
+            if cursor is None:
+                return names, pages
+
+    def _assert_walks_all_in_order(self):
+        expected = ["c0", "c1", "c2", "c3", "c4", "c4-tie", "c5", "c6"]
+        names, pages = self._pages(k=3)
+        self.assertEqual(names, expected)
+        self.assertEqual(pages, 3)
+
+        # 마지막 페이지가 꽉 차도 빈 페이지를 하나 더 만들지 않는다
+        names, pages = self._pages(k=4)
+        self.assertEqual(names, expected)
+        self.assertEqual(pages, 2)
+
+    def test_grid_backend(self):
+        with override_settings(CAFE_SEARCH_BACKEND="grid"):
+            self._assert_walks_all_in_order()
+
+    def test_snapshot_backend(self):
+        with override_settings(CAFE_SEARCH_BACKEND="snapshot"):
+            self._assert_walks_all_in_order()
+
+    def test_orm_backend(self):
+        with override_settings(CAFE_SEARCH_BACKEND="orm"):
+            self._assert_walks_all_in_order()
+
+    def test_page_boundary_between_equal_distances(self):
+        # 첫 페이지가 같은 거리의 두 카페 사이에서 끝나도 다음 페이지가 나머지 하나부터 이어진다
+        for backend in ("grid", "snapshot", "orm"):
+            with self.subTest(backend=backend), override_settings(CAFE_SEARCH_BACKEND=backend):
+                names, _ = self._pages(k=5)
+                self.assertEqual(names[4:6], ["c4", "c4-tie"])
+                self.assertEqual(len(names), len(set(names)))
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(0.123456789, 42)), (0.123456789, 42))
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/cafes/nearest/", {
+            "latitude": ORIGIN[0], "longitude": ORIGIN[1], "cursor": "not-a-cursor",
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_coordinates(self):
+        for latitude, longitude in (("nan", ORIGIN[1]), (ORIGIN[0], "inf"), (90.5, ORIGIN[1]), (ORIGIN[0], -180.1)):
+            with self.subTest(latitude=latitude, longitude=longitude):
+                response = self.client.get("/cafes/nearest/", {"latitude": latitude, "longitude": longitude})
+                self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(get_user_model().objects.create_user(username="user"))
+        response = self.client.post("/cafes/nearby/batch/", {"points": [{"latitude": "nan", "longitude": 0}]},
+                                    format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post("/cafes/meeting/", {"participants": [
+            {"latitude": ORIGIN[0], "longitude": ORIGIN[1]}, {"latitude": 91, "longitude": ORIGIN[1]},
+        ]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_near_pole_terminates(self):
+        Cafe.objects.create(name="pole", latitude=89.9999, longitude=10.0)
+        for backend in ("grid", "snapshot", "orm"):
+            with self.subTest(backend=backend), override_settings(CAFE_SEARCH_BACKEND=backend):
+                response = self.client.get("/cafes/nearest/", {"latitude": 89.9995, "longitude": 0, "radius": 50})
+                self.assertEqual([cafe["name"] for cafe in response.data["results"]], ["pole"])
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from ..models.cafe import Cafe
+from ..models.rating import Rating
+from ..services.ratings import delete_rating, rate_cafe, recompute_rating_aggregates, update_rating
+from .base import CafeTestCase
+
+
+class RatingAggregateTest(CafeTestCase):
+    """
+    별점 추가/수정/삭제 시 Cafe의 별점 집계(합계, 개수, 별점별 개수)가 Rating 테이블과 일치해야 한다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cafe = Cafe.objects.create(name="카페", address="서울특별시 마포구 양화로 1",
+                                        latitude=37.55, longitude=126.92)
+        User = get_user_model()
+        self.users = [User.objects.create_user(username=f"user{i}") for i in range(3)]
+
+    def assertAggregates(self, rating_sum, rating_count, distribution):
+        self.cafe.refresh_from_db()
+        self.assertEqual(self.cafe.rating_sum, rating_sum)
+        self.assertEqual(self.cafe.rating_count, rating_count)
+        self.assertEqual(self.cafe.rating_distribution(), dict(zip(range(1, 6), distribution)))
+        # 저장된 집계가 Rating 테이블에서 다시 계산한 값과 같아야 함
+        self.assertEqual(recompute_rating_aggregates([self.cafe.id]), 0)
+
+    def test_create(self):
+        _, created = rate_cafe(self.users[0], self.cafe, 5)
+        self.assertTrue(created)
+        rate_cafe(self.users[1], self.cafe, 3)
+        self.assertAggregates(8, 2, [0, 0, 1, 0, 1])
+        self.assertEqual(self.cafe.average_rating, 4)
+
+    def test_rate_again_updates(self):
+        rate_cafe(self.users[0], self.cafe, 5)
+        _, created = rate_cafe(self.users[0], self.cafe, 2)
+        self.assertFalse(created)
+        self.assertEqual(Rating.objects.count(), 1)
+        self.assertAggregates(2, 1, [0, 1, 0, 0, 0])
+
+    def test_update(self):
+        rating, _ = rate_cafe(self.users[0], self.cafe, 4)
+        rate_cafe(self.users[1], self.cafe, 4)
+        update_rating(rating, 1)
+        self.assertAggregates(5, 2, [1, 0, 0, 1, 0])
+        update_rating(rating, 1)  # 같은 값으로 수정하면 집계는 그대로
+        self.assertAggregates(5, 2, [1, 0, 0, 1, 0])
+
+    def test_delete(self):
+        rating, _ = rate_cafe(self.users[0], self.cafe, 5)
+        rate_cafe(self.users[1], self.cafe, 1)
+        delete_rating(rating)
+        self.assertAggregates(1, 1, [1, 0, 0, 0, 0])
+        delete_rating(rating)  # 이미 삭제된 별점은 다시 빼지 않음
+        self.assertAggregates(1, 1, [1, 0, 0, 0, 0])
+
+    def test_recompute_repairs_drift(self):
+        rate_cafe(self.users[0], self.cafe, 3)
+        Cafe.objects.filter(pk=self.cafe.pk).update(rating_sum=100, rating_count=7)
+        self.assertEqual(recompute_rating_aggregates([self.cafe.id]), 1)
+        self.assertAggregates(3, 1, [0, 0, 1, 0, 0])
+
+    def test_api(self):
+        client = APIClient()
+        url = f"/cafes/{self.cafe.id}/ratings/"
+
+        client.force_authenticate(self.users[0])
+        response = client.post(url, {"rating": 4}, format="json")
+        self.assertEqual(response.status_code, 201)
+        rating_id = response.data["rating"]["id"]
+        self.assertEqual(client.post(url, {"rating": 6}, format="json").status_code, 400)
+
+        client.force_authenticate(self.users[1])
+        response = client.post(url, {"rating": 2}, format="json")
+        self.assertEqual(response.data["average_rating"], 3)
+
+        response = client.patch(f"{url}{rating_id}/", {"rating": 5}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertAggregates(7, 2, [0, 1, 0, 0, 1])
+
+        self.assertEqual(client.delete(f"{url}{rating_id}/").status_code, 204)
+        self.assertAggregates(2, 1, [0, 1, 0, 0, 0])
+
+        response = client.get(url)
+        self.assertEqual(response.data["average_rating"], 2)
+        self.assertEqual(response.data["rating_count"], 1)
+        self.assertEqual(response.data["distribution"], {1: 0, 2: 1, 3: 0, 4: 0, 5: 0})
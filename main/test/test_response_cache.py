@@ -0,0 +1,67 @@
+import random
+from unittest import mock
+
+from django.test import override_settings
+
+from ..models.cafe import Cafe
+from ..services import cafe_response_cache
+from ..services.cafe_response_cache import nearby_cafe_payloads
+from ..services.geo import geohash_bounds
+from ..services.opening_hours import window_mask
+from .base import CafeTestCase
+
+CENTER = (37.5563, 126.9236)  # 홍대입구
+
+
+class NearbyResponseCacheTest(CafeTestCase):
+    """
+    geohash 칸 단위 응답 캐시: 캐시를 거친 결과가 캐시 없이 검색한 결과와 같고, 영업 필터가 키를 바꾸지 않아야 한다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        generator = random.Random(5)
+        hours = ["09:00 - 18:00", "10:00 - 22:00", "22:00 - 02:00", "00:00 - 00:00", None]
+        for i in range(120):
+            Cafe.objects.create(name=f"카페 {i}", opening_hours=generator.choice(hours),
+                                latitude=CENTER[0] + generator.uniform(-0.02, 0.02),
+                                longitude=CENTER[1] + generator.uniform(-0.02, 0.02))
+
+    def _live(self, *args, **kwargs):
+        with override_settings(CAFE_RESPONSE_CACHE_ENABLED=False):
+            return nearby_cafe_payloads(*args, **kwargs)
+
+    def test_matches_live_search(self):
+        generator = random.Random(9)
+        masks = [None, window_mask(9 * 60, 9 * 60 + 1), window_mask(23 * 60, 23 * 60 + 1), window_mask(12 * 60, 17 * 60)]
+        for _ in range(30):
+            latitude = CENTER[0] + generator.uniform(-0.01, 0.01)
+            longitude = CENTER[1] + generator.uniform(-0.01, 0.01)
+            radius_km, limit = generator.choice([(0.5, 5), (1.0, 5), (1.0, 20)])
+            open_mask = generator.choice(masks)
+            with self.subTest(point=(latitude, longitude), radius=radius_km, limit=limit, mask=open_mask is not None):
+                self.assertEqual(nearby_cafe_payloads(latitude, longitude, radius_km, limit, open_mask=open_mask),
+                                 self._live(latitude, longitude, radius_km, limit, open_mask=open_mask))
+
+    def test_equal_distances_ordered_by_id(self):
+        # 검색 지점에서 동서로 같은 거리(이진수로 정확한 좌표)인 두 카페. id가 작은 카페를 칸 중심에서 더 멀리 두어
+        # 후보 목록(칸 중심 거리순)에서는 id가 큰 카페가 먼저 오게 한다.
+        latitude, longitude, offset = 36.5, 127.5, 0.0078125  # 다른 카페와 떨어진 곳
+        _, (min_lat, max_lat, min_lon, max_lon) = geohash_bounds(latitude, longitude, 6)
+        farther = -1 if longitude < (min_lon + max_lon) / 2 else 1
+        first = Cafe.objects.create(name="먼저 등록", latitude=latitude, longitude=longitude + farther * offset)
+        second = Cafe.objects.create(name="나중 등록", latitude=latitude, longitude=longitude - farther * offset)
+        self.assertLess(first.id, second.id)
+
+        with override_settings(CAFE_RESPONSE_CACHE_GEOHASH_PRECISION=6):
+            names = [cafe["name"] for cafe in nearby_cafe_payloads(latitude, longitude, 0.7, 2)]
+        self.assertEqual(names, ["먼저 등록", "나중 등록"])
+        self.assertEqual(names, [cafe["name"] for cafe in self._live(latitude, longitude, 0.7, 2)])
+
+    def test_open_filter_reuses_cached_candidates(self):
+        # 분마다 달라지는 open_now 마스크가 캐시 키를 바꾸지 않는다
+        with mock.patch.object(cafe_response_cache, "find_nearby_cafes",
+                               wraps=cafe_response_cache.find_nearby_cafes) as search:
+            for minute in range(10 * 60, 10 * 60 + 5):
+                nearby_cafe_payloads(CENTER[0], CENTER[1], 1.0, 5, open_mask=window_mask(minute, minute + 1))
+            self.assertEqual(search.call_count, 1)
@@ -1,5 +1,5 @@
-from django.db.models.functions import ACos, Cos, Radians, Sin
-from django.db.models import F, FloatField, ExpressionWrapper
+import math
+
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.response import Response
@@ -11,11 +11,115 @@ from rest_framework.exceptions import NotFound
 from drf_yasg import openapi
 from ..models.cafe import Cafe
 from ..models.profile import Profile
-from ..serializers.cafe import CafeSerializer
+from ..serializers.cafe import CafeDetailSerializer, CafeSerializer
 from ..services import NaverMapService
+from ..services.meeting import OBJECTIVES, rank_meeting_cafes
+from ..services.opening_hours import MINUTES_PER_DAY, current_minute, parse_clock, window_mask
+from ..services.cafe_ranking import find_ranked_cafes
+from ..services.cafe_response_cache import nearby_cafe_payloads
+from ..services.cafe_bundle import get_cafe_bundle
+from ..services.cafe_sync import cafe_delta
+from ..services.cafe_text_search import search_cafes
+from ..services.cafe_autocomplete import MAX_SUGGESTIONS, get_cafe_autocomplete
+from ..services.cafe_clusters import get_cafe_clusters
+from ..services.cafe_detail import cafe_detail_payload
+from ..services.cafe_viewport import MAX_ZOOM, MIN_ZOOM, viewport_cafes
+from ..services.korean_text import normalize_text
+from ..services.cafe_search import decode_cursor, encode_cursor, find_nearby_cafes, find_nearby_cafes_batch
 
+from django.http import HttpResponse
 from django.shortcuts import render
 
+MAX_RADIUS_KM = 50.0  # 검색 반경 상한 (km)
+MAX_K = 50  # 한 번에 반환하는 카페 수 상한
+MAX_BATCH_POINTS = 300  # 일괄 검색 한 번에 받는 좌표 수 상한
+MAX_PARTICIPANTS = 20  # 모임 장소 검색 참가자 수 상한
+MAX_VIEWPORT_CAFES = 500  # 지도 화면 조회 한 번에 반환하는 카페 수 상한
+ORDERS = ("distance", "ranked")  # 주변/중간 지점 카페 정렬 방식
+
+
+def _parse_radius_and_k(params, default_radius, default_k):
+    """
+    요청 파라미터에서 검색 반경(radius, km)과 개수(k)를 읽어 검증.
+    """
+    try:
+        radius = float(params.get("radius", default_radius))
+    except (TypeError, ValueError):
+        raise ValidationError({"error": "radius는 숫자여야 합니다."})
+    if not 0 < radius <= MAX_RADIUS_KM:
+        raise ValidationError({"error": f"radius는 0보다 크고 {MAX_RADIUS_KM:g}km 이하여야 합니다."})
+    return radius, _parse_k(params, default_k)
+
+
+def _parse_k(params, default_k):
+    """
+    요청 파라미터에서 개수(k)를 읽어 검증.
+    """
+    try:
+        k = int(params.get("k", default_k))
+    except (TypeError, ValueError):
+        raise ValidationError({"error": "k는 정수여야 합니다."})
+    if not 0 < k <= MAX_K:
+        raise ValidationError({"error": f"k는 1 이상 {MAX_K} 이하여야 합니다."})
+    return k
+
+
+def _check_coordinates(latitude, longitude):
+    """
+    좌표가 유한한 값이고 위도 -90~90, 경도 -180~180 범위 안인지 검증.
+    NaN이나 범위를 벗어난 좌표는 공간 인덱스 탐색을 끝나지 않게 만들 수 있으므로 검색 전에 거른다.
+    :return: (latitude, longitude)
+    """
+    if not (math.isfinite(latitude) and math.isfinite(longitude)
+            and -90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValidationError({"error": "latitude는 -90~90, longitude는 -180~180 범위의 숫자여야 합니다."})
+    return latitude, longitude
+
+
+def _parse_open_filter(params):
+    """
+    open_now / open_until 파라미터를 영업 구간 마스크로 변환.
+    - open_until("HH:MM"): 지금부터 그 시각까지 내내 영업하는 카페만
+    - open_now(true): 지금 영업 중인 카페만
+    :return: opening_hours.window_mask 값 또는 필터가 없으면 None
+    """
+    open_until = params.get("open_until")
+    open_now = str(params.get("open_now", "")).lower() in ("1", "true", "yes")
+    if not open_until and not open_now:
+        return None
+
+    start = current_minute()
+    if not open_until:
+        return window_mask(start, start + 1)
+    try:
+        until = parse_clock(str(open_until)) % MINUTES_PER_DAY
+    except ValueError:
+        raise ValidationError({"error": "open_until은 HH:MM 형식이어야 합니다."})
+    return window_mask(start, until)
+
+
+def _parse_order(params):
+    """
+    order 파라미터 검증.
+    - distance: 가까운 순 (기본값)
+    - ranked: 거리, 별점, 집중하기 좋은 카페 여부를 합친 점수 순
+    """
+    order = params.get("order", "distance")
+    if order not in ORDERS:
+        raise ValidationError({"error": f"order는 {', '.join(ORDERS)} 중 하나여야 합니다."})
+    return order
+
+
+def _ranked_payloads(latitude, longitude, radius, k, open_mask):
+    """
+    점수 순 카페 목록을 직렬화하고 각 항목에 score를 붙임.
+    """
+    cafes = find_ranked_cafes(latitude, longitude, radius_km=radius, limit=k, open_mask=open_mask)
+    payloads = CafeSerializer(cafes, many=True).data
+    for cafe, payload in zip(cafes, payloads):
+        payload['score'] = round(cafe.score, 4)
+    return payloads
+
 
 # 주변 카페 목록 조회
 class NearbyCafeListView(APIView):
@@ -33,6 +137,11 @@ class NearbyCafeListView(APIView):
             properties={
                 'latitude': openapi.Schema(type=openapi.TYPE_NUMBER, description="사용자 위도"),
                 'longitude': openapi.Schema(type=openapi.TYPE_NUMBER, description="사용자 경도"),
+                'radius': openapi.Schema(type=openapi.TYPE_NUMBER, description="검색 반경 (km, 기본값 1)"),
+                'k': openapi.Schema(type=openapi.TYPE_INTEGER, description="최대 카페 수 (기본값 5)"),
+                'open_now': openapi.Schema(type=openapi.TYPE_BOOLEAN, description="지금 영업 중인 카페만"),
+                'open_until': openapi.Schema(type=openapi.TYPE_STRING, description="지금부터 이 시각(HH:MM)까지 영업하는 카페만"),
+                'order': openapi.Schema(type=openapi.TYPE_STRING, enum=list(ORDERS), description="정렬 방식 (distance: 가까운 순, ranked: 거리·별점·집중 여부 점수 순)"),
             },
             required=['latitude', 'longitude']
         ),
@@ -64,22 +173,20 @@ class NearbyCafeListView(APIView):
             longitude = float(longitude)
         except ValueError:
             raise ValidationError({"error": "latitude와 longitude는 숫자여야 합니다."})
+        _check_coordinates(latitude, longitude)
 
-        # 거리 계산 및 1km 이내 카페 필터링
-        cafes = Cafe.objects.annotate(
-            distance=ExpressionWrapper(
-                6371 * ACos(
-                    Cos(Radians(F("latitude"))) * Cos(Radians(latitude)) *
-                    Cos(Radians(F("longitude")) - Radians(longitude)) +
-                    Sin(Radians(F("latitude"))) * Sin(Radians(latitude))
-                ),
-                output_field=FloatField()
-            )
-        ).filter(distance__lte=1.0).order_by("distance")[:5]  # 1km 이내 상위 5개
+        radius, k = _parse_radius_and_k(request.data, default_radius=1.0, default_k=5)
+        open_mask = _parse_open_filter(request.data)
+        if _parse_order(request.data) == "ranked":
+            # 반경 이내 후보를 거리·별점·집중 여부 점수 순으로 정렬 (별점이 자주 바뀌므로 응답 캐시 미사용)
+            return Response(_ranked_payloads(latitude, longitude, radius, k, open_mask))
 
-        # 직렬화 및 응답 반환
-        serializer = CafeSerializer(cafes, many=True)
-        return Response(serializer.data)
+        # 거리 계산 및 반경(기본 1km) 이내 카페 필터링
+        # (좌표를 geohash 칸으로 묶은 응답 캐시 사용)
+        cafes = nearby_cafe_payloads(latitude, longitude, radius_km=radius, limit=k, open_mask=open_mask)  # 반경 이내 상위 k개 (기본 5개)
+
+        # 직렬화된 결과 반환
+        return Response(cafes)
 
 
 class MidpointCafeListView(APIView):
@@ -96,6 +203,11 @@ class MidpointCafeListView(APIView):
             openapi.Parameter('user1_longitude', openapi.IN_QUERY, description="사용자 1 경도", type=openapi.TYPE_NUMBER),
             openapi.Parameter('user2_latitude', openapi.IN_QUERY, description="사용자 2 위도", type=openapi.TYPE_NUMBER),
             openapi.Parameter('user2_longitude', openapi.IN_QUERY, description="사용자 2 경도", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('radius', openapi.IN_QUERY, description="검색 반경 (km, 기본값 5)", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('k', openapi.IN_QUERY, description="최대 카페 수 (기본값 5)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('open_now', openapi.IN_QUERY, description="지금 영업 중인 카페만", type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter('open_until', openapi.IN_QUERY, description="지금부터 이 시각(HH:MM)까지 영업하는 카페만", type=openapi.TYPE_STRING),
+            openapi.Parameter('order', openapi.IN_QUERY, description="정렬 방식 (distance: 가까운 순, ranked: 거리·별점·집중 여부 점수 순)", type=openapi.TYPE_STRING, enum=list(ORDERS)),
         ],
         responses={200: openapi.Schema(
             type=openapi.TYPE_ARRAY,
@@ -130,55 +242,589 @@ class MidpointCafeListView(APIView):
             user2_lon = float(user2_lon)
         except ValueError:
             raise ValidationError({"error": "모든 좌표 값은 숫자여야 합니다."})
+        _check_coordinates(user1_lat, user1_lon)
+        _check_coordinates(user2_lat, user2_lon)
 
         # 중간 지점 계산
         mid_lat = (user1_lat + user2_lat) / 2
         mid_lon = (user1_lon + user2_lon) / 2
 
+        radius, k = _parse_radius_and_k(request.query_params, default_radius=5.0, default_k=5)
+        open_mask = _parse_open_filter(request.query_params)
+        if _parse_order(request.query_params) == "ranked":
+            return Response(_ranked_payloads(mid_lat, mid_lon, radius, k, open_mask))
+
         # 중간 지점에서 가까운 카페 조회
-        cafes = Cafe.objects.annotate(
-            distance=ExpressionWrapper(
-                6371 * ACos(
-                    Cos(Radians(F("latitude"))) * Cos(Radians(mid_lat)) *
-                    Cos(Radians(F("longitude")) - Radians(mid_lon)) +
-                    Sin(Radians(F("latitude"))) * Sin(Radians(mid_lat))
+        # (좌표를 geohash 칸으로 묶은 응답 캐시 사용)
+        cafes = nearby_cafe_payloads(mid_lat, mid_lon, radius_km=radius, limit=k, open_mask=open_mask)  # 반경(기본 5km) 이내 상위 k개
+
+        # 직렬화된 카페 데이터 반환
+        return Response(cafes)
+
+
+
+class GroupMeetingCafeListView(APIView):
+    """
+    N명의 위치를 받아 모이기 좋은 카페를 목적 함수 순으로 반환.
+    - total: 모두의 이동 거리 합이 가장 작은 카페
+    - max: 가장 멀리 오는 사람의 이동 거리가 가장 작은 카페
+    - fair: 평균 거리와 최대 거리를 fairness_weight 비율로 섞은 값이 가장 작은 카페
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="N명 모임 카페 추천",
+        operation_description=f"최대 {MAX_PARTICIPANTS}명의 위치를 받아 목적 함수(total, max, fair)에 따라 "
+                              "모임 카페 순위와 각 참가자의 이동 거리를 반환합니다.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'participants': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'latitude': openapi.Schema(type=openapi.TYPE_NUMBER),
+                            'longitude': openapi.Schema(type=openapi.TYPE_NUMBER),
+                        }
+                    ),
+                    description="참가자 좌표 목록"
                 ),
-                output_field=FloatField()
-            )
-        ).filter(distance__lte=5.0).order_by("distance")[:5]  # 5km 이내 상위 5개
+                'objective': openapi.Schema(type=openapi.TYPE_STRING, enum=list(OBJECTIVES), description="목적 함수 (기본값 total)"),
+                'fairness_weight': openapi.Schema(type=openapi.TYPE_NUMBER, description="fair 목적에서 최대 거리의 비중 0~1 (기본값 0.5)"),
+                'k': openapi.Schema(type=openapi.TYPE_INTEGER, description="최대 카페 수 (기본값 5)"),
+            },
+            required=['participants']
+        ),
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'results': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'cafe_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'cafe': openapi.Schema(type=openapi.TYPE_OBJECT),
+                            'score': openapi.Schema(type=openapi.TYPE_NUMBER, description="목적 함수 값 (km)"),
+                            'distances': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_NUMBER),
+                                                        description="참가자 순서대로의 이동 거리 (km)"),
+                        }
+                    ),
+                    description="목적 함수 값 순 카페 목록"
+                ),
+                'truncated': openapi.Schema(type=openapi.TYPE_BOOLEAN,
+                                            description="참가자가 너무 멀리 흩어져 검색 범위 밖의 카페가 순위에 들 수도 있으면 true"),
+            }
+        )}
+    )
+    def post(self, request, *args, **kwargs):
+        raw_participants = request.data.get("participants")
+        if not isinstance(raw_participants, list) or len(raw_participants) < 2:
+            raise ValidationError({"error": "participants는 2명 이상의 좌표 객체 배열이어야 합니다."})
+        if len(raw_participants) > MAX_PARTICIPANTS:
+            raise ValidationError({"error": f"participants는 최대 {MAX_PARTICIPANTS}명까지 보낼 수 있습니다."})
+
+        participants = []
+        for participant in raw_participants:
+            try:
+                participants.append(_check_coordinates(float(participant["latitude"]), float(participant["longitude"])))
+            except (TypeError, KeyError, ValueError):
+                raise ValidationError({"error": "모든 참가자에 숫자 latitude와 longitude가 필요합니다."})
+
+        objective = request.data.get("objective", "total")
+        if objective not in OBJECTIVES:
+            raise ValidationError({"error": f"objective는 {', '.join(OBJECTIVES)} 중 하나여야 합니다."})
+        try:
+            fairness_weight = float(request.data.get("fairness_weight", 0.5))
+        except (TypeError, ValueError):
+            raise ValidationError({"error": "fairness_weight는 숫자여야 합니다."})
+        if not 0 <= fairness_weight <= 1:
+            raise ValidationError({"error": "fairness_weight는 0 이상 1 이하여야 합니다."})
+        # 후보 반경은 참가자 분포로 정하므로 radius는 받지 않는다
+        k = _parse_k(request.data, default_k=5)
+
+        ranked, truncated = rank_meeting_cafes(participants, objective=objective, fairness_weight=fairness_weight, limit=k)
+        return Response({
+            "results": [
+                {
+                    "cafe_id": cafe.id,
+                    "cafe": CafeSerializer(cafe).data,
+                    "score": round(score, 4),
+                    "distances": [round(distance, 4) for distance in distances],
+                }
+                for score, cafe, distances in ranked
+            ],
+            "truncated": truncated,
+        })
+
+
+class BatchNearbyCafeListView(APIView):
+    """
+    여러 좌표 각각의 주변 카페를 한 번에 반환 (출퇴근 경로 추천 미리 계산 등).
+    같은 카페가 여러 좌표에 등장해도 카페 정보는 cafes에 한 번만 담고, 좌표별 결과는 카페 ID로 참조.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="여러 좌표의 주변 카페 일괄 조회",
+        operation_description=f"최대 {MAX_BATCH_POINTS}개 좌표 각각에 대해 반경 이내에서 가장 가까운 카페 k개를 반환합니다.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'points': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'latitude': openapi.Schema(type=openapi.TYPE_NUMBER),
+                            'longitude': openapi.Schema(type=openapi.TYPE_NUMBER),
+                        }
+                    ),
+                    description="검색할 좌표 목록"
+                ),
+                'radius': openapi.Schema(type=openapi.TYPE_NUMBER, description="검색 반경 (km, 기본값 1)"),
+                'k': openapi.Schema(type=openapi.TYPE_INTEGER, description="좌표별 최대 카페 수 (기본값 5)"),
+                'open_now': openapi.Schema(type=openapi.TYPE_BOOLEAN, description="지금 영업 중인 카페만"),
+                'open_until': openapi.Schema(type=openapi.TYPE_STRING, description="지금부터 이 시각(HH:MM)까지 영업하는 카페만"),
+            },
+            required=['points']
+        ),
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'cafes': openapi.Schema(type=openapi.TYPE_OBJECT, description="카페 ID별 카페 정보"),
+                'results': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'latitude': openapi.Schema(type=openapi.TYPE_NUMBER),
+                            'longitude': openapi.Schema(type=openapi.TYPE_NUMBER),
+                            'cafe_ids': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+                            'distances': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_NUMBER)),
+                        }
+                    ),
+                    description="요청 좌표 순서대로의 검색 결과"
+                ),
+            }
+        )}
+    )
+    def post(self, request, *args, **kwargs):
+        raw_points = request.data.get("points")
+        if not isinstance(raw_points, list) or not raw_points:
+            raise ValidationError({"error": "points는 좌표 객체의 배열이어야 합니다."})
+        if len(raw_points) > MAX_BATCH_POINTS:
+            raise ValidationError({"error": f"points는 최대 {MAX_BATCH_POINTS}개까지 보낼 수 있습니다."})
+
+        points = []
+        for point in raw_points:
+            try:
+                points.append(_check_coordinates(float(point["latitude"]), float(point["longitude"])))
+            except (TypeError, KeyError, ValueError):
+                raise ValidationError({"error": "모든 좌표에 숫자 latitude와 longitude가 필요합니다."})
+
+        radius, k = _parse_radius_and_k(request.data, default_radius=1.0, default_k=5)
+        open_mask = _parse_open_filter(request.data)
+
+        results, cafes = find_nearby_cafes_batch(points, radius_km=radius, limit=k, open_mask=open_mask)
+
+        # 등장한 카페마다 한 번만 직렬화
+        serialized = CafeSerializer(list(cafes.values()), many=True).data
+        return Response({
+            "cafes": {cafe_id: data for cafe_id, data in zip(cafes.keys(), serialized)},
+            "results": [
+                {
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "cafe_ids": [cafe_id for _, cafe_id in hits],
+                    "distances": [round(distance, 4) for distance, _ in hits],
+                }
+                for (latitude, longitude), hits in zip(points, results)
+            ],
+        })
+
+
+class NearestCafeListView(APIView):
+    """
+    가까운 카페를 거리순으로 k개씩 이어서 반환 (지도 목록의 "더 보기"용).
+    커서에는 마지막으로 받은 카페의 (거리, id)가 담겨 있어 다음 페이지는 그 뒤부터 탐색.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="가까운 카페 목록 (커서 페이지네이션)",
+        operation_description="기준 좌표에서 반경 이내의 카페를 거리순으로 k개씩 반환합니다. "
+                              "응답의 next_cursor를 cursor로 넘기면 다음으로 가까운 카페들을 이어서 반환합니다.",
+        manual_parameters=[
+            openapi.Parameter('latitude', openapi.IN_QUERY, description="기준 위도", type=openapi.TYPE_NUMBER, required=True),
+            openapi.Parameter('longitude', openapi.IN_QUERY, description="기준 경도", type=openapi.TYPE_NUMBER, required=True),
+            openapi.Parameter('radius', openapi.IN_QUERY, description="검색 반경 (km, 기본값 1)", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('k', openapi.IN_QUERY, description="페이지당 카페 수 (기본값 5)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('cursor', openapi.IN_QUERY, description="이전 응답의 next_cursor", type=openapi.TYPE_STRING),
+            openapi.Parameter('open_now', openapi.IN_QUERY, description="지금 영업 중인 카페만", type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter('open_until', openapi.IN_QUERY, description="지금부터 이 시각(HH:MM)까지 영업하는 카페만", type=openapi.TYPE_STRING),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+                'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, description="다음 페이지 커서 (없으면 null)"),
+            }
+        )}
+    )
+    def get(self, request, *args, **kwargs):
+        latitude = request.query_params.get("latitude")
+        longitude = request.query_params.get("longitude")
+        if not latitude or not longitude:
+            raise ValidationError({"error": "latitude와 longitude 값이 필요합니다."})
+        try:
+            latitude = float(latitude)
+            longitude = float(longitude)
+        except ValueError:
+            raise ValidationError({"error": "latitude와 longitude는 숫자여야 합니다."})
+        _check_coordinates(latitude, longitude)
+
+        radius, k = _parse_radius_and_k(request.query_params, default_radius=1.0, default_k=5)
+        open_mask = _parse_open_filter(request.query_params)
+
+        after = None
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise ValidationError({"error": "잘못된 cursor 값입니다."})
+
+        # 다음 페이지 존재 여부를 알기 위해 하나 더 조회
+        cafes = find_nearby_cafes(latitude, longitude, radius_km=radius, limit=k + 1, after=after, open_mask=open_mask)
+        next_cursor = None
+        if len(cafes) > k:
+            cafes = cafes[:k]
+            next_cursor = encode_cursor(cafes[-1].distance, cafes[-1].id)
 
-        # 카페 데이터를 직렬화하여 응답 반환
         serializer = CafeSerializer(cafes, many=True)
-        return Response(serializer.data)
+        return Response({"results": serializer.data, "next_cursor": next_cursor})
+
+
+def _parse_viewport(params):
+    """
+    지도 화면 범위(min_lat, min_lon, max_lat, max_lon)와 확대 단계(zoom)를 읽어 검증.
+    :return: (min_lat, max_lat, min_lon, max_lon, zoom)
+    """
+    try:
+        min_lat, min_lon = float(params["min_lat"]), float(params["min_lon"])
+        max_lat, max_lon = float(params["max_lat"]), float(params["max_lon"])
+    except KeyError:
+        raise ValidationError({"error": "min_lat, min_lon, max_lat, max_lon 값이 필요합니다."})
+    except ValueError:
+        raise ValidationError({"error": "min_lat, min_lon, max_lat, max_lon은 숫자여야 합니다."})
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+        raise ValidationError({"error": "화면 범위가 올바르지 않습니다."})
+
+    try:
+        zoom = int(params.get("zoom", ""))
+    except ValueError:
+        raise ValidationError({"error": "zoom은 정수여야 합니다."})
+    if not MIN_ZOOM <= zoom <= MAX_ZOOM:
+        raise ValidationError({"error": f"zoom은 {MIN_ZOOM} 이상 {MAX_ZOOM} 이하여야 합니다."})
+    return min_lat, max_lat, min_lon, max_lon, zoom
+
+
+VIEWPORT_PARAMETERS = [
+    openapi.Parameter('min_lat', openapi.IN_QUERY, description="화면 남쪽 위도", type=openapi.TYPE_NUMBER, required=True),
+    openapi.Parameter('min_lon', openapi.IN_QUERY, description="화면 서쪽 경도", type=openapi.TYPE_NUMBER, required=True),
+    openapi.Parameter('max_lat', openapi.IN_QUERY, description="화면 북쪽 위도", type=openapi.TYPE_NUMBER, required=True),
+    openapi.Parameter('max_lon', openapi.IN_QUERY, description="화면 동쪽 경도", type=openapi.TYPE_NUMBER, required=True),
+    openapi.Parameter('zoom', openapi.IN_QUERY, description=f"지도 확대 단계 ({MIN_ZOOM}~{MAX_ZOOM})", type=openapi.TYPE_INTEGER, required=True),
+]
+
+
+class ViewportCafeListView(APIView):
+    """
+    지도 화면(위경도 사각형) 안의 카페 반환 (지도를 옮기거나 확대/축소할 때마다 호출).
+    카페가 너무 많으면 화면 격자 칸마다 별점이 가장 높은 카페 하나씩만 남겨 고르게 보여준다.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="지도 화면 안의 카페 목록",
+        operation_description=(
+            "min_lat~max_lat, min_lon~max_lon 사각형 안의 카페를 최대 limit개 반환합니다. "
+            "limit을 넘으면 zoom 단계에 맞춘 격자 칸마다 별점이 가장 높은 카페 하나씩만 남기며(sampled=true), "
+            "격자는 지도 위치와 무관하게 고정되어 있어 지도를 옮겨도 같은 칸의 대표 카페는 바뀌지 않습니다."
+        ),
+        manual_parameters=VIEWPORT_PARAMETERS + [
+            openapi.Parameter('limit', openapi.IN_QUERY, description=f"최대 카페 수 (기본값 200, 최대 {MAX_VIEWPORT_CAFES})", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('open_now', openapi.IN_QUERY, description="지금 영업 중인 카페만", type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter('open_until', openapi.IN_QUERY, description="지금부터 이 시각(HH:MM)까지 영업하는 카페만", type=openapi.TYPE_STRING),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'total': openapi.Schema(type=openapi.TYPE_INTEGER, description="화면 안의 전체 카페 수"),
+                'sampled': openapi.Schema(type=openapi.TYPE_BOOLEAN, description="limit을 넘어 대표 카페만 반환했는지 여부"),
+                'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+            }
+        )}
+    )
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        min_lat, max_lat, min_lon, max_lon, zoom = _parse_viewport(params)
+        try:
+            limit = int(params.get("limit", 200))
+        except ValueError:
+            raise ValidationError({"error": "limit은 정수여야 합니다."})
+        if not 0 < limit <= MAX_VIEWPORT_CAFES:
+            raise ValidationError({"error": f"limit은 1 이상 {MAX_VIEWPORT_CAFES} 이하여야 합니다."})
+
+        viewport = viewport_cafes(min_lat, max_lat, min_lon, max_lon, zoom, limit,
+                                  open_mask=_parse_open_filter(params))
+        cafes = viewport["cafes"]
+        payloads = CafeSerializer(cafes, many=True).data
+        for cafe, payload in zip(cafes, payloads):
+            payload['id'] = cafe.id
+            payload['score'] = round(cafe.score, 4)
+        return Response({"total": viewport["total"], "sampled": viewport["sampled"], "results": payloads})
+
+
+class CafeClusterListView(APIView):
+    """
+    지도 화면 안의 카페를 확대 단계에 맞춰 묶은 클러스터 반환 (미리 만들어 둔 줌별 계층에서 조회).
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="지도 화면의 카페 클러스터",
+        operation_description=(
+            "화면 안의 카페를 zoom 단계에서 서로 가까운 것끼리 묶어 개수와 무게중심 좌표를 반환합니다. "
+            "카페가 하나뿐인 항목은 id가, 클러스터는 눌렀을 때 확대할 expansion_zoom이 함께 내려갑니다."
+        ),
+        manual_parameters=VIEWPORT_PARAMETERS,
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'zoom': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'clusters': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'count': openapi.Schema(type=openapi.TYPE_INTEGER, description="카페 수"),
+                            'latitude': openapi.Schema(type=openapi.TYPE_NUMBER, description="무게중심 위도"),
+                            'longitude': openapi.Schema(type=openapi.TYPE_NUMBER, description="무게중심 경도"),
+                            'id': openapi.Schema(type=openapi.TYPE_INTEGER, description="카페 ID (count가 1일 때)"),
+                            'expansion_zoom': openapi.Schema(type=openapi.TYPE_INTEGER, description="클러스터가 나뉘는 확대 단계"),
+                        }
+                    )
+                ),
+            }
+        )}
+    )
+    def get(self, request, *args, **kwargs):
+        min_lat, max_lat, min_lon, max_lon, zoom = _parse_viewport(request.query_params)
+        clusters = get_cafe_clusters().clusters(min_lat, max_lat, min_lon, max_lon, zoom)
+        return Response({"zoom": zoom, "clusters": clusters})
+
+
+class CafeSearchView(APIView):
+    """
+    카페 이름/주소 검색 (서버 내 2-gram 검색 색인 사용, 외부 API 호출 없음).
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="카페 검색",
+        operation_description=(
+            "이름과 주소에서 검색어와 비슷한 카페를 점수순으로 반환합니다. 띄어쓰기와 문장부호는 무시하고, "
+            "검색어 글자 2-gram의 절반 이상이 맞으면 결과에 포함합니다 (이름에서 맞은 경우 더 높은 점수). "
+            "latitude/longitude를 주면 radius 이내의 카페만 반환하고 점수가 같으면 가까운 순으로 정렬합니다."
+        ),
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, description="검색어 (2자 이상)", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('k', openapi.IN_QUERY, description="최대 카페 수 (기본값 10)", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('latitude', openapi.IN_QUERY, description="기준 위도", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('longitude', openapi.IN_QUERY, description="기준 경도", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('radius', openapi.IN_QUERY, description=f"검색 반경 (km, 기본값 {MAX_RADIUS_KM:g}, 좌표가 있을 때만)", type=openapi.TYPE_NUMBER),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+            }
+        )}
+    )
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        query = params.get("q", "").strip()
+        if len(normalize_text(query)) < 2:
+            raise ValidationError({"error": "q는 2자 이상이어야 합니다."})
+        radius, k = _parse_radius_and_k(params, default_radius=MAX_RADIUS_KM, default_k=10)
+
+        latitude = params.get("latitude")
+        longitude = params.get("longitude")
+        if (latitude is None) != (longitude is None):
+            raise ValidationError({"error": "latitude와 longitude는 함께 지정해야 합니다."})
+        if latitude is not None:
+            try:
+                latitude = float(latitude)
+                longitude = float(longitude)
+            except ValueError:
+                raise ValidationError({"error": "latitude와 longitude는 숫자여야 합니다."})
+        else:
+            radius = None
 
+        cafes = search_cafes(query, k, latitude=latitude, longitude=longitude, radius_km=radius)
+        payloads = CafeSerializer(cafes, many=True).data
+        for cafe, payload in zip(cafes, payloads):
+            payload['id'] = cafe.id
+            payload['score'] = round(cafe.score, 4)
+            if cafe.distance is not None:
+                payload['distance'] = round(cafe.distance, 4)
+        return Response({"results": payloads})
+
+
+class CafeAutocompleteView(APIView):
+    """
+    카페 이름 자동완성 (서버 내 접두어 트라이 사용, DB 조회 없음).
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="카페 이름 자동완성",
+        operation_description=(
+            "이름이 입력한 글자로 시작하는 카페를 별점 수가 많은 순으로 반환합니다. 띄어쓰기와 문장부호는 무시합니다. "
+            "음절을 입력하는 도중(예: '스탑', '스타ㅂ')에도 맞고, 초성만 입력해도(예: 'ㅅㅌㅂ', '스ㅌㅂ') 찾을 수 있습니다."
+        ),
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, description="입력 중인 카페 이름", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('k', openapi.IN_QUERY, description=f"최대 추천 수 (기본값 8, 최대 {MAX_SUGGESTIONS})", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'suggestions': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'name': openapi.Schema(type=openapi.TYPE_STRING),
+                        'rating_count': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    }
+                )),
+            }
+        )}
+    )
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not normalize_text(query):
+            raise ValidationError({"error": "q를 입력해야 합니다."})
+        try:
+            k = int(request.query_params.get("k", 8))
+        except ValueError:
+            raise ValidationError({"error": "k는 정수여야 합니다."})
+        if not 1 <= k <= MAX_SUGGESTIONS:
+            raise ValidationError({"error": f"k는 1 이상 {MAX_SUGGESTIONS} 이하여야 합니다."})
+
+        suggestions = get_cafe_autocomplete().suggest(query, k)
+        return Response({"suggestions": [
+            {"id": cafe_id, "name": name, "rating_count": rating_count}
+            for cafe_id, name, rating_count in suggestions
+        ]})
+
+
+class CafeSyncView(APIView):
+    """
+    클라이언트가 보관한 카페 데이터를 마지막 버전 이후의 변경분만으로 갱신하기 위한 동기화 API.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="카페 데이터 동기화",
+        operation_description=(
+            "since(클라이언트가 마지막으로 받은 version) 이후 추가/변경된 카페와 삭제된 카페 ID를 반환합니다. "
+            "since가 없거나 너무 오래되었으면 full=true와 함께 전체 카페 목록을 반환하므로 클라이언트는 보관 데이터를 교체해야 합니다."
+        ),
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY, description="클라이언트의 마지막 데이터 버전", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'version': openapi.Schema(type=openapi.TYPE_INTEGER, description="현재 데이터 버전 (다음 요청의 since)"),
+                'full': openapi.Schema(type=openapi.TYPE_BOOLEAN, description="전체 데이터 여부"),
+                'cafes': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT), description="추가/변경된 카페"),
+                'removed': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER), description="삭제된 카페 ID"),
+            }
+        )}
+    )
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                raise ValidationError({"error": "since는 정수여야 합니다."})
+            if since < 0:
+                raise ValidationError({"error": "since는 0 이상이어야 합니다."})
+        return Response(cafe_delta(since))
+
+
+class CafeBundleView(APIView):
+    """
+    전체 활성 카페를 압축된 바이너리 번들로 내려줌 (형식은 services.cafe_bundle 참고).
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="카페 바이너리 번들",
+        operation_description=(
+            "id/위경도/영업 시간/플래그 열 배열과 이름·주소 문자열 테이블을 zlib으로 압축한 번들을 반환합니다. "
+            "ETag는 데이터 버전이며 If-None-Match가 같으면 304를 반환합니다."
+        ),
+        responses={200: "application/octet-stream 번들", 304: "변경 없음"}
+    )
+    def get(self, request, *args, **kwargs):
+        version, data = get_cafe_bundle()
+        etag = f'"cafes-{version}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(data, content_type="application/octet-stream")
+            response["Content-Disposition"] = f'attachment; filename="cafes-{version}.bin"'
+        response["ETag"] = etag
+        response["X-Cafe-Version"] = str(version)
+        return response
 
 
 # 카페 상세 조회
 class NearbyCafeDetailView(RetrieveUpdateDestroyAPIView):
     """
-    특정 카페의 상세 정보 제공.
+    특정 카페의 상세 정보 제공 (id 또는 slug로 조회).
+    조회(GET)는 프로세스 내 상세 정보 캐시를 거친다 (services.cafe_detail).
     """
-    queryset = Cafe.objects.all()
+    queryset = Cafe.objects.filter(is_active=True)
     serializer_class = CafeSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     @swagger_auto_schema(
         operation_summary="카페 상세 정보 조회",
-        operation_description="특정 카페의 상세 정보를 조회합니다 (cafe_name으로 조회).",
-        responses={200: CafeSerializer(), 404: "카페를 찾을 수 없습니다."}
+        operation_description="특정 카페의 상세 정보를 조회합니다 (cafes/<id>/ 또는 cafes/nearby/<slug>/).",
+        responses={200: CafeDetailSerializer(), 404: "카페를 찾을 수 없습니다."}
     )
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+        payload = cafe_detail_payload(cafe_id=self.kwargs.get("cafe_id"), slug=self.kwargs.get("cafe_slug"))
+        if payload is None:
+            raise NotFound(detail="해당 카페를 찾을 수 없습니다.")
+        return Response(payload)
 
     def get_object(self):
         """
-        cafe_name을 기준으로 객체를 가져옵니다.
+        cafe_id 또는 slug(고유 인덱스)를 기준으로 객체를 가져옵니다.
         """
-        cafe_name = self.kwargs.get("cafe_name")
-        if not cafe_name:
-            raise NotFound(detail="카페 이름이 제공되지 않았습니다.")
-
+        lookup = {"id": self.kwargs["cafe_id"]} if "cafe_id" in self.kwargs else {"slug": self.kwargs.get("cafe_slug")}
         try:
-            return Cafe.objects.get(name=cafe_name)
+            cafe = self.get_queryset().get(**lookup)
         except Cafe.DoesNotExist:
-            raise NotFound(detail="해당 이름의 카페를 찾을 수 없습니다.")
\ No newline at end of file
+            raise NotFound(detail="해당 카페를 찾을 수 없습니다.")
+        self.check_object_permissions(self.request, cafe)
+        return cafe
@@ -4,7 +4,7 @@ from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from ..models.cafe import Cafe
-from ..services import NaverMapService
+from ..services.naver_api import get_naver_map_service
 
 
 @swagger_auto_schema(
@@ -48,7 +48,7 @@ def find_meeting_cafe(request):
         cafe_id_user1 = int(data.get("cafe_id_user1"))
         cafe_id_user2 = int(data.get("cafe_id_user2"))
 
-        naver_service = NaverMapService(client_id="your_client_id", client_secret="your_client_secret")
+        naver_service = get_naver_map_service()
 
         cafe_user1 = Cafe.objects.get(id=cafe_id_user1)
         user1_to_cafe_url = naver_service.get_directions_for_user_and_place(user1_lat, user1_lon, cafe_user1.latitude, cafe_user1.longitude)
@@ -103,7 +103,7 @@ def find_single_user_direction(request):
         user_lon = float(data.get("user_longitude"))
         cafe_id = int(data.get("cafe_id"))
 
-        naver_service = NaverMapService(client_id="your_client_id", client_secret="your_client_secret")
+        naver_service = get_naver_map_service()
 
         cafe = Cafe.objects.get(id=cafe_id)
         directions_url = naver_service.get_directions_for_user_and_place(user_lat, user_lon, cafe.latitude, cafe.longitude)
@@ -0,0 +1,89 @@
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from ..models.profile import Profile
+from ..serializers.ranking import DistrictCafeRankingSerializer
+from ..services.district_rankings import LEADERBOARD_SIZE, RANKING_KINDS, district_leaderboard
+from ..services.districts import DISTRICT_AREAS
+
+
+def _parse_limit(params, default=10):
+    """
+    limit 파라미터 검증 (1 ~ LEADERBOARD_SIZE).
+    """
+    try:
+        limit = int(params.get("limit", default))
+    except (TypeError, ValueError):
+        raise ValidationError({"error": "limit은 정수여야 합니다."})
+    if not 0 < limit <= LEADERBOARD_SIZE:
+        raise ValidationError({"error": f"limit은 1 이상 {LEADERBOARD_SIZE} 이하여야 합니다."})
+    return limit
+
+
+def _leaderboard_response(district_code, kind, limit):
+    rankings = district_leaderboard(district_code, kind=kind, limit=limit)
+    return Response({
+        "district_code": district_code,
+        "district": DISTRICT_AREAS[district_code],
+        "kind": kind,
+        "results": DistrictCafeRankingSerializer(rankings, many=True).data,
+    })
+
+
+leaderboard_response_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'district_code': openapi.Schema(type=openapi.TYPE_STRING, description="자치구 코드"),
+        'district': openapi.Schema(type=openapi.TYPE_STRING, description="자치구 이름"),
+        'kind': openapi.Schema(type=openapi.TYPE_STRING, description="순위 종류"),
+        'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+    }
+)
+
+
+class DistrictCafeRankingView(APIView):
+    """
+    자치구(구)별 상위 카페 순위 조회 (미리 계산된 순위 테이블에서 읽음)
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @swagger_auto_schema(
+        operation_summary="자치구별 카페 순위",
+        operation_description="자치구 코드(예: 11440 마포구)의 별점 기준 상위 카페 목록을 반환합니다.",
+        manual_parameters=[
+            openapi.Parameter('kind', openapi.IN_QUERY, description="all: 전체, concentrate: 집중하기 좋은 카페", type=openapi.TYPE_STRING, enum=list(RANKING_KINDS)),
+            openapi.Parameter('limit', openapi.IN_QUERY, description=f"최대 개수 (기본값 10, 최대 {LEADERBOARD_SIZE})", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: leaderboard_response_schema, 404: "존재하지 않는 자치구입니다."}
+    )
+    def get(self, request, district_code, *args, **kwargs):
+        if district_code not in DISTRICT_AREAS:
+            raise NotFound({"error": "존재하지 않는 자치구입니다."})
+        kind = request.query_params.get("kind", "all")
+        if kind not in RANKING_KINDS:
+            raise ValidationError({"error": f"kind는 {', '.join(RANKING_KINDS)} 중 하나여야 합니다."})
+        return _leaderboard_response(district_code, kind, _parse_limit(request.query_params))
+
+
+class MyAreaConcentrateCafeView(APIView):
+    """
+    내 프로필 자치구(좌표가 속한 구, 없으면 활동 지역)의 집중하기 좋은 카페 순위 조회
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="내 지역 집중하기 좋은 카페 순위",
+        operation_description="로그인한 사용자의 프로필 위치(없으면 활동 지역)가 속한 자치구에서 별점 기준 상위의 집중하기 좋은 카페 목록을 반환합니다.",
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, description=f"최대 개수 (기본값 10, 최대 {LEADERBOARD_SIZE})", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: leaderboard_response_schema, 404: "프로필 또는 활동 지역 정보가 없습니다."}
+    )
+    def get(self, request, *args, **kwargs):
+        district_code = Profile.objects.filter(user=request.user).values_list('district_code', flat=True).first()
+        if district_code not in DISTRICT_AREAS:
+            raise NotFound({"error": "프로필 또는 활동 지역 정보가 없습니다."})
+        return _leaderboard_response(district_code, "concentrate", _parse_limit(request.query_params))
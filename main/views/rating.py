@@ -7,6 +7,7 @@ from drf_yasg import openapi
 from ..models.cafe import Cafe
 from ..models.rating import Rating
 from ..serializers.rating import RatingSerializer
+from ..services.ratings import delete_rating, rate_cafe, update_rating
 
 
 class RatingListView(APIView):
@@ -32,27 +33,22 @@ class RatingListView(APIView):
             return Response({"error": "해당 카페를 찾을 수 없습니다."}, status=404)
 
         rating_value = request.data.get('rating')
-        if not rating_value or not (1 <= int(rating_value) <= 5):
+        try:
+            rating_value = int(rating_value)
+        except (TypeError, ValueError):
+            rating_value = None
+        if rating_value is None or not (1 <= rating_value <= 5):
             return Response({"error": "별점은 1에서 5 사이여야 합니다."}, status=400)
 
-        # 별점 추가
-        rating, created = Rating.objects.update_or_create(
-            user=request.user,
-            Cafe=cafe,
-            defaults={'rating': rating_value}
-        )
-
-        # 평균 별점 계산
-        all_ratings = Rating.objects.filter(Cafe=cafe)
-        avg_rating = sum([int(r.rating) for r in all_ratings]) / all_ratings.count()
-        cafe.rating = avg_rating
-        cafe.save()
+        # 별점 추가 (이미 남긴 별점이면 수정), 카페의 별점 집계도 같은 트랜잭션에서 갱신
+        rating, created = rate_cafe(request.user, cafe, rating_value)
+        cafe.refresh_from_db(fields=['rating_sum', 'rating_count'])
 
         serializer = RatingSerializer(rating)
         return Response({
             "message": "별점이 성공적으로 추가되었습니다.",
             "rating": serializer.data,
-            "average_rating": avg_rating
+            "average_rating": cafe.average_rating
         }, status=201)
 
     @swagger_auto_schema(
@@ -61,7 +57,9 @@ class RatingListView(APIView):
         responses={200: openapi.Response(
             description="평균 별점 조회 성공",
             schema=openapi.Schema(type=openapi.TYPE_OBJECT, properties={
-                'average_rating': openapi.Schema(type=openapi.TYPE_NUMBER, description="카페의 평균 별점")
+                'average_rating': openapi.Schema(type=openapi.TYPE_NUMBER, description="카페의 평균 별점"),
+                'rating_count': openapi.Schema(type=openapi.TYPE_INTEGER, description="별점 개수"),
+                'distribution': openapi.Schema(type=openapi.TYPE_OBJECT, description="별점별 개수 {\"1\": n, ..., \"5\": n}"),
             })
         )}
     )
@@ -71,9 +69,12 @@ class RatingListView(APIView):
         except Cafe.DoesNotExist:
             return Response({"error": "해당 카페를 찾을 수 없습니다."}, status=404)
 
-        all_ratings = Rating.objects.filter(place=cafe)
-        avg_rating = sum([int(r.rating) for r in all_ratings]) / all_ratings.count() if all_ratings.count() else 0
-        return Response({"average_rating": avg_rating})
+        # 카페에 저장된 집계만 읽으므로 별점 개수와 상관없이 O(1)
+        return Response({
+            "average_rating": cafe.average_rating,
+            "rating_count": cafe.rating_count,
+            "distribution": cafe.rating_distribution(),
+        })
 
 
 class RatingDetailView(RetrieveUpdateDestroyAPIView):
@@ -84,17 +85,12 @@ class RatingDetailView(RetrieveUpdateDestroyAPIView):
     serializer_class = RatingSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def get_queryset(self):
+        return Rating.objects.filter(cafe_id=self.kwargs.get('cafe_id'))
+
     def perform_update(self, serializer):
-        serializer.save()
-        self.update_average_rating(serializer.instance.place)
+        # 변경 전 별점을 잠그고 읽어 집계에서 빼고 새 별점을 더함
+        update_rating(serializer.instance, serializer.validated_data.get('rating', serializer.instance.rating))
 
     def perform_destroy(self, instance):
-        cafe = instance.cafe
-        instance.delete()
-        self.update_average_rating(cafe)
-
-    def update_average_rating(self, cafe):
-        all_ratings = Rating.objects.filter(cafe=cafe)
-        avg_rating = sum([int(r.rating) for r in all_ratings]) / all_ratings.count() if all_ratings.exists() else 0
-        cafe.rating = avg_rating
-        cafe.save()
+        delete_rating(instance)
@@ -39,6 +39,8 @@ class ReviewDetailView(RetrieveUpdateDestroyAPIView):
     """
     특정 카페의 리뷰 수정 및 삭제
     """
-    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get_queryset(self):
+        return Review.objects.filter(cafe_id=self.kwargs.get('cafe_id'))
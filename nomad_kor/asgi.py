@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nomad_kor.settings')
 
 application = get_asgi_application()
+
+# 워커가 요청을 받기 전에 카페 격자 인덱스를 미리 생성 (CAFE_INDEX_WARMUP)
+from main.services.cafe_index import warm_cafe_index  # noqa: E402
+
+warm_cafe_index()
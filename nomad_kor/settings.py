@@ -25,6 +25,18 @@ from decouple import config
 SECRET_KEY = config('SECRET_KEY')
 NAVER_CLIENT_ID = config('NAVER_CLIENT_ID')
 NAVER_CLIENT_SECRET = config('NAVER_CLIENT_SECRET')
+# 네이버 API 클라이언트 (services.naver_api): 연결 풀 크기, 요청 타임아웃/재시도 포함 전체 시간 한도 (초),
+# 재시도 횟수와 첫 대기 시간 (초, 재시도마다 두 배), 회로 차단기 (연속 실패 횟수, 차단 시간 초)
+# NAVER_API_BASE_URL을 가짜 서버(python manage.py fake_naver_api) 주소로 바꾸면 오프라인에서 테스트할 수 있음
+NAVER_API_BASE_URL = config('NAVER_API_BASE_URL', default=None)
+NAVER_API_POOL_SIZE = config('NAVER_API_POOL_SIZE', default=10, cast=int)
+NAVER_API_CONNECT_TIMEOUT = config('NAVER_API_CONNECT_TIMEOUT', default=3.0, cast=float)
+NAVER_API_READ_TIMEOUT = config('NAVER_API_READ_TIMEOUT', default=5.0, cast=float)
+NAVER_API_DEADLINE = config('NAVER_API_DEADLINE', default=10.0, cast=float)
+NAVER_API_MAX_RETRIES = config('NAVER_API_MAX_RETRIES', default=2, cast=int)
+NAVER_API_BACKOFF = config('NAVER_API_BACKOFF', default=0.2, cast=float)
+NAVER_API_BREAKER_THRESHOLD = config('NAVER_API_BREAKER_THRESHOLD', default=5, cast=int)
+NAVER_API_BREAKER_RESET_TIMEOUT = config('NAVER_API_BREAKER_RESET_TIMEOUT', default=30.0, cast=float)
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
@@ -136,6 +148,14 @@ AUTH_USER_MODEL = 'main.CustomUser'
 MEDIA_URL = '/media/'  # 업로드된 파일의 URL 경로
 MEDIA_ROOT = BASE_DIR / 'media'  # 업로드된 파일이 저장될 실제 디렉토리
 
+# 캐시 설정 (기본값은 프로세스 내 메모리 캐시, 여러 워커가 카페 버전을 공유하려면 redis 등으로 교체)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='nomad-kor'),
+    }
+}
+
 # Django REST framework의 기본 인증 클래스 설정
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -164,3 +184,45 @@ SWAGGER_SETTINGS = {
         }
     }
 }
+
+# 카페 반경 검색 설정
+# "grid": 프로세스 내 격자 인덱스 (열 단위 카페 스냅샷으로 생성),
+# "snapshot": 열 단위 카페 스냅샷에서 반경의 위도 띠만 잘라 일괄 거리 계산,
+# "orm": 메모리 인덱스 없이 DB(위경도 인덱스 + 거리 계산)만으로 검색
+CAFE_SEARCH_BACKEND = config('CAFE_SEARCH_BACKEND', default='grid')
+# 워커 시작 시(wsgi/asgi) 격자 인덱스를 미리 생성. 끄면 첫 검색 요청 때 생성
+CAFE_INDEX_WARMUP = config('CAFE_INDEX_WARMUP', default=True, cast=bool)
+# 설정하면 build_cafe_snapshot 명령으로 발행한 스냅샷 파일을 워커들이 mmap해서 공유
+CAFE_SNAPSHOT_PATH = config('CAFE_SNAPSHOT_PATH', default=None)
+# 주변/중간 지점 카페 응답 캐시 (geohash 칸 단위, 카페 변경 및 개점/폐점 시각에 무효화)
+CAFE_RESPONSE_CACHE_ENABLED = config('CAFE_RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+CAFE_RESPONSE_CACHE_GEOHASH_PRECISION = config('CAFE_RESPONSE_CACHE_GEOHASH_PRECISION', default=6, cast=int)
+CAFE_RESPONSE_CACHE_TIMEOUT = config('CAFE_RESPONSE_CACHE_TIMEOUT', default=15 * 60, cast=int)
+# 카페 동기화 API: 변경 기록이 이보다 많으면 변경분 대신 전체 데이터를 보냄
+CAFE_SYNC_MAX_DELTA = config('CAFE_SYNC_MAX_DELTA', default=5000, cast=int)
+# 지도 화면 카페 조회: 샘플링 격자 한 칸의 화면 크기 (px), 대표 카페 선택용 별점 점수표 재계산 주기 (초)
+CAFE_VIEWPORT_SAMPLE_CELL_PX = config('CAFE_VIEWPORT_SAMPLE_CELL_PX', default=64, cast=int)
+CAFE_VIEWPORT_SCORE_TIMEOUT = config('CAFE_VIEWPORT_SCORE_TIMEOUT', default=60, cast=int)
+# 지도 클러스터: 클러스터 반경 (화면 px), 클러스터를 만드는 최대 확대 단계 (이보다 크면 카페를 하나씩 반환)
+CAFE_CLUSTER_RADIUS_PX = config('CAFE_CLUSTER_RADIUS_PX', default=64, cast=int)
+CAFE_CLUSTER_MAX_ZOOM = config('CAFE_CLUSTER_MAX_ZOOM', default=16, cast=int)
+# 카페 상세 정보 프로세스 내 캐시: 보관 개수, 최대 유지 시간 (초, 다른 프로세스의 변경이 늦게 보이는 한도)
+CAFE_DETAIL_CACHE_SIZE = config('CAFE_DETAIL_CACHE_SIZE', default=2048, cast=int)
+CAFE_DETAIL_CACHE_TIMEOUT = config('CAFE_DETAIL_CACHE_TIMEOUT', default=60, cast=int)
+
+# 주변/중간 지점 카페 점수 순 정렬(order=ranked) 가중치
+CAFE_RANKING_WEIGHTS = {
+    'distance': config('CAFE_RANKING_DISTANCE_WEIGHT', default=0.5, cast=float),  # 거리 감쇠
+    'rating': config('CAFE_RANKING_RATING_WEIGHT', default=0.35, cast=float),  # 베이지안 평균 별점
+    'concentrate': config('CAFE_RANKING_CONCENTRATE_WEIGHT', default=0.15, cast=float),  # 집중하기 좋은 카페
+}
+CAFE_RANKING_DISTANCE_HALF_LIFE_KM = config('CAFE_RANKING_DISTANCE_HALF_LIFE_KM', default=1.0, cast=float)
+CAFE_RANKING_PRIOR_TIMEOUT = config('CAFE_RANKING_PRIOR_TIMEOUT', default=10 * 60, cast=int)  # 별점 사전 분포 재계산 주기 (초)
+
+# 별점/리뷰 변경 후 자치구 순위를 다시 계산하는 최소 간격 (초). 변경 트랜잭션 커밋 직후 간격이 지난 구만 재계산하고,
+# 간격 안에 쌓인 변경은 다음 변경 때 또는 `manage.py refresh_district_rankings --dirty`(주기 실행)로 반영
+DISTRICT_RANKING_REFRESH_INTERVAL = config('DISTRICT_RANKING_REFRESH_INTERVAL', default=60, cast=int)
+
+# 자치구 경계 GeoJSON (WGS84, 서울 25개 구 Polygon/MultiPolygon, 속성에 구 이름 또는 시군구 코드)
+# 파일이 없으면 카페는 주소, 프로필은 활동 지역으로만 자치구를 정함 (services.district_boundaries 참고)
+DISTRICT_BOUNDARIES_PATH = config('DISTRICT_BOUNDARIES_PATH', default=str(BASE_DIR / 'main' / 'data' / 'seoul_districts.geojson'))
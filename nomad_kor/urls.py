@@ -40,8 +40,11 @@ from main.views.comment import CommentListView, CommentDetailView
 
 # 카페 및 장소 관련 뷰
 from main.views import map_view
-from main.views.cafe import NearbyCafeListView, NearbyCafeDetailView, MidpointCafeListView
+from main.views.cafe import NearbyCafeListView, NearbyCafeDetailView, MidpointCafeListView, NearestCafeListView, \
+    BatchNearbyCafeListView, GroupMeetingCafeListView, CafeSyncView, CafeBundleView, ViewportCafeListView, \
+    CafeClusterListView, CafeSearchView, CafeAutocompleteView
 from main.views.rating import RatingListView, RatingDetailView
+from main.views.ranking import DistrictCafeRankingView, MyAreaConcentrateCafeView
 from main.views.review import ReviewListView, ReviewDetailView
 
 #길찾기 관련 뷰
@@ -89,15 +92,27 @@ urlpatterns = [
     # 카페 관련
     path('map/', map_view, name='map'),
     path('cafes/nearby/', NearbyCafeListView.as_view(), name='nearby-cafes'),  # 주변 카페 목록 조회
-    path('cafes/nearby/<str:cafe_name>/', NearbyCafeDetailView.as_view(), name='nearby-cafe-detail'),
+    path('cafes/nearby/batch/', BatchNearbyCafeListView.as_view(), name='nearby-cafes-batch'),  # 여러 좌표의 주변 카페 일괄 조회
+    path('cafes/nearest/', NearestCafeListView.as_view(), name='nearest-cafes'),  # 거리순 카페 목록 (커서 페이지네이션)
+    path('cafes/nearby/<str:cafe_slug>/', NearbyCafeDetailView.as_view(), name='nearby-cafe-detail'),  # 카페 상세 (slug)
     path('cafes/midpoint/', MidpointCafeListView.as_view(), name='midpoint-cafes'),
+    path('cafes/meeting/', GroupMeetingCafeListView.as_view(), name='meeting-cafes'),  # N명 모임 카페 추천
+    path('cafes/viewport/', ViewportCafeListView.as_view(), name='viewport-cafes'),  # 지도 화면 안의 카페 (밀도 샘플링)
+    path('cafes/clusters/', CafeClusterListView.as_view(), name='cafe-clusters'),  # 지도 화면의 줌별 카페 클러스터
+    path('cafes/search/', CafeSearchView.as_view(), name='cafe-search'),  # 카페 이름/주소 검색
+    path('cafes/autocomplete/', CafeAutocompleteView.as_view(), name='cafe-autocomplete'),  # 카페 이름 자동완성
+    path('cafes/sync/', CafeSyncView.as_view(), name='cafe-sync'),  # 클라이언트 카페 데이터 변경분 동기화
+    path('cafes/bundle/', CafeBundleView.as_view(), name='cafe-bundle'),  # 전체 카페 바이너리 번들
+    path('cafes/top-concentrate/', MyAreaConcentrateCafeView.as_view(), name='my-area-concentrate-cafes'),  # 내 지역 집중하기 좋은 카페 순위
+    path('districts/<str:district_code>/cafes/top/', DistrictCafeRankingView.as_view(), name='district-cafe-ranking'),  # 자치구별 카페 순위
     # 카페 상세 조회
+    path('cafes/<int:cafe_id>/', NearbyCafeDetailView.as_view(), name='cafe-detail'),  # 카페 상세 (id)
 
-    path('cafes/<str:cafe_name>/ratings/', RatingListView.as_view(), name='rating-list'),  # 특정 카페의 별점 목록 조회 및 추가
-    path('cafes/<str:cafe_name>/ratings/<int:pk>/', RatingDetailView.as_view(), name='rating-detail'),
+    path('cafes/<int:cafe_id>/ratings/', RatingListView.as_view(), name='rating-list'),  # 특정 카페의 별점 목록 조회 및 추가
+    path('cafes/<int:cafe_id>/ratings/<int:pk>/', RatingDetailView.as_view(), name='rating-detail'),
     # 특정 카페의 개별 별점 수정 및 삭제
-    path('cafes/<str:cafe_name>/reviews/', ReviewListView.as_view(), name='review-list'),  # 특정 카페의 리뷰 목록 조회 및 작성
-    path('cafes/<str:cafe_name>/reviews/<int:pk>/', ReviewDetailView.as_view(), name='review-detail'),
+    path('cafes/<int:cafe_id>/reviews/', ReviewListView.as_view(), name='review-list'),  # 특정 카페의 리뷰 목록 조회 및 작성
+    path('cafes/<int:cafe_id>/reviews/<int:pk>/', ReviewDetailView.as_view(), name='review-detail'),
     # 특정 카페의 개별 리뷰 수정 및 삭제
 
     # 길찾기